@@ -1,9 +1,16 @@
-from typing import Optional
+import os
+from typing import TYPE_CHECKING, List, Optional
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
-from .models import Variable
+from .models import Schema, Variable
+from .indexes import TrigramIndex
 from .widgets import Card
 
+# The validator and generator are only loaded once a record dialog opens
+if TYPE_CHECKING:
+    from .validator import RecordError, RecordValidator, ValidationStats
+    from .generator import GenerationStats, RecordGenerator
+
 
 class ModernDialog(QDialog):
     """Base class for modern-styled dialogs"""
@@ -174,3 +181,295 @@ class VariableDialog(ModernDialog):
     def get_variable(self) -> Optional[Variable]:
         """Get the variable data"""
         return self.variable
+
+
+class UsagesDialog(ModernDialog):
+    """Dialog listing every schema that uses a variable name"""
+
+    def __init__(self, schema_manager, var_name: str = "", parent=None):
+        self.schema_manager = schema_manager
+        self.selected_schema: Optional[str] = None
+        super().__init__("Find Usages", parent)
+        self._setup_form(var_name)
+
+    def _setup_form(self, var_name: str):
+        """Setup the search field and results list"""
+        self.name_input = QLineEdit()
+        self.name_input.setPlaceholderText("Variable name, e.g. cover_img_url")
+        completer = QCompleter(self.schema_manager.variable_index.variable_names())
+        completer.setCaseSensitivity(Qt.CaseInsensitive)
+        completer.setFilterMode(Qt.MatchContains)
+        self.name_input.setCompleter(completer)
+        self.name_input.textChanged.connect(self._update_results)
+        self.content_layout.addWidget(self.name_input)
+
+        self.summary_label = QLabel()
+        self.content_layout.addWidget(self.summary_label)
+
+        self.results_list = QListWidget()
+        self.results_list.setAlternatingRowColors(True)
+        self.results_list.itemDoubleClicked.connect(self._open_selected)
+        self.content_layout.addWidget(self.results_list, 1)
+
+        # Action buttons
+        button_layout = QHBoxLayout()
+        button_layout.setSpacing(12)
+
+        close_btn = QPushButton("CLOSE")
+        close_btn.setObjectName("secondary")
+        close_btn.clicked.connect(self.reject)
+
+        open_btn = QPushButton("OPEN SCHEMA")
+        open_btn.clicked.connect(self._open_selected)
+        open_btn.setDefault(True)
+
+        button_layout.addStretch()
+        button_layout.addWidget(close_btn)
+        button_layout.addWidget(open_btn)
+        self.content_layout.addLayout(button_layout)
+
+        self.name_input.setText(var_name)
+        self._update_results(var_name)
+        self.name_input.setFocus()
+
+    def _update_results(self, text: str):
+        """Show index results for the typed variable name"""
+        self.results_list.clear()
+        usages = self.schema_manager.find_usages(text.strip())
+        for schema_name, var_type in usages:
+            type_label = var_type.name.replace("_", " ").title()
+            item = QListWidgetItem(f"{schema_name}    [{type_label}]")
+            item.setData(Qt.UserRole, schema_name)
+            self.results_list.addItem(item)
+
+        schema_count = len({schema_name for schema_name, _ in usages})
+        self.summary_label.setText(
+            f"{len(usages)} usages in {schema_count} schemas" if text.strip() else ""
+        )
+
+    def _open_selected(self, *args):
+        """Accept with the highlighted schema"""
+        item = self.results_list.currentItem()
+        if item:
+            self.selected_schema = item.data(Qt.UserRole)
+            self.accept()
+
+
+class FuzzyFinderDialog(ModernDialog):
+    """Ctrl+P style finder over schema names and template ids"""
+
+    def __init__(self, schema_manager, template_ids: List[str], parent=None):
+        self.schema_manager = schema_manager
+        self.template_index = TrigramIndex()
+        for template_id in template_ids:
+            self.template_index.add_name(template_id)
+        self.selected_schema: Optional[str] = None
+        self.selected_template: Optional[str] = None
+        super().__init__("Go To Schema", parent)
+        self._setup_form()
+
+    def _setup_form(self):
+        """Setup the query field and results list"""
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText("Type a schema name or template id...")
+        self.query_input.textChanged.connect(self._update_results)
+        self.query_input.returnPressed.connect(self._open_selected)
+        self.query_input.installEventFilter(self)
+        self.content_layout.addWidget(self.query_input)
+
+        self.results_list = QListWidget()
+        self.results_list.itemActivated.connect(self._open_selected)
+        self.content_layout.addWidget(self.results_list, 1)
+
+        self.query_input.setFocus()
+
+    def eventFilter(self, obj, event):
+        """Let arrow keys move through results while typing"""
+        if obj is self.query_input and event.type() == QEvent.KeyPress:
+            if event.key() in (Qt.Key_Down, Qt.Key_Up):
+                step = 1 if event.key() == Qt.Key_Down else -1
+                row = self.results_list.currentRow() + step
+                if 0 <= row < self.results_list.count():
+                    self.results_list.setCurrentRow(row)
+                return True
+        return super().eventFilter(obj, event)
+
+    def _update_results(self, text: str):
+        """Merge ranked schema and template matches"""
+        self.results_list.clear()
+        matches = [
+            (score, name, "schema")
+            for name, score in self.schema_manager.fuzzy_find(text)
+        ]
+        matches += [
+            (score, template_id, "template")
+            for template_id, score in self.template_index.search(text, limit=5)
+        ]
+        matches.sort(key=lambda match: -match[0])
+
+        for score, name, kind in matches:
+            label = name if kind == "schema" else f"⊞ template: {name}"
+            item = QListWidgetItem(label)
+            item.setData(Qt.UserRole, (kind, name))
+            self.results_list.addItem(item)
+        if matches:
+            self.results_list.setCurrentRow(0)
+
+    def _open_selected(self, *args):
+        """Accept with the highlighted match"""
+        item = self.results_list.currentItem()
+        if not item:
+            return
+        kind, name = item.data(Qt.UserRole)
+        if kind == "schema":
+            self.selected_schema = name
+        else:
+            self.selected_template = name
+        self.accept()
+
+
+class RecordValidationThread(QThread):
+    """Runs a file validation off the UI thread, streaming errors in batches"""
+
+    errors_found = pyqtSignal(list)
+    progress_changed = pyqtSignal(object)
+
+    def __init__(self, validator: "RecordValidator", path: str, parent=None):
+        super().__init__(parent)
+        self.validator = validator
+        self.path = path
+        self.failure: Optional[str] = None
+
+    def _on_progress(self, stats: "ValidationStats") -> bool:
+        self.progress_changed.emit(stats)
+        return not self.isInterruptionRequested()
+
+    def run(self):
+        pending = []
+        try:
+            for error in self.validator.iter_file(self.path, progress=self._on_progress):
+                pending.append(error)
+                if len(pending) >= 200:
+                    self.errors_found.emit(pending)
+                    pending = []
+                if self.isInterruptionRequested():
+                    break
+        except Exception as e:
+            self.failure = str(e)
+        if pending:
+            self.errors_found.emit(pending)
+        self.progress_changed.emit(self.validator.stats)
+
+
+class SampleDataThread(QThread):
+    """Writes generated sample records off the UI thread"""
+
+    progress_changed = pyqtSignal(int)
+
+    def __init__(self, generator: "RecordGenerator", path: str, count: int, parent=None):
+        super().__init__(parent)
+        self.generator = generator
+        self.path = path
+        self.count = count
+        self.failure: Optional[str] = None
+
+    def _on_progress(self, stats: "GenerationStats") -> bool:
+        self.progress_changed.emit(stats.records)
+        return not self.isInterruptionRequested()
+
+    def run(self):
+        try:
+            self.generator.write_ndjson(self.path, self.count, progress=self._on_progress)
+        except Exception as e:
+            self.failure = str(e)
+
+
+class RecordValidationDialog(ModernDialog):
+    """Validates an NDJSON record file against one schema"""
+
+    max_listed_errors = 1000
+
+    def __init__(self, schema: Schema, path: str, parent=None):
+        self.schema = schema
+        self.path = path
+        self.file_size = max(os.path.getsize(path), 1)
+        super().__init__(f"Validate Records: {schema.name}", parent)
+        self.setMinimumWidth(700)
+        self._setup_form()
+
+        from .validator import RecordValidator
+
+        self.thread = RecordValidationThread(RecordValidator(schema), path, self)
+        self.thread.errors_found.connect(self._add_errors)
+        self.thread.progress_changed.connect(self._update_progress)
+        self.thread.finished.connect(self._finished)
+        self.thread.start()
+
+    def _setup_form(self):
+        """Setup the progress bar and error list"""
+        self.content_layout.addWidget(QLabel(os.path.basename(self.path)))
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.content_layout.addWidget(self.progress_bar)
+
+        self.summary_label = QLabel("Validating...")
+        self.content_layout.addWidget(self.summary_label)
+
+        self.errors_list = QListWidget()
+        self.errors_list.setAlternatingRowColors(True)
+        self.content_layout.addWidget(self.errors_list, 1)
+
+        # Action buttons
+        button_layout = QHBoxLayout()
+        button_layout.setSpacing(12)
+
+        self.stop_btn = QPushButton("STOP")
+        self.stop_btn.setObjectName("danger")
+        self.stop_btn.clicked.connect(self._stop)
+
+        close_btn = QPushButton("CLOSE")
+        close_btn.setObjectName("secondary")
+        close_btn.clicked.connect(self.reject)
+
+        button_layout.addStretch()
+        button_layout.addWidget(self.stop_btn)
+        button_layout.addWidget(close_btn)
+        self.content_layout.addLayout(button_layout)
+
+    def _stop(self):
+        """Ask the validation thread to stop after the current chunk"""
+        self.thread.requestInterruption()
+        self.stop_btn.setEnabled(False)
+
+    def _add_errors(self, errors: List["RecordError"]):
+        """Append streamed errors, up to the display limit"""
+        room = self.max_listed_errors - self.errors_list.count()
+        for error in errors[: max(room, 0)]:
+            where = f"line {error.line}" + (f", {error.key}" if error.key else "")
+            self.errors_list.addItem(f"{where}: {error.message}")
+
+    def _update_progress(self, stats: "ValidationStats"):
+        """Show bytes processed and running totals"""
+        self.progress_bar.setValue(int(1000 * stats.bytes / self.file_size))
+        self.summary_label.setText(
+            f"{stats.records:,} records, {stats.invalid_records:,} invalid, "
+            f"{stats.records_per_second:,.0f} records/s"
+        )
+
+    def _finished(self):
+        """Report the final result"""
+        self.stop_btn.setEnabled(False)
+        if self.thread.failure:
+            self.summary_label.setText(f"Validation failed: {self.thread.failure}")
+        elif self.errors_list.count() >= self.max_listed_errors:
+            self.summary_label.setText(
+                self.summary_label.text()
+                + f" (showing the first {self.max_listed_errors} errors)"
+            )
+
+    def reject(self):
+        """Stop the validation before closing"""
+        self.thread.requestInterruption()
+        self.thread.wait()
+        super().reject()
@@ -0,0 +1,459 @@
+import argparse
+import copy
+import hashlib
+import json
+import sys
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from .models import VariableType
+from .fileio import load_workspace
+
+Document = Dict[str, Any]
+PatchOp = Dict[str, Any]
+
+VARIABLE_FIELDS = tuple(var_type.value for var_type in VariableType)
+
+
+def pointer(*parts) -> str:
+    """Build an RFC 6901 JSON Pointer"""
+    return "".join(
+        "/" + str(part).replace("~", "~0").replace("/", "~1") for part in parts
+    )
+
+
+def _parse_pointer(path: str) -> List[str]:
+    if not path:
+        return []
+    if not path.startswith("/"):
+        raise ValueError(f"Invalid JSON Pointer: {path!r}")
+    return [part.replace("~1", "/").replace("~0", "~") for part in path[1:].split("/")]
+
+
+def schema_digest(schema_data: Document) -> str:
+    """Content hash of an exported schema, used to detect renames
+
+    Equal to Schema.content_hash() for the schema the data was exported from.
+    """
+    payload = json.dumps(schema_data, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SchemaChange:
+    """What changed inside one schema present on both sides"""
+
+    name: str
+    fields: List[str] = field(default_factory=list)
+    added: List[Tuple[str, str]] = field(default_factory=list)
+    removed: List[Tuple[str, str]] = field(default_factory=list)
+    moved: List[Tuple[str, str]] = field(default_factory=list)
+    modified: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class WorkspaceDiff:
+    """Result of diffing two exported workspaces"""
+
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    renamed: List[Tuple[str, str]] = field(default_factory=list)
+    changed: List[SchemaChange] = field(default_factory=list)
+    patch: List[PatchOp] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.patch)
+
+    def summary(self) -> str:
+        """Human-readable report"""
+        if not self.patch:
+            return "No differences"
+        lines = [
+            f"{len(self.added)} added, {len(self.removed)} removed, "
+            f"{len(self.renamed)} renamed, {len(self.changed)} changed"
+        ]
+        lines.extend(f"+ {name}" for name in self.added)
+        lines.extend(f"- {name}" for name in self.removed)
+        lines.extend(f"> {old} -> {new}" for old, new in self.renamed)
+        for change in self.changed:
+            lines.append(f"~ {change.name}")
+            if change.fields:
+                lines.append(f"    changed: {', '.join(change.fields)}")
+            for label, items in (
+                ("added", change.added),
+                ("removed", change.removed),
+                ("moved", change.moved),
+                ("modified", change.modified),
+            ):
+                if items:
+                    names = ", ".join(f"{name} ({kind})" for kind, name in items)
+                    lines.append(f"    {label}: {names}")
+        return "\n".join(lines)
+
+
+def _variable_key(item: Any) -> Optional[str]:
+    """Name of a {name: details} variable; None for anything else"""
+    if isinstance(item, dict) and len(item) == 1:
+        return next(iter(item))
+    return None
+
+
+def _stable_positions(old_positions: List[int]) -> List[bool]:
+    """Mark a longest increasing subsequence; those items keep their place"""
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(old_positions)
+    for i, position in enumerate(old_positions):
+        k = bisect_left(tails, position)
+        if k == len(tails):
+            tails.append(position)
+            tail_index.append(i)
+        else:
+            tails[k] = position
+            tail_index[k] = i
+        previous[i] = tail_index[k - 1] if k else -1
+
+    stable = [False] * len(old_positions)
+    i = tail_index[-1] if tail_index else -1
+    while i >= 0:
+        stable[i] = True
+        i = previous[i]
+    return stable
+
+
+class _PresenceCounts:
+    """Fenwick tree over slots: mark slots present and count those before one"""
+
+    def __init__(self, size: int):
+        self._tree = [0] * (size + 1)
+
+    def add(self, slot: int, delta: int):
+        slot += 1
+        while slot < len(self._tree):
+            self._tree[slot] += delta
+            slot += slot & -slot
+
+    def before(self, slot: int) -> int:
+        total = 0
+        while slot > 0:
+            total += self._tree[slot]
+            slot -= slot & -slot
+        return total
+
+
+def diff_variable_list(
+    schema_name: str,
+    list_name: str,
+    old: List[Document],
+    new: List[Document],
+    change: SchemaChange,
+) -> List[PatchOp]:
+    """Patch ops turning one variable list into another, keyed by variable name
+
+    Variables that keep their relative order (a longest increasing
+    subsequence of old positions) stay put; every other variable is removed,
+    added or moved to sit right after its new predecessor, so the number of
+    moves is minimal.
+
+    Runs in O(n log n): each op's index is counted in a Fenwick tree over a
+    fixed order of slots instead of searching and editing the list.
+    """
+    if old == new:
+        return []
+    ops: List[PatchOp] = []
+    kind = list_name.replace("_variables", "").replace("_", " ")
+
+    old_keys = [_variable_key(item) for item in old]
+    new_keys = [_variable_key(item) for item in new]
+    old_index = {key: i for i, key in enumerate(old_keys)}
+    new_index = {key: i for i, key in enumerate(new_keys)}
+    if (
+        len(old_index) != len(old_keys)
+        or len(new_index) != len(new_keys)
+        or None in old_index
+        or None in new_index
+    ):
+        # Duplicate or malformed names cannot be matched; replace the whole list
+        change.fields.append(list_name)
+        return [{"op": "replace", "path": pointer(schema_name, list_name), "value": new}]
+
+    # Removals, from the end so earlier indices stay valid
+    for i in range(len(old_keys) - 1, -1, -1):
+        if old_keys[i] not in new_index:
+            ops.append({"op": "remove", "path": pointer(schema_name, list_name, i)})
+            change.removed.append((kind, old_keys[i]))
+    current = [key for key in old_keys if key in new_index]
+
+    kept = [key for key in new_keys if key in old_index]
+    stable_flags = _stable_positions([old_index[key] for key in kept])
+    stable = {key for key, flag in zip(kept, stable_flags) if flag}
+
+    # Every variable placed by the loop below lands right after its new
+    # predecessor, so its final slot follows the nearest stable variable
+    # before it (or the start) in new order. Old slots keep the old order.
+    runs: Dict[Optional[str], List[str]] = {None: []}
+    anchor: Optional[str] = None
+    for key in new_keys:
+        if key in stable:
+            anchor = key
+            runs[key] = []
+        else:
+            runs[anchor].append(key)
+    old_slot: Dict[str, int] = {}
+    new_slot: Dict[str, int] = {}
+    for key in runs[None]:
+        new_slot[key] = len(old_slot) + len(new_slot)
+    for key in current:
+        old_slot[key] = len(old_slot) + len(new_slot)
+        for follower in runs.get(key, ()):
+            new_slot[follower] = len(old_slot) + len(new_slot)
+
+    present = _PresenceCounts(len(old_slot) + len(new_slot))
+    for slot in old_slot.values():
+        present.add(slot, 1)
+
+    for i, key in enumerate(new_keys):
+        if key in stable:
+            continue
+        if key in old_index:
+            source = present.before(old_slot[key])
+            present.add(old_slot[key], -1)
+            target = present.before(new_slot[key])
+            present.add(new_slot[key], 1)
+            if source != target:
+                ops.append(
+                    {
+                        "op": "move",
+                        "from": pointer(schema_name, list_name, source),
+                        "path": pointer(schema_name, list_name, target),
+                    }
+                )
+                change.moved.append((kind, key))
+        else:
+            target = present.before(new_slot[key])
+            present.add(new_slot[key], 1)
+            path = pointer(schema_name, list_name, target)
+            ops.append({"op": "add", "path": path, "value": new[i]})
+            change.added.append((kind, key))
+
+    # Content changes, addressed by final position
+    for i, key in enumerate(new_keys):
+        if key not in old_index:
+            continue
+        old_value = old[old_index[key]][key]
+        new_value = new[i][key]
+        if old_value == new_value:
+            continue
+        change.modified.append((kind, key))
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            for attr, value in new_value.items():
+                path = pointer(schema_name, list_name, i, key, attr)
+                if attr not in old_value:
+                    ops.append({"op": "add", "path": path, "value": value})
+                elif old_value[attr] != value:
+                    ops.append({"op": "replace", "path": path, "value": value})
+            for attr in old_value:
+                if attr not in new_value:
+                    path = pointer(schema_name, list_name, i, key, attr)
+                    ops.append({"op": "remove", "path": path})
+        else:
+            path = pointer(schema_name, list_name, i, key)
+            ops.append({"op": "replace", "path": path, "value": new_value})
+    return ops
+
+
+def diff_schema(
+    name: str, old: Document, new: Document
+) -> Tuple[Optional[SchemaChange], List[PatchOp]]:
+    """Patch ops for one schema present in both workspaces"""
+    change = SchemaChange(name)
+    ops: List[PatchOp] = []
+    for key, value in new.items():
+        is_list = isinstance(value, list) and isinstance(old.get(key), list)
+        if key in VARIABLE_FIELDS and is_list:
+            ops.extend(diff_variable_list(name, key, old[key], value, change))
+        elif key not in old:
+            ops.append({"op": "add", "path": pointer(name, key), "value": value})
+            change.fields.append(key)
+        elif old[key] != value:
+            ops.append({"op": "replace", "path": pointer(name, key), "value": value})
+            change.fields.append(key)
+    for key in old:
+        if key not in new:
+            ops.append({"op": "remove", "path": pointer(name, key)})
+            change.fields.append(key)
+    return (change if ops else None), ops
+
+
+def diff_workspaces(old: Document, new: Document) -> WorkspaceDiff:
+    """Diff two exported workspaces ({name: schema data})
+
+    Schemas are matched by name first; of the rest, a removed and an added
+    schema with identical content are reported as a rename. Only unmatched
+    schemas are hashed, and schemas matched by name are compared with plain
+    equality before any per-field work.
+    """
+    result = WorkspaceDiff()
+    patch = result.patch
+
+    for name, old_data in old.items():
+        new_data = new.get(name)
+        if new_data is None or new_data == old_data:
+            continue
+        change, ops = diff_schema(name, old_data, new_data)
+        if change is not None:
+            result.changed.append(change)
+            patch.extend(ops)
+
+    removed = [name for name in old if name not in new]
+    added = [name for name in new if name not in old]
+    by_digest: Dict[str, List[str]] = {}
+    for name in added:
+        by_digest.setdefault(schema_digest(new[name]), []).append(name)
+
+    renamed_to = set()
+    for name in removed:
+        candidates = by_digest.get(schema_digest(old[name]))
+        if candidates:
+            target = candidates.pop(0)
+            renamed_to.add(target)
+            result.renamed.append((name, target))
+            patch.append({"op": "move", "from": pointer(name), "path": pointer(target)})
+        else:
+            result.removed.append(name)
+            patch.append({"op": "remove", "path": pointer(name)})
+
+    for name in added:
+        if name not in renamed_to:
+            result.added.append(name)
+            patch.append({"op": "add", "path": pointer(name), "value": new[name]})
+    return result
+
+
+def diff_managers(old_manager, new_manager) -> WorkspaceDiff:
+    """Diff the workspaces held by two SchemaManagers
+
+    Schemas whose cached content hashes match under the same name are
+    skipped without being exported.
+    """
+    old_schemas, new_schemas = old_manager.schemas, new_manager.schemas
+    unchanged = set()
+    for name, schema in old_schemas.items():
+        other = new_schemas.get(name)
+        if other is not None and other.content_hash() == schema.content_hash():
+            unchanged.add(name)
+    old = {n: s.to_dict() for n, s in old_schemas.items() if n not in unchanged}
+    new = {n: s.to_dict() for n, s in new_schemas.items() if n not in unchanged}
+    return diff_workspaces(old, new)
+
+
+def _shallow(value: Any) -> Any:
+    return list(value) if isinstance(value, list) else dict(value)
+
+
+def _resolve(document: Any, parts: List[str], copied: Optional[set]) -> Tuple[Any, str]:
+    """Return the container holding the last pointer segment
+
+    When copied is given, containers on the path are shallow-copied the first
+    time they are touched, so the source document is never modified.
+    """
+    target = document
+    for part in parts[:-1]:
+        key = int(part) if isinstance(target, list) else part
+        child = target[key]
+        if copied is not None and id(child) not in copied:
+            child = _shallow(child)
+            copied.add(id(child))
+            target[key] = child
+        target = child
+    return target, parts[-1]
+
+
+def _get(document: Any, path: str) -> Any:
+    parts = _parse_pointer(path)
+    if not parts:
+        return document
+    container, key = _resolve(document, parts, None)
+    return container[int(key)] if isinstance(container, list) else container[key]
+
+
+def _add(document: Any, path: str, value: Any, copied: Optional[set]) -> Any:
+    parts = _parse_pointer(path)
+    if not parts:
+        return value
+    container, key = _resolve(document, parts, copied)
+    if isinstance(container, list):
+        container.insert(len(container) if key == "-" else int(key), value)
+    else:
+        container[key] = value
+    return document
+
+
+def _remove(document: Any, path: str, copied: Optional[set]) -> Any:
+    container, key = _resolve(document, _parse_pointer(path), copied)
+    if isinstance(container, list):
+        return container.pop(int(key))
+    return container.pop(key)
+
+
+def apply_patch(document: Any, patch: List[PatchOp], in_place: bool = False) -> Any:
+    """Apply an RFC 6902 patch; raises ValueError if an operation does not apply
+
+    Unless in_place is set, only the containers a patch touches are copied;
+    the rest of the result shares structure with the input.
+    """
+    copied: Optional[set] = None
+    if not in_place:
+        document = _shallow(document)
+        copied = {id(document)}
+    for number, op in enumerate(patch):
+        try:
+            kind = op["op"]
+            if kind == "add":
+                document = _add(document, op["path"], copy.deepcopy(op["value"]), copied)
+            elif kind == "remove":
+                _remove(document, op["path"], copied)
+            elif kind == "replace":
+                _remove(document, op["path"], copied)
+                document = _add(document, op["path"], copy.deepcopy(op["value"]), copied)
+            elif kind == "move":
+                value = _remove(document, op["from"], copied)
+                document = _add(document, op["path"], value, copied)
+            elif kind == "copy":
+                value = copy.deepcopy(_get(document, op["from"]))
+                document = _add(document, op["path"], value, copied)
+            elif kind == "test":
+                if _get(document, op["path"]) != op["value"]:
+                    raise ValueError(f"test failed at {op['path']}")
+            else:
+                raise ValueError(f"unknown op {kind!r}")
+        except (KeyError, IndexError, TypeError, ValueError) as e:
+            raise ValueError(f"Patch operation {number} ({op.get('op')}) failed: {e}") from e
+    return document
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point; exits 1 when the workspaces differ"""
+    parser = argparse.ArgumentParser(
+        prog="python -m assets.diff",
+        description="Compare two exported workspaces or backups",
+    )
+    parser.add_argument("old", help="original schemas JSON file")
+    parser.add_argument("new", help="changed schemas JSON file")
+    parser.add_argument(
+        "--patch",
+        action="store_true",
+        help="print an RFC 6902 JSON Patch instead of a summary",
+    )
+    args = parser.parse_args(argv)
+
+    result = diff_workspaces(load_workspace(args.old), load_workspace(args.new))
+    if args.patch:
+        print(json.dumps(result.patch, indent=2, ensure_ascii=False))
+    else:
+        print(result.summary())
+    return 1 if result else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
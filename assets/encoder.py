@@ -0,0 +1,116 @@
+import json
+from json.encoder import encode_basestring
+from typing import List, Optional
+from .models import Schema, Variable
+
+_VARIABLE_FIELDS = (
+    "basic_variables",
+    "more_variables",
+    "image_variables",
+    "url_variables",
+    "array_variables",
+    "language_item_variables",
+)
+
+
+class _Unsupported(Exception):
+    """A value the specialized encoder does not write itself"""
+
+
+def _compact_variables(variables: List[Variable]) -> str:
+    enc = encode_basestring
+    items = []
+    for var in variables:
+        rows = var.rows
+        if type(rows) is not int:
+            raise _Unsupported
+        items.append(
+            f'{{{enc(var.name)}:{{"en":{enc(var.en_text)},"cn":{enc(var.cn_text)},"rows":{rows}}}}}'
+        )
+    return "[" + ",".join(items) + "]"
+
+
+def _encode_compact(schema: Schema) -> str:
+    enc = encode_basestring
+    parts = [
+        '{"page_title_cn":',
+        enc(schema.page_title_cn),
+        ',"page_title_en":',
+        enc(schema.page_title_en),
+        ',"match_img":',
+        enc(schema.match_img),
+        ',"filter_with":',
+        enc(schema.filter_with),
+    ]
+    for field in _VARIABLE_FIELDS:
+        parts.append(f',"{field}":')
+        parts.append(_compact_variables(getattr(schema, field)))
+    parts.append("}")
+    return "".join(parts)
+
+
+def _encode_indented(schema: Schema, unit: str, level: int) -> str:
+    enc = encode_basestring
+    p0 = "\n" + unit * level
+    p1 = p0 + unit
+    p2 = p1 + unit
+    p3 = p2 + unit
+    p4 = p3 + unit
+    parts = [
+        f'{{{p1}"page_title_cn": {enc(schema.page_title_cn)},',
+        f'{p1}"page_title_en": {enc(schema.page_title_en)},',
+        f'{p1}"match_img": {enc(schema.match_img)},',
+        f'{p1}"filter_with": {enc(schema.filter_with)}',
+    ]
+    for field in _VARIABLE_FIELDS:
+        variables = getattr(schema, field)
+        if not variables:
+            parts.append(f',{p1}"{field}": []')
+            continue
+        items = []
+        for var in variables:
+            rows = var.rows
+            if type(rows) is not int:
+                raise _Unsupported
+            items.append(
+                f"{{{p3}{enc(var.name)}: {{"
+                f'{p4}"en": {enc(var.en_text)},'
+                f'{p4}"cn": {enc(var.cn_text)},'
+                f'{p4}"rows": {rows}'
+                f"{p3}}}{p2}}}"
+            )
+        parts.append(f',{p1}"{field}": [{p2}' + f",{p2}".join(items) + f"{p1}]")
+    parts.append(p0 + "}")
+    return "".join(parts)
+
+
+def encode_schema(schema: Schema, indent: Optional[int] = None, level: int = 0) -> str:
+    """JSON text of schema.to_dict() written directly from the model
+
+    Matches json.dumps(schema.to_dict(), ensure_ascii=False) with
+    separators=(",", ":") when indent is None, or with indent=indent
+    otherwise. level nests the indented output that many levels deep, as if
+    it were a member of an enclosing object. Values of unexpected types are
+    handed to json.dumps, so the output is always the same as before.
+    """
+    try:
+        if indent is None:
+            return _encode_compact(schema)
+        return _encode_indented(schema, " " * indent, level)
+    except (_Unsupported, TypeError):
+        pass
+
+    if indent is None:
+        return json.dumps(schema.to_dict(), ensure_ascii=False, separators=(",", ":"))
+    text = json.dumps(schema.to_dict(), ensure_ascii=False, indent=indent)
+    return text.replace("\n", "\n" + " " * (indent * level))
+
+
+def encode_member(name: str, schema: Schema, indent: int = 2) -> str:
+    """'  "name": {...}' as the schema appears inside an indented export
+
+    Joining members with ",\n" inside "{\n" and "\n}" gives the same text
+    as json.dumps({name: schema.to_dict(), ...}, indent=indent,
+    ensure_ascii=False).
+    """
+    return " " * indent + encode_basestring(name) + ": " + encode_schema(schema, indent, 1)
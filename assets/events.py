@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Optional
+from .models import Variable, VariableType
+
+
+class ChangeKind(Enum):
+    """Enumeration for schema change events"""
+
+    SCHEMA_ADDED = "schema_added"
+    SCHEMA_REMOVED = "schema_removed"
+    SCHEMA_RENAMED = "schema_renamed"
+    SCHEMA_UPDATED = "schema_updated"
+    VARIABLE_INSERTED = "variable_inserted"
+    VARIABLE_UPDATED = "variable_updated"
+    VARIABLE_REMOVED = "variable_removed"
+    RESET = "reset"
+
+
+@dataclass(frozen=True)
+class SchemaEvent:
+    """A single change emitted by the schema manager
+
+    Variable events carry the variable as it was at emit time so that views
+    replaying a coalesced batch never read a model index that has since moved.
+    """
+
+    kind: ChangeKind
+    schema_name: str = ""
+    old_name: Optional[str] = None
+    var_type: Optional[VariableType] = None
+    index: int = -1
+    variable: Optional[Variable] = None
+
+
+def coalesce_events(events: List[SchemaEvent]) -> List[SchemaEvent]:
+    """Collapse a tick's worth of events into the shortest equivalent list"""
+    # A reset makes listeners rebuild from current state, which already
+    # includes every other change of the tick
+    for event in reversed(events):
+        if event.kind == ChangeKind.RESET:
+            return [event]
+
+    coalesced: List[SchemaEvent] = []
+    for event in events:
+        if coalesced and event.kind in (
+            ChangeKind.SCHEMA_UPDATED,
+            ChangeKind.VARIABLE_UPDATED,
+        ):
+            last = coalesced[-1]
+            if (
+                last.kind == event.kind
+                and last.schema_name == event.schema_name
+                and last.var_type == event.var_type
+                and last.index == event.index
+            ):
+                coalesced[-1] = event
+                continue
+        coalesced.append(event)
+    return coalesced
@@ -0,0 +1,249 @@
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from .diff import pointer
+from .fileio import codec_from_name, open_output, strip_codec_extension
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+ExportProgress = Callable[[int, int], bool]
+
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = "export_manifest.json"
+DELETED_FILENAME = "_deleted.json"
+
+
+@dataclass
+class ExportManifest:
+    """Per-schema content hashes recorded at export time"""
+
+    schemas: Dict[str, str] = field(default_factory=dict)
+    created: str = ""
+
+    @classmethod
+    def from_manager(cls, schema_manager, names: Optional[List[str]] = None) -> "ExportManifest":
+        """Snapshot the hashes of all (or the named) schemas"""
+        if names is None:
+            names = list(schema_manager.schemas)
+        hashes = {}
+        for name in names:
+            digest = schema_manager.schema_hash(name)
+            if digest is not None:
+                hashes[name] = digest
+        return cls(hashes, datetime.now().isoformat(timespec="seconds"))
+
+    @classmethod
+    def load(cls, path: str) -> "ExportManifest":
+        """Read a manifest; a missing file means nothing was exported yet"""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version: {data.get('version')}")
+        return cls(dict(data.get("schemas", {})), data.get("created", ""))
+
+    def save(self, path: str):
+        """Write the manifest atomically"""
+        data = {"version": MANIFEST_VERSION, "created": self.created, "schemas": self.schemas}
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(temp_path, path)
+
+
+@dataclass
+class ExportDelta:
+    """Schemas that differ from a manifest"""
+
+    added: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    def __str__(self) -> str:
+        return f"{len(self.added)} added, {len(self.changed)} changed, {len(self.removed)} removed"
+
+
+def compute_delta(schema_manager, manifest: ExportManifest) -> ExportDelta:
+    """Compare the workspace against the hashes of the last export"""
+    delta = ExportDelta()
+    for name in schema_manager.schemas:
+        previous = manifest.schemas.get(name)
+        if previous is None:
+            delta.added.append(name)
+        elif previous != schema_manager.schema_hash(name):
+            delta.changed.append(name)
+    delta.removed = [name for name in manifest.schemas if name not in schema_manager.schemas]
+    return delta
+
+
+def write_delta_patch(schema_manager, delta: ExportDelta, path: str):
+    """Write the delta as an RFC 6902 patch over the exported document"""
+    patch = []
+    for name in delta.removed:
+        patch.append({"op": "remove", "path": pointer(name)})
+    for op, names in (("replace", delta.changed), ("add", delta.added)):
+        for name in names:
+            value = schema_manager.schemas[name].to_dict()
+            patch.append({"op": op, "path": pointer(name), "value": value})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(patch, f, indent=2, ensure_ascii=False)
+
+
+def schema_filename(name: str) -> str:
+    """File name for a schema that is safe on every platform"""
+    return quote(name, safe="") + ".json"
+
+
+def write_delta_files(schema_manager, delta: ExportDelta, directory: str):
+    """Write one file per added or changed schema, plus a list of removed ones"""
+    os.makedirs(directory, exist_ok=True)
+    for name in delta.added + delta.changed:
+        with open(os.path.join(directory, schema_filename(name)), "w", encoding="utf-8") as f:
+            f.write("{\n" + schema_manager.indented_member(name, cache=False) + "\n}")
+    with open(os.path.join(directory, DELETED_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(delta.removed, f, indent=2, ensure_ascii=False)
+
+
+class DeltaExporter:
+    """Exports only what changed since the manifest was last saved"""
+
+    def __init__(self, schema_manager, manifest_path: str):
+        self.schema_manager = schema_manager
+        self.manifest_path = manifest_path
+
+    def pending(self) -> ExportDelta:
+        """What a delta export would contain right now"""
+        return compute_delta(self.schema_manager, ExportManifest.load(self.manifest_path))
+
+    def record_full_export(self):
+        """Remember the current workspace as exported"""
+        ExportManifest.from_manager(self.schema_manager).save(self.manifest_path)
+
+    def export_patch(self, path: str) -> ExportDelta:
+        """Write changes as a JSON Patch document and advance the manifest"""
+        delta = self.pending()
+        write_delta_patch(self.schema_manager, delta, path)
+        self.record_full_export()
+        logger.info(f"Delta export to {path}: {delta}")
+        return delta
+
+    def export_files(self, directory: str) -> ExportDelta:
+        """Write changes as per-schema files and advance the manifest"""
+        delta = self.pending()
+        write_delta_files(self.schema_manager, delta, directory)
+        self.record_full_export()
+        logger.info(f"Delta export to {directory}: {delta}")
+        return delta
+
+
+EXPORT_FORMATS = ("json", "minified", "ndjson")
+
+
+def detect_export_format(path: str) -> Tuple[str, Optional[str]]:
+    """Infer (format, compression) from a file name such as x.ndjson.gz"""
+    compression = codec_from_name(path)
+    lower = strip_codec_extension(path).lower()
+    if lower.endswith((".ndjson", ".jsonl")):
+        return "ndjson", compression
+    if lower.endswith(".min.json"):
+        return "minified", compression
+    return "json", compression
+
+
+def _export_parts(schema_manager, names: List[str], fmt: str) -> Iterator[bytes]:
+    """Encoded pieces of an export, one schema at a time
+
+    json matches json.dump(indent=2, ensure_ascii=False), minified matches
+    separators=(",", ":"), and ndjson writes one {name: schema} per line.
+    """
+    if fmt == "json":
+        if not names:
+            yield b"{}"
+            return
+        yield b"{\n"
+        for i, name in enumerate(names):
+            member = schema_manager.indented_member(name, cache=False)
+            yield (",\n" + member if i else member).encode("utf-8")
+        yield b"\n}"
+    elif fmt in ("minified", "ndjson"):
+        opening, separator, closing = (
+            (b"{", b",", b"}") if fmt == "minified" else (b"{", b"}\n{", b"}\n")
+        )
+        if not names:
+            yield b"{}" if fmt == "minified" else b""
+            return
+        yield opening
+        for i, name in enumerate(names):
+            key = json.dumps(name, ensure_ascii=False).encode("utf-8")
+            body = schema_manager.serialized_schema(name, cache=False)[0]
+            yield (separator if i else b"") + key + b":" + body
+        yield closing
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+@traced(category="io")
+def write_export(
+    schema_manager,
+    path: str,
+    names: Optional[List[str]] = None,
+    fmt: Optional[str] = None,
+    compression: Optional[str] = None,
+    level: Optional[int] = None,
+    progress: Optional[ExportProgress] = None,
+    buffer_size: int = 1024 * 1024,
+) -> bool:
+    """Stream schemas to disk one member at a time
+
+    Format and compression default to what the file name implies (see
+    detect_export_format). The full export dict is never built: cached
+    fragments are written as-is and others are serialized without being
+    cached, so memory use does not grow with the workspace. Output goes
+    through a write buffer, then gzip/xz/bz2 when requested, into a temporary
+    file that replaces the target at the end. progress(done, total) is called
+    periodically; returning False cancels and leaves any existing file
+    untouched. Returns True when the file was written.
+    """
+    detected_fmt, detected_compression = detect_export_format(path)
+    fmt = fmt or detected_fmt
+    compression = compression or detected_compression
+    if names is None:
+        names = list(schema_manager.schemas)
+    else:
+        names = [name for name in names if name in schema_manager.schemas]
+    total = len(names)
+    step = max(total // 200, 1)
+
+    temp_path = f"{path}.part"
+    completed = False
+    try:
+        with open_output(temp_path, compression, level) as f:
+            pending: List[bytes] = []
+            pending_size = 0
+            for done, part in enumerate(_export_parts(schema_manager, names, fmt)):
+                pending.append(part)
+                pending_size += len(part)
+                if pending_size >= buffer_size:
+                    f.write(b"".join(pending))
+                    pending, pending_size = [], 0
+                if progress is not None and done % step == 0:
+                    if progress(min(done, total), total) is False:
+                        return False
+            f.write(b"".join(pending))
+        if progress is not None:
+            progress(total, total)
+        os.replace(temp_path, path)
+        completed = True
+        return True
+    finally:
+        if not completed and os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,166 @@
+import bz2
+import gzip
+import io
+import json
+import lzma
+from typing import Any, BinaryIO, Dict, Iterator, Optional, TextIO, Tuple
+
+# Codec by file extension and by leading magic bytes
+CODEC_EXTENSIONS = {".gz": "gzip", ".xz": "xz", ".bz2": "bz2"}
+CODEC_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"BZh", "bz2"),
+)
+DEFAULT_LEVELS = {"gzip": 6, "xz": 6, "bz2": 9}
+
+
+def codec_from_name(path: str) -> Optional[str]:
+    """Codec implied by a file name such as schemas.json.xz"""
+    lower = path.lower()
+    for extension, codec in CODEC_EXTENSIONS.items():
+        if lower.endswith(extension):
+            return codec
+    return None
+
+
+def strip_codec_extension(path: str) -> str:
+    """schemas.json.gz -> schemas.json"""
+    codec = codec_from_name(path)
+    if codec is None:
+        return path
+    return path[: path.rfind(".")]
+
+
+def detect_codec(path: str) -> Optional[str]:
+    """Codec of an existing file, from its magic bytes rather than its name"""
+    with open(path, "rb") as f:
+        head = f.read(6)
+    for magic, codec in CODEC_MAGIC:
+        if head.startswith(magic):
+            return codec
+    return None
+
+
+def open_input(path: str) -> BinaryIO:
+    """Open a possibly compressed file for streaming binary reads"""
+    codec = detect_codec(path)
+    if codec == "gzip":
+        return gzip.open(path, "rb")
+    if codec == "xz":
+        return lzma.open(path, "rb")
+    if codec == "bz2":
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+
+def open_output(path: str, codec: Optional[str] = None, level: Optional[int] = None) -> BinaryIO:
+    """Open a file for binary writes, compressing with codec (default: by name)"""
+    codec = codec or codec_from_name(path)
+    if codec is None:
+        return open(path, "wb")
+    if level is None:
+        level = DEFAULT_LEVELS[codec]
+    if codec == "gzip":
+        return gzip.open(path, "wb", compresslevel=level)
+    if codec == "xz":
+        return lzma.open(path, "wb", preset=level)
+    if codec == "bz2":
+        return bz2.open(path, "wb", compresslevel=level)
+    raise ValueError(f"Unknown compression: {codec}")
+
+
+class _MemberReader:
+    """Incremental reader for the members of top-level JSON objects
+
+    Text is pulled from the stream in chunks and only the unparsed tail is
+    kept, so memory is bounded by the largest single member rather than the
+    file. A sequence of objects (NDJSON) is read as one stream of members.
+    """
+
+    def __init__(self, stream: TextIO, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, or "" at end of input"""
+        while True:
+            buffer, pos = self.buffer, self.pos
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            self.pos = pos
+            if pos < len(buffer):
+                return buffer[pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, characters: str) -> str:
+        char = self._peek()
+        if not char or char not in characters:
+            found = repr(char) if char else "end of file"
+            raise ValueError(f"Expected one of {characters!r}, found {found}")
+        self.pos += 1
+        return char
+
+    def _value(self) -> Any:
+        """Decode the next value, reading more input while it is incomplete"""
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the very end of the buffer may still be incomplete
+            if end == len(self.buffer) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self) -> Iterator[Tuple[str, Any]]:
+        while self._peek():
+            self._expect("{")
+            if self._peek() == "}":
+                self.pos += 1
+                continue
+            while True:
+                key = self._value()
+                if not isinstance(key, str):
+                    raise ValueError("Object keys must be strings")
+                self._expect(":")
+                yield key, self._value()
+                if self._expect(",}") == "}":
+                    break
+
+
+def iter_workspace(path: str, chunk_size: int = 1024 * 1024) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Stream (name, schema data) pairs from an export or backup
+
+    Handles plain, gzip, xz and bz2 files (detected from their content) in
+    both the JSON object format and NDJSON, without loading the whole
+    decompressed document into memory.
+    """
+    with open_input(path) as raw:
+        stream = io.TextIOWrapper(raw, encoding="utf-8-sig")
+        yield from _MemberReader(stream, chunk_size).members()
+
+
+def load_workspace(path: str) -> Dict[str, Dict[str, Any]]:
+    """Read a whole export or backup into a dict"""
+    return dict(iter_workspace(path))
@@ -0,0 +1,294 @@
+import json
+import logging
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+from .models import Schema, VariableType
+from .fileio import iter_workspace
+
+logger = logging.getLogger(__name__)
+
+# Vocabulary for generated text; rows on a variable scale how much is produced
+WORDS = (
+    "art studio gallery light color form space line shape texture canvas paper "
+    "ink paint print photo film sound voice story archive project series essay "
+    "review exhibition performance installation sculpture drawing portrait "
+    "landscape city river garden window morning evening winter summer north "
+    "south new old quiet bright open early late small large public private"
+).split()
+HANZI = "艺术画廊光色彩形式空间线条纹理画布纸墨水绘画印刷摄影电影声音故事档案项目系列评论展览表演装置雕塑素描肖像风景城市河流花园窗户早晨夜晚"
+WORDS_PER_ROW = 6
+CHARS_PER_ROW = 12
+DEFAULT_ARRAY_LENGTH = 3
+
+CORPUS_WORDS = 50000
+
+
+def _build_corpus() -> Tuple[str, List[int], str]:
+    """Fixed pseudo-random text that generated values are sliced from"""
+    rng = random.Random(0)
+    words = rng.choices(WORDS, k=CORPUS_WORDS)
+    starts = []
+    offset = 0
+    for word in words:
+        starts.append(offset)
+        offset += len(word) + 1
+    starts.append(offset)
+    return " ".join(words) + " ", starts, "".join(rng.choices(HANZI, k=CORPUS_WORDS))
+
+
+# Built by _load_corpus on first use, so importing the module stays cheap
+_CORPUS = ""
+_STARTS: List[int] = []
+_HANZI_CORPUS = ""
+
+
+def _load_corpus():
+    global _CORPUS, _STARTS, _HANZI_CORPUS
+    if not _STARTS:
+        _CORPUS, _STARTS, _HANZI_CORPUS = _build_corpus()
+
+
+def _words(random_float: Callable[[], float], k: int) -> str:
+    """k consecutive words from a random position in the corpus
+
+    Slicing a prebuilt corpus costs the same for any k, unlike joining k
+    random choices. Beyond the corpus size the whole corpus repeats.
+    """
+    laps, k = divmod(k, CORPUS_WORDS)
+    i = int(random_float() * (CORPUS_WORDS - k))
+    text = _CORPUS[_STARTS[i] : _STARTS[i + k] - 1]
+    if laps:
+        text = _CORPUS * laps + text if text else (_CORPUS * laps)[:-1]
+    return text
+
+
+def _chars(random_float: Callable[[], float], k: int) -> str:
+    """k consecutive characters from a random position in the Chinese corpus"""
+    laps, k = divmod(k, CORPUS_WORDS)
+    i = int(random_float() * (CORPUS_WORDS - k))
+    return _HANZI_CORPUS * laps + _HANZI_CORPUS[i : i + k]
+
+
+RecordFactory = Callable[[random.Random, int], Dict[str, object]]
+
+
+def _value_source(var_type: VariableType, name: str, rows: int) -> str:
+    """Python expression producing one value for a variable"""
+    size = max(rows, 1)
+    words = f"_words(rnd, {WORDS_PER_ROW * size})"
+    if var_type == VariableType.IMAGE:
+        return f"{'/images/' + quote(name) + '/'!r} + str(n) + '.jpg'"
+    if var_type == VariableType.URL:
+        return f"{'https://example.com/' + quote(name) + '/'!r} + str(n)"
+    if var_type == VariableType.ARRAY:
+        length = rows if rows > 0 else DEFAULT_ARRAY_LENGTH
+        return f"[_words(rnd, 3) for _ in range({length})]"
+    if var_type == VariableType.LANGUAGE:
+        chars = f"_chars(rnd, {CHARS_PER_ROW * size})"
+        return f"{{'en': {words}, 'cn': {chars}}}"
+    return words
+
+
+def compile_factory(schema: Schema) -> RecordFactory:
+    """Generate a record factory specialized to one schema
+
+    The factory takes a seeded Random and a record number and returns a dict
+    literal built in a single expression, so per-record cost does not include
+    walking the schema.
+    """
+    _load_corpus()
+    items = []
+    seen = set()
+    for var_type in VariableType:
+        for var in getattr(schema, var_type.value):
+            if var.name in seen:
+                continue
+            seen.add(var.name)
+            items.append(f"        {var.name!r}: {_value_source(var_type, var.name, var.rows)},")
+
+    source = "\n".join(
+        ["def make(rng, n):", "    rnd = rng.random", "    return {", *items, "    }"]
+    )
+    namespace = {"_words": _words, "_chars": _chars}
+    exec(compile(source, f"<generator {schema.name}>", "exec"), namespace)
+    return namespace["make"]
+
+
+def _chunk_rng(seed: int, start: int) -> random.Random:
+    """Random stream for the chunk starting at record number start
+
+    The pair is seeded as a string, which Random hashes with SHA-512, so
+    distinct (seed, start) pairs never share a stream.
+    """
+    return random.Random(f"{seed}:{start}")
+
+
+_worker_factory: Optional[RecordFactory] = None
+
+
+def _init_worker(schema: Schema):
+    """Compile the factory once per worker process"""
+    global _worker_factory
+    _worker_factory = compile_factory(schema)
+
+
+def _generate_chunk(job: Tuple[int, int, int]) -> bytes:
+    """Worker entry point: encode one chunk of records as NDJSON"""
+    seed, start, count = job
+    rng = _chunk_rng(seed, start)
+    make = _worker_factory
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    lines = [encode(make(rng, n)) for n in range(start, start + count)]
+    lines.append("")
+    return "\n".join(lines).encode("utf-8")
+
+
+@dataclass
+class GenerationStats:
+    """Totals for a generation run"""
+
+    records: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+
+class RecordGenerator:
+    """Generates sample content records that match a schema"""
+
+    chunk_records = 10000
+
+    def __init__(self, schema: Schema, seed: Optional[int] = None):
+        self.schema = schema
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.factory = compile_factory(schema)
+        self.stats = GenerationStats()
+
+    def records(self, count: int, start: int = 0) -> Iterator[Dict[str, object]]:
+        """Yield records in-process; numbering matches write_ndjson"""
+        end = start + count
+        chunk_start = start - start % self.chunk_records
+        while chunk_start < end:
+            rng = _chunk_rng(self.seed, chunk_start)
+            for n in range(chunk_start, min(chunk_start + self.chunk_records, end)):
+                record = self.factory(rng, n)
+                if n >= start:
+                    yield record
+            chunk_start += self.chunk_records
+
+    def record(self, n: int) -> Dict[str, object]:
+        """Record number n from a stream of its own, without generating the ones before it
+
+        Reproducible for a seed, but not the record records() yields at n.
+        """
+        return self.factory(random.Random(f"{self.seed}#{n}"), n)
+
+    def write_ndjson(
+        self,
+        path: str,
+        count: int,
+        workers: Optional[int] = None,
+        progress: Optional[Callable[[GenerationStats], bool]] = None,
+        mp_context: Optional[str] = None,
+    ) -> GenerationStats:
+        """Stream count records to an NDJSON file, chunk by chunk
+
+        Chunks are seeded from their position, so the output is the same for
+        any number of workers. The file is written next to the target and
+        moved into place at the end; returning False from progress cancels
+        and leaves the target untouched.
+        """
+        self.stats = stats = GenerationStats()
+        started = time.perf_counter()
+        jobs = [
+            (self.seed, start, min(self.chunk_records, count - start))
+            for start in range(0, count, self.chunk_records)
+        ]
+        workers = min(workers or os.cpu_count() or 1, max(len(jobs), 1))
+
+        if workers > 1:
+            import multiprocessing
+
+            pool = multiprocessing.get_context(mp_context).Pool(
+                workers, _init_worker, (self.schema,)
+            )
+            chunks = pool.imap(_generate_chunk, jobs)
+        else:
+            pool = None
+            _init_worker(self.schema)
+            chunks = map(_generate_chunk, jobs)
+
+        temp_path = f"{path}.part"
+        completed = False
+        try:
+            with open(temp_path, "wb") as f:
+                for (_, _, chunk_count), data in zip(jobs, chunks):
+                    f.write(data)
+                    stats.records += chunk_count
+                    stats.bytes += len(data)
+                    stats.elapsed = time.perf_counter() - started
+                    if progress is not None and progress(stats) is False:
+                        break
+                else:
+                    completed = True
+            if completed:
+                os.replace(temp_path, path)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            if not completed and os.path.exists(temp_path):
+                os.remove(temp_path)
+            stats.elapsed = time.perf_counter() - started
+
+        logger.info(
+            f"Generated {stats.records} records for {self.schema.name} in "
+            f"{stats.elapsed:.2f}s (seed {self.seed})"
+        )
+        return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    import argparse
+    from .schema_manager import SchemaManager
+
+    parser = argparse.ArgumentParser(
+        prog="python -m assets.generator",
+        description="Generate NDJSON sample records from a schema",
+    )
+    parser.add_argument("workspace", help="exported schemas JSON file")
+    parser.add_argument("schema", help="name of the schema to generate records for")
+    parser.add_argument("-n", "--count", type=int, default=1000)
+    parser.add_argument("-o", "--output", help="output file (default: <schema>.ndjson)")
+    parser.add_argument("--seed", type=int, help="seed for reproducible output")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    manager = SchemaManager()
+    manager.import_schemas(iter_workspace(args.workspace))
+    schema = manager.get_schema(args.schema)
+    if schema is None:
+        parser.error(f"schema '{args.schema}' not found in {args.workspace}")
+
+    generator = RecordGenerator(schema, args.seed)
+    output = args.output or f"{args.schema}.ndjson"
+    stats = generator.write_ndjson(output, args.count, workers=args.workers)
+    print(
+        f"Wrote {stats.records} records ({stats.bytes / 1e6:.1f} MB) to {output} "
+        f"in {stats.elapsed:.2f}s, {stats.records_per_second:,.0f} records/s, "
+        f"seed {generator.seed}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
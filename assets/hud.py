@@ -0,0 +1,188 @@
+import os
+import sys
+from collections import deque
+from typing import Deque, Dict, Optional
+from PyQt5.QtWidgets import *
+from PyQt5.QtGui import *
+from PyQt5.QtCore import *
+from .schema_manager import SchemaManager
+from .watchdog import StallWatchdog
+
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+
+    class _MemoryCounters(ctypes.Structure):
+        """PROCESS_MEMORY_COUNTERS"""
+
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+            (name, ctypes.c_size_t)
+            for name in (
+                "PeakWorkingSetSize",
+                "WorkingSetSize",
+                "QuotaPeakPagedPoolUsage",
+                "QuotaPagedPoolUsage",
+                "QuotaPeakNonPagedPoolUsage",
+                "QuotaNonPagedPoolUsage",
+                "PagefileUsage",
+                "PeakPagefileUsage",
+            )
+        ]
+
+    def _working_set() -> Optional[int]:
+        """Working set of this process from GetProcessMemoryInfo"""
+        kernel32 = ctypes.WinDLL("kernel32")
+        psapi = ctypes.WinDLL("psapi")
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        psapi.GetProcessMemoryInfo.argtypes = [
+            wintypes.HANDLE,
+            ctypes.POINTER(_MemoryCounters),
+            wintypes.DWORD,
+        ]
+        psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+        counters = _MemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = kernel32.GetCurrentProcess()
+        if not psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.WorkingSetSize
+
+
+def process_rss() -> Optional[int]:
+    """Resident memory in bytes; the peak where the current size is unavailable"""
+    if sys.platform == "win32":
+        try:
+            return _working_set()
+        except (OSError, AttributeError):
+            return None
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class SpanHistory:
+    """Tracing observer keeping the last few durations of selected spans"""
+
+    def __init__(self, labels: Dict[str, str], size: int = 10):
+        self.labels = labels
+        self.durations: Dict[str, Deque[float]] = {
+            label: deque(maxlen=size) for label in labels.values()
+        }
+
+    def complete(self, name, category, start, end, args=None):
+        label = self.labels.get(name)
+        if label is not None:
+            self.durations[label].append(end - start)
+
+
+class PerformanceHud(QFrame):
+    """Overlay with recent timings, workspace size, memory and stalls"""
+
+    refresh_ms = 500
+    margin = 16
+    font_family = "Consolas"
+    font_size = 14
+
+    def __init__(
+        self,
+        manager: SchemaManager,
+        history: SpanHistory,
+        watchdog: StallWatchdog,
+        parent: QWidget,
+    ):
+        super().__init__(parent)
+        self.manager = manager
+        self.history = history
+        self.watchdog = watchdog
+        self.setObjectName("performanceHud")
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet(
+            f"""
+            QFrame#performanceHud {{
+                background-color: rgba(0, 0, 0, 190);
+                border-radius: 8px;
+            }}
+            QLabel {{
+                color: #FFFFFF;
+                background: transparent;
+                font-family: {self.font_family};
+                font-size: {self.font_size}px;
+            }}
+            """
+        )
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(12, 10, 12, 10)
+        self.label = QLabel()
+        self.label.setTextFormat(Qt.PlainText)
+        layout.addWidget(self.label)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.refresh_ms)
+        self.timer.timeout.connect(self.refresh)
+        parent.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        if watched is self.parent() and event.type() == QEvent.Resize:
+            self._place()
+        return False
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.timer.stop()
+
+    def _place(self):
+        """Keep to the top right corner of the parent"""
+        self.adjustSize()
+        self.move(self.parent().width() - self.width() - self.margin, self.margin)
+        self.raise_()
+
+    def refresh(self):
+        """Redraw from the latest numbers"""
+        lines = [f"{'':<13}{'last':>8}{'avg':>8}{'max':>8}  ms"]
+        for label, durations in self.history.durations.items():
+            if durations:
+                last, average, peak = (
+                    durations[-1],
+                    sum(durations) / len(durations),
+                    max(durations),
+                )
+                lines.append(
+                    f"{label:<13}{last * 1000:8.1f}{average * 1000:8.1f}{peak * 1000:8.1f}"
+                    f"  ({len(durations)})"
+                )
+            else:
+                lines.append(f"{label:<13}{'-':>8}")
+
+        lines.append("")
+        lines.append(f"{'schemas':<13}{len(self.manager.schemas):>8,}")
+        lines.append(f"{'variables':<13}{self.manager.variable_count():>8,}")
+        rss = process_rss()
+        if rss:
+            lines.append(f"{'memory':<13}{rss / 2**20:8.1f} MB")
+
+        stalls = self.watchdog.stalls
+        if stalls:
+            last = stalls[-1]
+            where = f" in {last.handler}" if last.handler else ""
+            lines.append(
+                f"{'stalls':<13}{self.watchdog.count:>8}  last {last.duration * 1000:.0f} ms{where}"
+            )
+        else:
+            lines.append(f"{'stalls':<13}{0:>8}")
+
+        self.label.setText("\n".join(lines))
+        self._place()
@@ -0,0 +1,484 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, List, Optional, Set, Tuple
+from .models import Schema, Variable, VariableType
+
+# CJK runs are indexed as overlapping bigrams; everything else as words
+_CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_TOKEN_PATTERN = re.compile(f"([{_CJK_CHARS}]+)|([^\\W_{_CJK_CHARS}]+)")
+_CJK_PATTERN = re.compile(f"[{_CJK_CHARS}]")
+
+# Enum hashing and .value lookups are slow on hot paths, so indexes work
+# with the plain field names and convert back at the API boundary
+_VARIABLE_FIELDS = [var_type.value for var_type in VariableType]
+
+
+@lru_cache(maxsize=65536)
+def _tokenize_cached(text: str) -> Tuple[str, ...]:
+    tokens = []
+    for cjk, word in _TOKEN_PATTERN.findall(text.lower()):
+        if word:
+            tokens.append(word)
+        elif len(cjk) == 1:
+            tokens.append(cjk)
+        else:
+            tokens.extend(cjk[i : i + 2] for i in range(len(cjk) - 1))
+    return tuple(tokens)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens and CJK bigrams"""
+    # Labels repeat heavily across schemas, so tokenization is memoized
+    return list(_tokenize_cached(text))
+
+
+class SchemaIndex:
+    """Base class for indexes kept up to date by SchemaManager
+
+    Indexes remember what they stored for each schema name, so a schema can
+    be discarded by name even after its object has been edited in place.
+    """
+
+    def clear(self):
+        """Drop all indexed data"""
+        raise NotImplementedError
+
+    def add(self, schema: Schema):
+        """Index a schema under its current name"""
+        raise NotImplementedError
+
+    def discard(self, name: str):
+        """Remove everything indexed for a schema name"""
+        raise NotImplementedError
+
+    def update_variable(
+        self,
+        schema: Schema,
+        var_type: VariableType,
+        old: Optional[Variable],
+        new: Optional[Variable],
+    ):
+        """Apply a single variable insert/update/removal (already applied to schema)"""
+        self.discard(schema.name)
+        self.add(schema)
+
+
+class VariableIndex(SchemaIndex):
+    """Inverted index from variable name to the schemas and types using it"""
+
+    def __init__(self):
+        # variable name -> schema name -> variable field -> occurrences
+        self._postings: Dict[str, Dict[str, Dict[str, int]]] = {}
+        self._forward: Dict[str, Set[str]] = {}
+
+    def clear(self):
+        self._postings.clear()
+        self._forward.clear()
+
+    def add(self, schema: Schema):
+        self._forward[schema.name] = set()
+        for field_name in _VARIABLE_FIELDS:
+            for var in getattr(schema, field_name):
+                self._increment(schema.name, field_name, var.name)
+
+    def discard(self, name: str):
+        for var_name in self._forward.pop(name, ()):
+            schemas = self._postings.get(var_name)
+            if schemas is None:
+                continue
+            schemas.pop(name, None)
+            if not schemas:
+                del self._postings[var_name]
+
+    def update_variable(self, schema, var_type, old, new):
+        if old is not None:
+            self._decrement(schema.name, var_type.value, old.name)
+        if new is not None:
+            self._increment(schema.name, var_type.value, new.name)
+
+    def _increment(self, schema_name: str, field_name: str, var_name: str):
+        types = self._postings.setdefault(var_name, {}).setdefault(schema_name, {})
+        types[field_name] = types.get(field_name, 0) + 1
+        self._forward.setdefault(schema_name, set()).add(var_name)
+
+    def _decrement(self, schema_name: str, field_name: str, var_name: str):
+        schemas = self._postings.get(var_name, {})
+        types = schemas.get(schema_name)
+        if not types or field_name not in types:
+            return
+        types[field_name] -= 1
+        if types[field_name] <= 0:
+            del types[field_name]
+        if not types:
+            del schemas[schema_name]
+            self._forward[schema_name].discard(var_name)
+        if not schemas:
+            del self._postings[var_name]
+
+    def usages(self, var_name: str) -> List[Tuple[str, VariableType]]:
+        """List (schema name, variable type) pairs using a variable name"""
+        schemas = self._postings.get(var_name, {})
+        return [
+            (schema_name, VariableType(field_name))
+            for schema_name in sorted(schemas)
+            for field_name in sorted(schemas[schema_name], key=_VARIABLE_FIELDS.index)
+        ]
+
+    def schemas_using(self, var_name: str) -> Set[str]:
+        """Names of schemas that contain a variable name"""
+        return set(self._postings.get(var_name, ()))
+
+    def variable_names(self) -> List[str]:
+        """All indexed variable names"""
+        return sorted(self._postings)
+
+    def __contains__(self, var_name: str) -> bool:
+        return var_name in self._postings
+
+
+class TextIndex(SchemaIndex):
+    """Weighted full-text index over schema names, page titles and variables"""
+
+    NAME_WEIGHT = 3.0
+    TITLE_WEIGHT = 2.0
+    VARIABLE_WEIGHT = 1.0
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._forward: Dict[str, Dict[str, float]] = {}
+        # Sorted vocabulary for prefix expansion; may hold tokens that have
+        # since lost all postings, which searches skip
+        self._vocabulary: List[str] = []
+
+    def clear(self):
+        self._postings.clear()
+        self._forward.clear()
+        self._vocabulary.clear()
+
+    def _variable_terms(self, variables: List[Variable]) -> Dict[str, float]:
+        terms: Dict[str, float] = {}
+        get = terms.get
+        weight = self.VARIABLE_WEIGHT
+        for var in variables:
+            for text in (var.name, var.en_text, var.cn_text):
+                for token in _tokenize_cached(text):
+                    terms[token] = get(token, 0.0) + weight
+        return terms
+
+    def _schema_terms(self, schema: Schema) -> Dict[str, float]:
+        variables: List[Variable] = []
+        for field_name in _VARIABLE_FIELDS:
+            variables += getattr(schema, field_name)
+        terms = self._variable_terms(variables)
+        for token in _tokenize_cached(schema.name):
+            terms[token] = terms.get(token, 0.0) + self.NAME_WEIGHT
+        for text in (schema.page_title_cn, schema.page_title_en):
+            for token in _tokenize_cached(text):
+                terms[token] = terms.get(token, 0.0) + self.TITLE_WEIGHT
+        return terms
+
+    def _adjust(self, name: str, terms: Dict[str, float], sign: float):
+        forward = self._forward.setdefault(name, {})
+        for token, weight in terms.items():
+            docs = self._postings.get(token)
+            if docs is None:
+                docs = self._postings[token] = {}
+                i = bisect_left(self._vocabulary, token)
+                if i == len(self._vocabulary) or self._vocabulary[i] != token:
+                    self._vocabulary.insert(i, token)
+            value = docs.get(name, 0.0) + sign * weight
+            if value > 1e-9:
+                docs[name] = value
+                forward[token] = value
+            else:
+                docs.pop(name, None)
+                forward.pop(token, None)
+                if not docs:
+                    del self._postings[token]
+
+    def add(self, schema: Schema):
+        self._adjust(schema.name, self._schema_terms(schema), 1.0)
+
+    def discard(self, name: str):
+        for token in self._forward.pop(name, {}):
+            docs = self._postings.get(token)
+            if docs is None:
+                continue
+            docs.pop(name, None)
+            if not docs:
+                del self._postings[token]
+
+    def update_variable(self, schema, var_type, old, new):
+        for variable, sign in ((old, -1.0), (new, 1.0)):
+            if variable is not None:
+                self._adjust(schema.name, self._variable_terms([variable]), sign)
+
+    def _expand(self, token: str, prefix: bool) -> List[str]:
+        """Vocabulary tokens matching a query token"""
+        if not prefix:
+            return [token] if token in self._postings else []
+        matches = []
+        i = bisect_left(self._vocabulary, token)
+        while i < len(self._vocabulary) and self._vocabulary[i].startswith(token):
+            if self._vocabulary[i] in self._postings:
+                matches.append(self._vocabulary[i])
+            i += 1
+        return matches
+
+    def search(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Rank schemas containing every query term (last word matches as prefix)"""
+        tokens = list(dict.fromkeys(tokenize(text)))
+        if not tokens:
+            return []
+
+        # A trailing word is still being typed, so it matches as a prefix
+        last_is_word = text[-1:].isalnum() and not _CJK_PATTERN.match(tokens[-1])
+        doc_count = max(len(self._forward), 1)
+
+        # Each term becomes a list of (postings, idf) pairs, one per expansion
+        terms = []
+        for position, token in enumerate(tokens):
+            # Single CJK characters also match the bigrams they start
+            prefix = (last_is_word and position == len(tokens) - 1) or (
+                len(token) == 1 and bool(_CJK_PATTERN.match(token))
+            )
+            expansions = [
+                (self._postings[match], math.log(1.0 + doc_count / len(self._postings[match])))
+                for match in self._expand(token, prefix)
+            ]
+            if not expansions:
+                return []
+            terms.append(expansions)
+
+        # Drive the intersection from the most selective term
+        terms.sort(key=lambda expansions: sum(len(docs) for docs, _ in expansions))
+        ranked: Dict[str, float] = {}
+        for docs, idf in terms[0]:
+            for name, weight in docs.items():
+                ranked[name] = ranked.get(name, 0.0) + weight * idf
+
+        for expansions in terms[1:]:
+            narrowed: Dict[str, float] = {}
+            for name, score in ranked.items():
+                matched = False
+                for docs, idf in expansions:
+                    weight = docs.get(name)
+                    if weight is not None:
+                        score += weight * idf
+                        matched = True
+                if matched:
+                    narrowed[name] = score
+            ranked = narrowed
+            if not ranked:
+                return []
+
+        if limit is None:
+            return sorted(ranked, key=lambda name: (-ranked[name], name))
+        return [
+            name
+            for name, _ in heapq.nsmallest(
+                limit, ranked.items(), key=lambda item: (-item[1], item[0])
+            )
+        ]
+
+
+def trigrams(text: str) -> Set[str]:
+    """Padded character trigrams of a lowercase string"""
+    padded = f"  {text.lower()} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex(SchemaIndex):
+    """Trigram index over names for typo-tolerant fuzzy lookup
+
+    As a SchemaIndex it tracks schema names; add_name()/discard_name() let it
+    index any other identifiers, such as template ids.
+    """
+
+    # Broad queries score prefix hits plus a bounded slice of the pool
+    MAX_SCORED_CANDIDATES = 500
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._sorted: List[Tuple[str, str]] = []
+
+    def clear(self):
+        self._postings.clear()
+        self._grams.clear()
+        self._sorted.clear()
+
+    def add(self, schema: Schema):
+        self.add_name(schema.name)
+
+    def discard(self, name: str):
+        self.discard_name(name)
+
+    def update_variable(self, schema, var_type, old, new):
+        pass
+
+    def add_name(self, name: str):
+        """Index an identifier"""
+        self.discard_name(name)
+        grams = trigrams(name)
+        self._grams[name] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(name)
+        entry = (name.lower(), name)
+        self._sorted.insert(bisect_left(self._sorted, entry), entry)
+
+    def discard_name(self, name: str):
+        """Remove an identifier"""
+        if name not in self._grams:
+            return
+        entry = (name.lower(), name)
+        i = bisect_left(self._sorted, entry)
+        if i < len(self._sorted) and self._sorted[i] == entry:
+            del self._sorted[i]
+        for gram in self._grams.pop(name):
+            names = self._postings.get(gram)
+            if names is None:
+                continue
+            names.discard(name)
+            if not names:
+                del self._postings[gram]
+
+    def _prefixed(self, prefix: str, limit: int) -> List[str]:
+        """Names starting with a lowercase prefix, in sorted order"""
+        matches = []
+        i = bisect_left(self._sorted, (prefix, ""))
+        while i < len(self._sorted) and len(matches) < limit:
+            lowered, name = self._sorted[i]
+            if not lowered.startswith(prefix):
+                break
+            matches.append(name)
+            i += 1
+        return matches
+
+    def search(self, query: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """Rank names by trigram similarity with substring and prefix bonuses"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        query_grams = trigrams(query)
+        postings = sorted(
+            (self._postings[gram] for gram in query_grams if gram in self._postings),
+            key=len,
+        )
+        if not postings:
+            return []
+
+        # Enough prefix hits already outrank anything else; otherwise names
+        # containing every query trigram are the close matches, with the
+        # union of rarer trigrams as a fallback so typos still find candidates
+        prefixed = self._prefixed(query, self.MAX_SCORED_CANDIDATES)
+        if len(prefixed) >= limit:
+            candidates = set(prefixed)
+        else:
+            candidates = postings[0].intersection(*postings[1:])
+        if len(candidates) < limit:
+            for names in postings:
+                if len(candidates) + len(names) > self.MAX_SCORED_CANDIDATES * 4:
+                    break
+                candidates = candidates | names
+        if len(candidates) > self.MAX_SCORED_CANDIDATES:
+            candidates = set(prefixed).union(
+                islice(candidates, self.MAX_SCORED_CANDIDATES)
+            )
+
+        scored = []
+        for name in candidates:
+            grams = self._grams[name]
+            score = 2.0 * len(query_grams & grams) / (len(query_grams) + len(grams))
+            lowered = name.lower()
+            if lowered.startswith(query):
+                score += 0.5
+            elif query in lowered:
+                score += 0.25
+            scored.append((score, name))
+
+        best = heapq.nlargest(limit, scored, key=lambda item: (item[0], -len(item[1])))
+        return [(name, score) for score, name in best]
+
+
+class AttributeIndex(SchemaIndex):
+    """Posting lists keyed by schema flags, per-type counts and variable stats
+
+    Exact keys are tuples such as ("filter_with", "yes") or ("missing", "cn");
+    numeric attributes ("rows", "vars", "count:<field>") are keyed by value so
+    comparisons can union the postings of every matching value.
+    """
+
+    NUMERIC_ATTRIBUTES = ["rows", "vars"] + [f"count:{f}" for f in _VARIABLE_FIELDS]
+
+    def __init__(self):
+        self._postings: Dict[Tuple, Set[str]] = {}
+        self._values: Dict[str, Set[int]] = {}
+        self._forward: Dict[str, List[Tuple]] = {}
+
+    def clear(self):
+        self._postings.clear()
+        self._values.clear()
+        self._forward.clear()
+
+    def _keys(self, schema: Schema) -> Set[Tuple]:
+        keys = {
+            ("filter_with", schema.filter_with),
+            ("match_img", schema.match_img),
+        }
+        total = 0
+        for field_name in _VARIABLE_FIELDS:
+            variables = getattr(schema, field_name)
+            total += len(variables)
+            keys.add((f"count:{field_name}", len(variables)))
+            for var in variables:
+                keys.add(("rows", var.rows))
+                if not var.cn_text:
+                    keys.add(("missing", "cn"))
+                if not var.en_text:
+                    keys.add(("missing", "en"))
+        keys.add(("vars", total))
+        return keys
+
+    def add(self, schema: Schema):
+        keys = self._keys(schema)
+        self._forward[schema.name] = list(keys)
+        for key in keys:
+            self._postings.setdefault(key, set()).add(schema.name)
+            if key[0] in self.NUMERIC_ATTRIBUTES:
+                self._values.setdefault(key[0], set()).add(key[1])
+
+    def discard(self, name: str):
+        for key in self._forward.pop(name, ()):
+            names = self._postings.get(key)
+            if names is None:
+                continue
+            names.discard(name)
+            if not names:
+                del self._postings[key]
+                if key[0] in self._values:
+                    self._values[key[0]].discard(key[1])
+
+    def lookup(self, *key) -> Set[str]:
+        """Names posted under an exact key"""
+        return self._postings.get(tuple(key), set())
+
+    def compare(self, attribute: str, op: str, value: int) -> Set[str]:
+        """Union of postings for numeric values satisfying a comparison"""
+        tests = {
+            ">": lambda v: v > value,
+            ">=": lambda v: v >= value,
+            "<": lambda v: v < value,
+            "<=": lambda v: v <= value,
+            "=": lambda v: v == value,
+        }
+        test = tests[op]
+        result: Set[str] = set()
+        for candidate in self._values.get(attribute, ()):
+            if test(candidate):
+                result |= self._postings.get((attribute, candidate), set())
+        return result
@@ -0,0 +1,179 @@
+import re
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Set, Tuple
+from .models import Schema, VariableType
+from .events import ChangeKind, SchemaEvent
+
+IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+SEVERITY_ORDER = {"error": 0, "warning": 1, "info": 2}
+
+
+@dataclass(frozen=True)
+class LintIssue:
+    """A single problem found in a schema"""
+
+    schema_name: str
+    severity: str
+    code: str
+    message: str
+    var_type: Optional[VariableType] = None
+    var_name: str = ""
+
+
+def content_hash(schema: Schema) -> str:
+    """Hash of a schema's content, independent of its name"""
+    return schema.content_hash()
+
+
+def lint_schema(schema: Schema, rows_outlier_limit: int = 20) -> List[LintIssue]:
+    """Run every rule against one schema"""
+    issues = []
+    seen: Dict[str, VariableType] = {}
+    reported: Set[str] = set()
+
+    for var_type in VariableType:
+        type_label = var_type.name.replace("_", " ").title()
+        for var in getattr(schema, var_type.value):
+
+            def issue(severity: str, code: str, message: str):
+                issues.append(
+                    LintIssue(schema.name, severity, code, message, var_type, var.name)
+                )
+
+            if var.name in seen and var.name not in reported:
+                reported.add(var.name)
+                first = seen[var.name].name.replace("_", " ").title()
+                issue(
+                    "error",
+                    "duplicate-variable",
+                    f"'{var.name}' is defined more than once ({first} and {type_label})",
+                )
+            seen.setdefault(var.name, var_type)
+
+            if not IDENTIFIER_PATTERN.match(var.name):
+                issue("error", "invalid-identifier", f"'{var.name}' is not a valid identifier")
+            if not var.en_text.strip():
+                issue("warning", "empty-en", f"'{var.name}' has no English text")
+            if not var.cn_text.strip():
+                issue("warning", "empty-cn", f"'{var.name}' has no Chinese text")
+            if var.rows < 0:
+                issue("error", "negative-rows", f"'{var.name}' has negative rows ({var.rows})")
+            elif var.rows > rows_outlier_limit:
+                issue(
+                    "warning",
+                    "rows-outlier",
+                    f"'{var.name}' has {var.rows} rows (limit {rows_outlier_limit})",
+                )
+    return issues
+
+
+class WorkspaceLinter:
+    """Incremental linter over a SchemaManager
+
+    Change events mark schemas dirty; run() rechecks only those, and results
+    are cached by content hash so renamed or duplicated schemas with known
+    content are never re-linted. Schemas nobody has edited since a reset are
+    kept apart as unchecked, so callers can leave them (and a lazily loaded
+    snapshot) alone until the whole workspace is wanted.
+    """
+
+    def __init__(self, schema_manager, rows_outlier_limit: int = 20):
+        self.schema_manager = schema_manager
+        self.rows_outlier_limit = rows_outlier_limit
+        self._results: Dict[str, Tuple[str, List[LintIssue]]] = {}
+        self._by_hash: Dict[str, List[LintIssue]] = {}
+        self._dirty: Set[str] = set()
+        self._unchecked: Set[str] = set(schema_manager.schemas)
+        schema_manager.subscribe(self._on_schema_events)
+
+    def _on_schema_events(self, events: List[SchemaEvent]):
+        """Track which schemas need rechecking"""
+        for event in events:
+            if event.kind == ChangeKind.RESET:
+                self._results.clear()
+                self._dirty = set()
+                self._unchecked = set(self.schema_manager.schemas)
+            elif event.kind == ChangeKind.SCHEMA_REMOVED:
+                self._results.pop(event.schema_name, None)
+                self._dirty.discard(event.schema_name)
+                self._unchecked.discard(event.schema_name)
+            elif event.kind == ChangeKind.SCHEMA_RENAMED:
+                self._results.pop(event.old_name, None)
+                self._dirty.discard(event.old_name)
+                self._unchecked.discard(event.old_name)
+                self._dirty.add(event.schema_name)
+            else:
+                self._unchecked.discard(event.schema_name)
+                self._dirty.add(event.schema_name)
+
+    @property
+    def pending(self) -> int:
+        """Number of edited schemas waiting to be rechecked"""
+        return len(self._dirty)
+
+    @property
+    def unchecked(self) -> int:
+        """Number of schemas not checked since the last reset"""
+        return len(self._unchecked)
+
+    def run(self, limit: Optional[int] = None, unchecked: bool = True) -> int:
+        """Recheck dirty schemas; returns how many were actually linted
+
+        Edited schemas go first, then unchecked ones unless unchecked is
+        False. With a limit at most that many schemas are looked at, and the
+        rest wait for the next call.
+        """
+        linted = 0
+        budget = limit
+        for queue in (self._dirty, self._unchecked) if unchecked else (self._dirty,):
+            while queue and (budget is None or budget > 0):
+                linted += self._check(queue.pop())
+                if budget is not None:
+                    budget -= 1
+
+        # Drop cached content that no schema has any more
+        if len(self._by_hash) > 2 * len(self._results) + 1000:
+            live = {digest for digest, _ in self._results.values()}
+            self._by_hash = {d: i for d, i in self._by_hash.items() if d in live}
+        return linted
+
+    def _check(self, name: str) -> int:
+        """Refresh one schema's results; 1 if it had to be linted"""
+        schema = self.schema_manager.get_schema(name)
+        if schema is None:
+            self._results.pop(name, None)
+            return 0
+        digest = content_hash(schema)
+        cached = self._results.get(name)
+        if cached and cached[0] == digest:
+            return 0
+
+        template = self._by_hash.get(digest)
+        linted = 0
+        if template is None:
+            template = lint_schema(schema, self.rows_outlier_limit)
+            self._by_hash[digest] = template
+            linted = 1
+        issues = [
+            issue if issue.schema_name == name else replace(issue, schema_name=name)
+            for issue in template
+        ]
+        self._results[name] = (digest, issues)
+        return linted
+
+    def issues(self) -> List[LintIssue]:
+        """All current issues across the workspace"""
+        return [issue for _, issues in self._results.values() for issue in issues]
+
+    def issues_for(self, schema_name: str) -> List[LintIssue]:
+        """Current issues for one schema"""
+        return list(self._results.get(schema_name, ("", []))[1])
+
+    def counts(self) -> Dict[str, int]:
+        """Issue counts by severity"""
+        counts = {severity: 0 for severity in SEVERITY_ORDER}
+        for _, issues in self._results.values():
+            for issue in issues:
+                counts[issue.severity] += 1
+        return counts
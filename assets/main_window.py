@@ -1,22 +1,78 @@
+import csv
 import json
 import os
 import re
 import logging
+import time
+from bisect import bisect_left
+from dataclasses import replace
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
 from PyQt5.QtCore import *
 
-from .models import Schema, VariableType
+from .models import Schema, Variable, VariableType
+from .events import ChangeKind, SchemaEvent
 from .design_system import StyleSheets
-from .widgets import Card
-from .dialogs import VariableDialog
-from .schema_manager import SchemaManager
-from templates.preview_dialog import TemplatePreviewDialog
+from . import profiling, tracing
+from .widgets import Card, LazyTabPage, ProblemsModel
+from .watchdog import StallWatchdog
+from .dialogs import (
+    FuzzyFinderDialog,
+    RecordValidationDialog,
+    SampleDataThread,
+    UsagesDialog,
+    VariableDialog,
+)
+from .schema_manager import BatchError, SchemaManager
+from .query import QuerySyntaxError
+from .linter import WorkspaceLinter
+from .exporters import MANIFEST_FILENAME, DeltaExporter, write_export
+from .fileio import DEFAULT_LEVELS, iter_workspace
+
+# The template system, sample data generator and mock server are imported
+# by the handlers that use them, so they cost nothing until first use
+if TYPE_CHECKING:
+    from .hud import PerformanceHud
+    from .mock_server import MockContentServer
 
 logger = logging.getLogger(__name__)
 
+# Map display type to variable type
+VARIABLE_TYPE_LABELS = {
+    "Basic Variable": VariableType.BASIC,
+    "More Variable": VariableType.MORE,
+    "Image Variable": VariableType.IMAGE,
+    "URL Variable": VariableType.URL,
+    "Array Variable": VariableType.ARRAY,
+    "Language Item Variable": VariableType.LANGUAGE,
+}
+
+# Export file filters and the extension each implies; compression and
+# format are inferred from the extension
+EXPORT_FILTERS = {
+    "JSON Files (*.json)": ".json",
+    "Minified JSON (*.min.json)": ".min.json",
+    "NDJSON (*.ndjson)": ".ndjson",
+    "Gzipped JSON (*.json.gz)": ".json.gz",
+    "Gzipped NDJSON (*.ndjson.gz)": ".ndjson.gz",
+    "XZ NDJSON (*.ndjson.xz)": ".ndjson.xz",
+    "Bzip2 JSON (*.json.bz2)": ".json.bz2",
+    "All Files (*)": "",
+}
+
+BACKUP_EXTENSIONS = {"gzip": ".gz", "xz": ".xz", "bz2": ".bz2"}
+
+# Spans timed by the performance HUD, and the label each is shown under
+HUD_SPANS = {
+    "MainWindow._update_preview": "preview",
+    "MainWindow._update_schema_list": "list refresh",
+    "SchemaManager.update_schema": "save",
+    "MainWindow._auto_save": "auto-save",
+    "MainWindow.import": "import",
+}
+
 
 class MainWindow(QMainWindow):
     """Main application window"""
@@ -24,6 +80,15 @@ class MainWindow(QMainWindow):
     # Font and size parameters for easy adjustment
     main_font_family = "Consolas, Monaco, JetBrains Mono, monospace"
     main_font_size = 20
+    search_debounce_ms = 150
+    lint_debounce_ms = 300
+    lint_slice = 500  # schemas checked per event-loop turn
+    backup_dir = "backups"
+    snapshot_filename = "workspace.snapshot"
+    backup_compression: Optional[str] = "gzip"
+    backup_compression_level = DEFAULT_LEVELS["gzip"]
+    stall_threshold_ms = 200
+    hud_history = 10
     header_font_size = 24
     preview_font_family = "Consolas"
     preview_font_size = 18
@@ -43,15 +108,37 @@ class MainWindow(QMainWindow):
         self.schema_manager = SchemaManager()
         self.current_schema: Optional[Schema] = None
         self.unsaved_changes = False
+        self._workspace_dirty = False
+
+        # View mirrors, kept in step with the manager through change events
+        self._schema_names: List[str] = []
+        self._variable_counts: Dict[VariableType, int] = {t: 0 for t in VariableType}
+        self._search_text = ""
+        self._hidden_names: Set[str] = set()
+        self._search_results: List[str] = []
+        self.mock_server: Optional["MockContentServer"] = None
+        self.hud: Optional["PerformanceHud"] = None
+        self._last_export_dir = ""
+
+        # Deliver coalesced change events once per event-loop tick
+        self.schema_manager.set_scheduler(lambda flush: QTimer.singleShot(0, flush))
+        self.schema_manager.subscribe(self._on_schema_events)
 
         # Setup UI
-        self._setup_ui()
-        self._setup_shortcuts()
-        self._setup_auto_save()
+        with profiling.phase("_setup_ui"):
+            self._setup_ui()
+        with profiling.phase("shortcuts, timers and linter"):
+            self._setup_shortcuts()
+            self._setup_auto_save()
+            self._setup_linter()
+            self._setup_watchdog()
 
         # Show welcome message
         self._show_status("Welcome to Schema Designer Pro", "info")
 
+        # Reopen the last session once the window has been shown
+        QTimer.singleShot(0, self._restore_snapshot)
+
     def _setup_ui(self):
         """Setup the main UI"""
         # Central widget
@@ -74,9 +161,12 @@ class MainWindow(QMainWindow):
         content_layout.setContentsMargins(24, 24, 24, 24)
 
         # Create panels
-        left_panel = self._create_schema_panel()
-        center_panel = self._create_editor_panel()
-        right_panel = self._create_preview_panel()
+        with profiling.phase("schema panel"):
+            left_panel = self._create_schema_panel()
+        with profiling.phase("editor panel"):
+            center_panel = self._create_editor_panel()
+        with profiling.phase("preview panel"):
+            right_panel = self._create_preview_panel()
 
         # Add to splitter
         splitter = QSplitter(Qt.Horizontal)
@@ -101,6 +191,22 @@ class MainWindow(QMainWindow):
         self.dark_mode_btn.clicked.connect(self._toggle_dark_mode)
         self.status_bar.addPermanentWidget(self.dark_mode_btn)
 
+        # Performance trace recording; already on when started with TRACE_ENV
+        self.trace_btn = QToolButton()
+        self.trace_btn.setText("⏺")
+        self.trace_btn.setCheckable(True)
+        self.trace_btn.setChecked(tracing.is_enabled())
+        self.trace_btn.setToolTip("Record a performance trace (Ctrl+Shift+T)")
+        self.trace_btn.toggled.connect(self._toggle_tracing)
+        self.status_bar.addPermanentWidget(self.trace_btn)
+
+        self.hud_btn = QToolButton()
+        self.hud_btn.setText("⏱")
+        self.hud_btn.setCheckable(True)
+        self.hud_btn.setToolTip("Show the performance overlay (Ctrl+Shift+H)")
+        self.hud_btn.toggled.connect(self._toggle_hud)
+        self.status_bar.addPermanentWidget(self.hud_btn)
+
     def _create_ascii_header(self) -> QWidget:
         """Create ASCII art header with instructions"""
         header = QWidget()
@@ -145,6 +251,51 @@ class MainWindow(QMainWindow):
 
         return header
 
+    def _toggle_tracing(self, checked: bool):
+        """Start recording a performance trace, or stop and save it"""
+        if checked:
+            tracing.start()
+            self._show_status("Recording a performance trace")
+            return
+
+        tracer = tracing.stop()
+        if tracer is None:
+            return
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        file_name, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Performance Trace",
+            f"trace_{timestamp}.json",
+            "Chrome Trace (*.json);;All Files (*)",
+        )
+        if not file_name:
+            self._show_status("Trace discarded", "warning")
+            return
+        try:
+            tracer.save(file_name)
+            self._show_status(
+                f"Saved {len(tracer.events)} trace events to {os.path.basename(file_name)}; "
+                "open it in chrome://tracing or ui.perfetto.dev"
+            )
+        except OSError as e:
+            QMessageBox.critical(self, "Trace Error", str(e))
+            logger.error(f"Trace save error: {e}")
+
+    def _toggle_hud(self, checked: bool):
+        """Show or hide the performance overlay, creating it on first use"""
+        if self.hud is None:
+            if not checked:
+                return
+            from .hud import PerformanceHud, SpanHistory
+
+            history = SpanHistory(HUD_SPANS, self.hud_history)
+            # Timings are collected from here on, whether or not it is shown
+            tracing.add_observer(history)
+            self.hud = PerformanceHud(
+                self.schema_manager, history, self.stall_watchdog, self.centralWidget()
+            )
+        self.hud.setVisible(checked)
+
     def _toggle_dark_mode(self):
         """Toggle between light and dark mode"""
         self.dark_mode = not self.dark_mode
@@ -208,10 +359,21 @@ class MainWindow(QMainWindow):
         layout.addLayout(header_layout)
 
         # Search
-        search_input = QLineEdit()
-        search_input.setPlaceholderText("Search schemas...")
-        search_input.textChanged.connect(self._filter_schemas)
-        layout.addWidget(search_input)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search... (e.g. has:image var:cover_img_url rows>3)")
+        self.search_input.setToolTip(
+            "Free text searches names, titles and labels. Filters: filter_with:yes, "
+            "match_img:no, has:<type>, var:<name>, missing:cn|en, rows>3, vars<=10, "
+            "image>=2. Prefix a filter with '-' to exclude."
+        )
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.search_debounce_ms)
+        self.search_timer.timeout.connect(
+            lambda: self._filter_schemas(self.search_input.text())
+        )
+        self.search_input.textChanged.connect(self.search_timer.start)
+        layout.addWidget(self.search_input)
 
         # Schema list
         self.schema_list = QListWidget()
@@ -264,9 +426,34 @@ class MainWindow(QMainWindow):
         export_selected_btn.setObjectName("secondary")
         export_selected_btn.clicked.connect(self._export_selected)
 
+        export_changes_btn = QPushButton("EXPORT CHANGES")
+        export_changes_btn.setObjectName("secondary")
+        export_changes_btn.setToolTip("Export only schemas changed since the last EXPORT ALL")
+        export_changes_btn.clicked.connect(self._export_changes)
+
+        validate_btn = QPushButton("VALIDATE RECORDS")
+        validate_btn.setObjectName("secondary")
+        validate_btn.setToolTip("Check an NDJSON record file against the selected schema")
+        validate_btn.clicked.connect(self._validate_records)
+
+        generate_btn = QPushButton("GENERATE SAMPLE DATA")
+        generate_btn.setObjectName("secondary")
+        generate_btn.setToolTip("Write NDJSON records that match the selected schema")
+        generate_btn.clicked.connect(self._generate_sample_data)
+
+        self.mock_server_btn = QPushButton("START MOCK API")
+        self.mock_server_btn.setObjectName("secondary")
+        self.mock_server_btn.setCheckable(True)
+        self.mock_server_btn.setToolTip("Serve schemas and sample records on localhost")
+        self.mock_server_btn.toggled.connect(self._toggle_mock_server)
+
         file_btn_layout.addWidget(import_btn)
         file_btn_layout.addWidget(export_btn)
         file_btn_layout.addWidget(export_selected_btn)
+        file_btn_layout.addWidget(export_changes_btn)
+        file_btn_layout.addWidget(validate_btn)
+        file_btn_layout.addWidget(generate_btn)
+        file_btn_layout.addWidget(self.mock_server_btn)
         layout.addLayout(file_btn_layout)
 
         return panel
@@ -308,9 +495,15 @@ class MainWindow(QMainWindow):
         basic_tab = self._create_basic_tab()
         self.editor_tabs.addTab(basic_tab, "Basic Information")
 
-        # Variables tab
-        variables_tab = self._create_variables_tab()
-        self.editor_tabs.addTab(variables_tab, "Variables")
+        # The other tabs start hidden and are built when first opened
+        self.variables_page = LazyTabPage(self._create_variables_tab)
+        self.variables_page.setObjectName("variablesTab")
+        self.editor_tabs.addTab(self.variables_page, "Variables")
+
+        self.problems_page = LazyTabPage(self._create_problems_tab)
+        self.problems_page.setObjectName("problemsTab")
+        self.problems_tab_index = self.editor_tabs.addTab(self.problems_page, "Problems")
+        self.editor_tabs.currentChanged.connect(self._build_editor_tab)
 
         layout.addWidget(self.editor_tabs, 1)
 
@@ -387,16 +580,7 @@ class MainWindow(QMainWindow):
         type_layout = QHBoxLayout()
 
         self.var_type_combo = QComboBox()
-        self.var_type_combo.addItems(
-            [
-                "Basic Variable",
-                "More Variable",
-                "Image Variable",
-                "URL Variable",
-                "Array Variable",
-                "Language Item Variable",
-            ]
-        )
+        self.var_type_combo.addItems(list(VARIABLE_TYPE_LABELS))
         type_layout.addWidget(QLabel("Type:"))
         type_layout.addWidget(self.var_type_combo, 1)
 
@@ -425,14 +609,53 @@ class MainWindow(QMainWindow):
         delete_btn.setObjectName("danger")
         delete_btn.clicked.connect(self._delete_variable)
 
+        import_csv_btn = QPushButton("IMPORT CSV")
+        import_csv_btn.setObjectName("secondary")
+        import_csv_btn.setToolTip("Add variables from a CSV file (type, name, en, cn, rows)")
+        import_csv_btn.clicked.connect(self._import_variables_csv)
+
         var_btn_layout.addWidget(edit_btn)
         var_btn_layout.addWidget(delete_btn)
         var_btn_layout.addStretch()
+        var_btn_layout.addWidget(import_csv_btn)
 
         layout.addLayout(var_btn_layout)
 
         return tab
 
+    def _create_problems_tab(self) -> QWidget:
+        """Create the workspace problems tab"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        layout.setSpacing(16)
+
+        self.problems_summary = QLabel(self._problems_summary_text())
+        layout.addWidget(self.problems_summary)
+
+        self.problems_view = QTableView()
+        self.problems_view.setModel(self.problems_model)
+        self.problems_view.setSortingEnabled(True)
+        self.problems_view.sortByColumn(0, Qt.AscendingOrder)
+        self.problems_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.problems_view.setAlternatingRowColors(True)
+        self.problems_view.verticalHeader().setVisible(False)
+        self.problems_view.horizontalHeader().setStretchLastSection(True)
+        self.problems_view.doubleClicked.connect(self._open_problem)
+        layout.addWidget(self.problems_view, 1)
+
+        return tab
+
+    def _build_editor_tab(self, index: int):
+        """Build a deferred tab when it is first shown"""
+        page = self.editor_tabs.widget(index)
+        if not isinstance(page, LazyTabPage):
+            return
+        with profiling.phase(f"build {page.objectName()}"):
+            if page.build() and page is self.variables_page:
+                self._update_variables_list()
+            elif page is self.problems_page and self.linter.unchecked:
+                self.lint_slice_timer.start()
+
     def _create_preview_panel(self) -> QWidget:
         """Create the JSON preview panel"""
         panel = Card()
@@ -494,12 +717,17 @@ class MainWindow(QMainWindow):
         shortcuts = [
             ("Ctrl+N", self._create_schema),
             ("Ctrl+T", self._create_from_template),
+            ("Ctrl+P", self._open_fuzzy_finder),
             ("Ctrl+S", self._save_schema),
             ("Ctrl+O", self._import_json),
             ("Ctrl+E", self._export_json),
             ("Delete", self._delete_schema),
             ("F2", self._edit_variable),
+            ("Ctrl+Shift+F", self._find_usages),
+            ("Ctrl+Shift+R", self._rename_variable_everywhere),
             ("Ctrl+D", self._toggle_dark_mode),  # Added dark mode shortcut
+            ("Ctrl+Shift+T", self.trace_btn.toggle),
+            ("Ctrl+Shift+H", self.hud_btn.toggle),
         ]
 
         for key, func in shortcuts:
@@ -511,6 +739,58 @@ class MainWindow(QMainWindow):
         self.auto_save_timer.timeout.connect(self._auto_save)
         self.auto_save_timer.start(60000)  # Auto-save every minute
 
+    def _setup_linter(self):
+        """Setup the incremental workspace linter"""
+        self.linter = WorkspaceLinter(self.schema_manager)
+        self.problems_model = ProblemsModel(self)
+        self.lint_timer = QTimer(self)
+        self.lint_timer.setSingleShot(True)
+        self.lint_timer.setInterval(self.lint_debounce_ms)
+        self.lint_timer.timeout.connect(self._run_linter)
+        # Continues a run in the next event-loop turn once a slice is done
+        self.lint_slice_timer = QTimer(self)
+        self.lint_slice_timer.setSingleShot(True)
+        self.lint_slice_timer.setInterval(0)
+        self.lint_slice_timer.timeout.connect(self._run_linter)
+        self.schema_manager.subscribe(lambda events: self.lint_timer.start())
+
+    def _setup_watchdog(self):
+        """Watch the event loop for stalls caused by window handlers"""
+        self.stall_watchdog = StallWatchdog(self.stall_threshold_ms, self)
+        self.stall_watchdog.watch(MainWindow)
+        self.stall_watchdog.start()
+
+    def _run_linter(self):
+        """Recheck changed schemas and refresh the problems panel"""
+        # Schemas nobody edited (after an import or a snapshot restore) are
+        # only checked once the Problems tab is opened, so a lazily loaded
+        # snapshot is not decoded just to be linted
+        scan = self.problems_page.built
+        self.linter.run(self.lint_slice, unchecked=scan)
+        if self.linter.pending or (scan and self.linter.unchecked):
+            self.lint_slice_timer.start()
+            return
+        self.problems_model.set_issues(self.linter.issues())
+        total = sum(self.linter.counts().values())
+        if self.problems_page.built:
+            self.problems_summary.setText(self._problems_summary_text())
+        self.editor_tabs.setTabText(
+            self.problems_tab_index, f"Problems ({total})" if total else "Problems"
+        )
+
+    def _problems_summary_text(self) -> str:
+        """Error and warning totals for the problems tab"""
+        counts = self.linter.counts()
+        if not sum(counts.values()):
+            return "No problems"
+        return f"{counts['error']} errors, {counts['warning']} warnings"
+
+    def _open_problem(self, index):
+        """Jump to the schema an issue belongs to"""
+        issue = self.problems_model.data(index, Qt.UserRole)
+        if issue:
+            self._select_schema(issue.schema_name)
+
     def _mark_unsaved(self):
         """Mark that there are unsaved changes"""
         self.unsaved_changes = True
@@ -541,34 +821,135 @@ class MainWindow(QMainWindow):
         """Show status message"""
         self.status_bar.showMessage(message, 5000)
 
+    @tracing.traced(category="ui")
     def _update_schema_list(self):
         """Update the schema list widget"""
         self.schema_list.clear()
-        for name in sorted(self.schema_manager.schemas.keys()):
+        self._hidden_names.clear()
+        self._schema_names = sorted(self.schema_manager.schemas.keys())
+        for name in self._schema_names:
             self.schema_list.addItem(name)
+        if self._search_text:
+            self._filter_schemas(self._search_text)
+
+    def _insert_schema_item(self, name: str):
+        """Insert a schema name into the sorted list widget"""
+        row = bisect_left(self._schema_names, name)
+        self._schema_names.insert(row, name)
+        self.schema_list.insertItem(row, name)
+
+    def _remove_schema_item(self, name: str):
+        """Remove a schema name from the sorted list widget"""
+        row = bisect_left(self._schema_names, name)
+        if row < len(self._schema_names) and self._schema_names[row] == name:
+            del self._schema_names[row]
+            self._hidden_names.discard(name)
+            self.schema_list.takeItem(row)
+
+    def _variable_item_text(self, var_type: VariableType, var) -> str:
+        """Format a variable for the variables list"""
+        type_label = var_type.name.replace("_", " ").title()
+        return f"[{type_label}] {var.name}: {var.en_text} / {var.cn_text} (rows: {var.rows})"
+
+    def _variable_row(self, var_type: VariableType, index: int) -> int:
+        """Map a (type, index) pair to a row in the variables list"""
+        row = 0
+        for t in VariableType:
+            if t == var_type:
+                return row + index
+            row += self._variable_counts[t]
+        return row
+
+    def _variable_at_row(self, row: int) -> Optional[Tuple[VariableType, int]]:
+        """Map a row in the variables list back to a (type, index) pair"""
+        if row < 0:
+            return None
+        for var_type in VariableType:
+            count = self._variable_counts[var_type]
+            if row < count:
+                return var_type, row
+            row -= count
+        return None
 
     def _update_variables_list(self):
         """Update the variables list widget"""
+        # An unbuilt tab is filled in when it is first opened
+        if not self.variables_page.built:
+            return
         self.variables_list.clear()
+        self._variable_counts = {t: 0 for t in VariableType}
         if not self.current_schema:
             return
 
         for var_type in VariableType:
             var_list = getattr(self.current_schema, var_type.value, [])
+            self._variable_counts[var_type] = len(var_list)
             for var in var_list:
-                type_label = var_type.name.replace("_", " ").title()
-                item_text = f"[{type_label}] {var.name}: {var.en_text} / {var.cn_text} (rows: {var.rows})"
-                self.variables_list.addItem(item_text)
+                self.variables_list.addItem(self._variable_item_text(var_type, var))
 
+    @tracing.traced(category="ui")
     def _update_preview(self):
-        """Update the JSON preview"""
+        """Update the JSON preview of the selected schema"""
         try:
-            data = self.schema_manager.export_schemas()
-            json_str = json.dumps(data, indent=2, ensure_ascii=False)
-            self.preview_text.setText(json_str)
+            # Only the selected schema is shown, so an edit never re-renders the workspace
+            member = None
+            if self.current_schema is not None:
+                member = self.schema_manager.indented_member(self.current_schema.name)
+            self.preview_text.setPlainText("{\n" + member + "\n}" if member else "{}")
         except Exception as e:
             self.preview_text.setText(f"Error: {str(e)}")
 
+    @tracing.traced(category="ui")
+    def _on_schema_events(self, events: List[SchemaEvent]):
+        """Apply a coalesced batch of manager changes to the views"""
+        current = self.current_schema.name if self.current_schema is not None else None
+        preview_stale = False
+        for event in events:
+            self._workspace_dirty = True
+            if event.kind == ChangeKind.RESET:
+                self._update_schema_list()
+                self._update_variables_list()
+                preview_stale = True
+                continue
+
+            preview_stale = preview_stale or current in (event.schema_name, event.old_name)
+
+            if event.kind == ChangeKind.SCHEMA_ADDED:
+                self._insert_schema_item(event.schema_name)
+            elif event.kind == ChangeKind.SCHEMA_REMOVED:
+                self._remove_schema_item(event.schema_name)
+            elif event.kind == ChangeKind.SCHEMA_RENAMED:
+                self._remove_schema_item(event.old_name)
+                self._insert_schema_item(event.schema_name)
+            elif (
+                self.current_schema is not None
+                and event.schema_name == self.current_schema.name
+                and event.var_type is not None
+            ):
+                self._apply_variable_event(event)
+
+        if self._search_text:
+            self._filter_schemas(self._search_text)
+        if preview_stale:
+            self._update_preview()
+
+    def _apply_variable_event(self, event: SchemaEvent):
+        """Apply a single variable change to the variables list"""
+        if not self.variables_page.built:
+            return
+        row = self._variable_row(event.var_type, event.index)
+        if event.kind == ChangeKind.VARIABLE_INSERTED:
+            text = self._variable_item_text(event.var_type, event.variable)
+            self.variables_list.insertItem(row, text)
+            self._variable_counts[event.var_type] += 1
+        elif event.kind == ChangeKind.VARIABLE_UPDATED:
+            item = self.variables_list.item(row)
+            if item:
+                item.setText(self._variable_item_text(event.var_type, event.variable))
+        elif event.kind == ChangeKind.VARIABLE_REMOVED:
+            self.variables_list.takeItem(row)
+            self._variable_counts[event.var_type] -= 1
+
     def _clear_editor(self):
         """Clear the editor fields"""
         self.name_input.clear()
@@ -576,7 +957,10 @@ class MainWindow(QMainWindow):
         self.title_en_input.clear()
         self.match_img_combo.setCurrentText("no")
         self.filter_with_combo.setCurrentText("no")
-        self.variables_list.clear()
+        if self.variables_page.built:
+            self.variables_list.clear()
+        self._variable_counts = {t: 0 for t in VariableType}
+        self._update_preview()
 
     def _load_schema_to_editor(self, schema: Schema):
         """Load schema data into editor"""
@@ -586,6 +970,7 @@ class MainWindow(QMainWindow):
         self.match_img_combo.setCurrentText(schema.match_img)
         self.filter_with_combo.setCurrentText(schema.filter_with)
         self._update_variables_list()
+        self._update_preview()
         self._mark_saved()
 
     # Event handlers
@@ -606,14 +991,16 @@ class MainWindow(QMainWindow):
             schema = Schema(name=name)
             self.schema_manager.add_schema(schema)
             self.current_schema = schema
-            self._update_schema_list()
             self._load_schema_to_editor(schema)
-            self._update_preview()
             self._show_status(f"Created new schema: {name}")
 
-    def _create_from_template(self):
+    def _create_from_template(self, template_id: Optional[str] = None):
         """Create a new schema from template"""
+        from templates.preview_dialog import TemplatePreviewDialog
+
         dialog = TemplatePreviewDialog(self)
+        if template_id:
+            dialog.select_template(template_id)
 
         if dialog.exec_() == QDialog.Accepted:
             schema = dialog.get_schema_from_template()
@@ -630,9 +1017,7 @@ class MainWindow(QMainWindow):
                 # Add the schema
                 self.schema_manager.add_schema(schema)
                 self.current_schema = schema
-                self._update_schema_list()
                 self._load_schema_to_editor(schema)
-                self._update_preview()
                 self._show_status(f"Created schema from template: {schema.name}")
 
     def _load_schema(self, item):
@@ -657,6 +1042,93 @@ class MainWindow(QMainWindow):
             self._load_schema_to_editor(schema)
             self._show_status(f"Loaded schema: {schema_name}")
 
+    def _select_schema(self, name: str):
+        """Select and load a schema by name"""
+        row = bisect_left(self._schema_names, name)
+        if row < len(self._schema_names) and self._schema_names[row] == name:
+            item = self.schema_list.item(row)
+            self.schema_list.setCurrentItem(item)
+            self._load_schema(item)
+
+    def _current_variable_item(self) -> Optional[QListWidgetItem]:
+        """Highlighted row of the variables list; None until the tab is built"""
+        return self.variables_list.currentItem() if self.variables_page.built else None
+
+    def _selected_variable_name(self) -> str:
+        """Name of the highlighted variable, if any"""
+        current = self._current_variable_item()
+        location = self._variable_at_row(self.variables_list.row(current)) if current else None
+        if not location or not self.current_schema:
+            return ""
+        var_type, index = location
+        return getattr(self.current_schema, var_type.value)[index].name
+
+    def _open_fuzzy_finder(self):
+        """Jump to a schema or template by fuzzy name"""
+        from templates.registry import template_registry
+
+        dialog = FuzzyFinderDialog(
+            self.schema_manager, template_registry.list_templates(), self
+        )
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        if dialog.selected_schema:
+            self._select_schema(dialog.selected_schema)
+        elif dialog.selected_template:
+            self._create_from_template(dialog.selected_template)
+
+    def _find_usages(self):
+        """Show every schema that uses a variable name"""
+        dialog = UsagesDialog(self.schema_manager, self._selected_variable_name(), self)
+        if dialog.exec_() == QDialog.Accepted and dialog.selected_schema:
+            self._select_schema(dialog.selected_schema)
+
+    def _rename_variable_everywhere(self):
+        """Rename a variable in every schema that uses it"""
+        old_name = self._selected_variable_name()
+        if not old_name:
+            old_name, ok = QInputDialog.getText(
+                self, "Rename Variable", "Variable name to rename:"
+            )
+            old_name = old_name.strip()
+            if not ok or not old_name:
+                return
+
+        occurrences = self.schema_manager.plan_variable_rename(old_name)
+        if not occurrences:
+            self._show_status(f"No usages of '{old_name}'", "warning")
+            return
+
+        new_name, ok = QInputDialog.getText(
+            self, "Rename Variable", f"Rename '{old_name}' to:", text=old_name
+        )
+        new_name = new_name.strip()
+        if not ok or not new_name or new_name == old_name:
+            return
+
+        schema_count = len({schema_name for schema_name, _, _ in occurrences})
+        message = (
+            f"Rename '{old_name}' → '{new_name}' in {len(occurrences)} variables "
+            f"across {schema_count} schemas?"
+        )
+        conflicts = self.schema_manager.variable_index.schemas_using(new_name)
+        conflicts &= {schema_name for schema_name, _, _ in occurrences}
+        if conflicts:
+            message += f"\n\n{len(conflicts)} of these schemas already define '{new_name}'."
+
+        reply = QMessageBox.question(
+            self, "Rename Variable", message, QMessageBox.Yes | QMessageBox.No
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        start = time.perf_counter()
+        count = self.schema_manager.rename_variable(old_name, new_name)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self._show_status(
+            f"Renamed {count} occurrences of '{old_name}' → '{new_name}' in {elapsed_ms:.0f} ms"
+        )
+
     def _save_schema(self):
         """Save current schema"""
         if not self.current_schema:
@@ -668,23 +1140,24 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "Schema name is required")
             return
 
-        # Update schema data
+        # Edit a copy so a rejected update leaves the stored schema untouched
         old_name = self.current_schema.name
-        self.current_schema.name = name
-        self.current_schema.page_title_cn = self.title_cn_input.text()
-        self.current_schema.page_title_en = self.title_en_input.text()
-        self.current_schema.match_img = self.match_img_combo.currentText()
-        self.current_schema.filter_with = self.filter_with_combo.currentText()
+        schema = replace(
+            self.current_schema,
+            name=name,
+            page_title_cn=self.title_cn_input.text(),
+            page_title_en=self.title_en_input.text(),
+            match_img=self.match_img_combo.currentText(),
+            filter_with=self.filter_with_combo.currentText(),
+        )
 
         # Update in manager
-        if self.schema_manager.update_schema(old_name, self.current_schema):
-            self._update_schema_list()
-            self._update_preview()
+        if self.schema_manager.update_schema(old_name, schema):
+            self.current_schema = schema
             self._mark_saved()
             self._show_status(f"Saved schema: {name}")
         else:
             QMessageBox.warning(self, "Error", "Schema name already exists")
-            self.current_schema.name = old_name
 
     def _delete_schema(self):
         """Delete selected schema"""
@@ -702,8 +1175,6 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.Yes:
             if self.schema_manager.delete_schema(schema_name):
-                self._update_schema_list()
-                self._update_preview()
                 if self.current_schema and self.current_schema.name == schema_name:
                     self.current_schema = None
                     self._clear_editor()
@@ -722,8 +1193,6 @@ class MainWindow(QMainWindow):
 
         if ok and new_name:
             if self.schema_manager.duplicate_schema(original_name, new_name):
-                self._update_schema_list()
-                self._update_preview()
                 self._show_status(f"Duplicated: {original_name} → {new_name}")
             else:
                 QMessageBox.warning(self, "Error", "Failed to duplicate schema")
@@ -740,78 +1209,103 @@ class MainWindow(QMainWindow):
         if dialog.exec_() == QDialog.Accepted:
             variable = dialog.get_variable()
             if variable:
-                # Map display type to variable type
-                type_map = {
-                    "Basic Variable": VariableType.BASIC,
-                    "More Variable": VariableType.MORE,
-                    "Image Variable": VariableType.IMAGE,
-                    "URL Variable": VariableType.URL,
-                    "Array Variable": VariableType.ARRAY,
-                    "Language Item Variable": VariableType.LANGUAGE,
-                }
-
-                var_type_enum = type_map.get(var_type)
-                if var_type_enum:
-                    var_list = getattr(self.current_schema, var_type_enum.value)
-                    var_list.append(variable)
-                    self._update_variables_list()
-                    self._update_preview()
+                var_type_enum = VARIABLE_TYPE_LABELS.get(var_type)
+                if var_type_enum and self.schema_manager.add_variable(
+                    self.current_schema.name, var_type_enum, variable
+                ):
                     self._mark_unsaved()
                     self._show_status(f"Added variable: {variable.name}")
 
+    def _parse_variable_type(self, text: str) -> Optional[VariableType]:
+        """Resolve a CSV type column (label, enum name or key) to a variable type"""
+        text = text.strip()
+        if text in VARIABLE_TYPE_LABELS:
+            return VARIABLE_TYPE_LABELS[text]
+        for var_type in VariableType:
+            if text.lower() in (var_type.name.lower(), var_type.value):
+                return var_type
+        return None
+
+    def _import_variables_csv(self):
+        """Add variables from a spreadsheet export in one batch"""
+        if not self.current_schema:
+            QMessageBox.warning(self, "Error", "No schema selected")
+            return
+
+        file_name, _ = QFileDialog.getOpenFileName(
+            self, "Import Variables", "", "CSV Files (*.csv);;All Files (*)"
+        )
+        if not file_name:
+            return
+
+        try:
+            with open(file_name, "r", encoding="utf-8-sig", newline="") as f:
+                rows = [row for row in csv.reader(f) if row]
+            if rows and rows[0][0].strip().lower() == "type":
+                rows = rows[1:]
+
+            schema_name = self.current_schema.name
+            with self.schema_manager.batch() as batch:
+                for line_no, row in enumerate(rows, 1):
+                    row = row + [""] * (5 - len(row))
+                    var_type = self._parse_variable_type(row[0])
+                    if var_type is None:
+                        raise BatchError([f"row {line_no}: unknown type '{row[0]}'"])
+                    batch.add_variable(
+                        schema_name,
+                        var_type,
+                        Variable(
+                            name=row[1].strip(),
+                            en_text=row[2].strip(),
+                            cn_text=row[3].strip(),
+                            rows=int(row[4]) if row[4].strip() else 0,
+                        ),
+                    )
+
+            self._mark_unsaved()
+            self._show_status(f"Imported {len(rows)} variables")
+
+        except Exception as e:
+            QMessageBox.critical(self, "Import Error", str(e))
+            logger.error(f"Variable import error: {e}")
+
     def _edit_variable(self):
         """Edit selected variable"""
-        current = self.variables_list.currentItem()
+        current = self._current_variable_item()
         if not current or not self.current_schema:
             return
 
-        # Parse variable info from item text
+        # Parse variable type label from item text
         match = re.match(r"\[([^\]]+)\] ([^:]+):", current.text())
-        if not match:
+        location = self._variable_at_row(self.variables_list.row(current))
+        if not match or not location:
             return
 
         var_type_str = match.group(1)
-        var_name = match.group(2)
+        var_type, index = location
+        variable = getattr(self.current_schema, var_type.value)[index]
 
-        # Find the variable
-        variable = None
-        var_list = None
-
-        for var_type in VariableType:
-            vlist = getattr(self.current_schema, var_type.value)
-            for var in vlist:
-                if var.name == var_name:
-                    variable = var
-                    var_list = vlist
-                    break
-            if variable:
-                break
-
-        if variable:
-            dialog = VariableDialog(var_type_str, variable, parent=self)
-            if dialog.exec_() == QDialog.Accepted:
-                new_var = dialog.get_variable()
-                if new_var:
-                    # Update the variable
-                    idx = var_list.index(variable)
-                    var_list[idx] = new_var
-                    self._update_variables_list()
-                    self._update_preview()
-                    self._mark_unsaved()
-                    self._show_status(f"Updated variable: {new_var.name}")
+        dialog = VariableDialog(var_type_str, variable, parent=self)
+        if dialog.exec_() == QDialog.Accepted:
+            new_var = dialog.get_variable()
+            if new_var and self.schema_manager.update_variable(
+                self.current_schema.name, var_type, index, new_var
+            ):
+                self._mark_unsaved()
+                self._show_status(f"Updated variable: {new_var.name}")
 
     def _delete_variable(self):
         """Delete selected variable"""
-        current = self.variables_list.currentItem()
+        current = self._current_variable_item()
         if not current or not self.current_schema:
             return
 
-        # Parse variable info
-        match = re.match(r"\[([^\]]+)\] ([^:]+):", current.text())
-        if not match:
+        location = self._variable_at_row(self.variables_list.row(current))
+        if not location:
             return
 
-        var_name = match.group(2)
+        var_type, index = location
+        var_name = getattr(self.current_schema, var_type.value)[index].name
 
         reply = QMessageBox.question(
             self,
@@ -821,35 +1315,30 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            # Find and remove the variable
-            for var_type in VariableType:
-                var_list = getattr(self.current_schema, var_type.value)
-                for var in var_list[:]:
-                    if var.name == var_name:
-                        var_list.remove(var)
-                        self._update_variables_list()
-                        self._update_preview()
-                        self._mark_unsaved()
-                        self._show_status(f"Deleted variable: {var_name}")
-                        return
+            if self.schema_manager.remove_variable(
+                self.current_schema.name, var_type, index
+            ):
+                self._mark_unsaved()
+                self._show_status(f"Deleted variable: {var_name}")
 
     def _import_json(self):
         """Import schemas from JSON file"""
         file_name, _ = QFileDialog.getOpenFileName(
-            self, "Import JSON", "", "JSON Files (*.json);;All Files (*)"
+            self,
+            "Import JSON",
+            "",
+            "Workspace Files (*.json *.ndjson *.jsonl *.gz *.xz *.bz2);;All Files (*)",
         )
 
         if file_name:
             try:
-                with open(file_name, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                # Compressed files and NDJSON are detected and streamed
+                with tracing.span("MainWindow.import", "io", path=file_name):
+                    count = self.schema_manager.import_schemas(iter_workspace(file_name))
 
-                self.schema_manager.import_schemas(data)
-                self._update_schema_list()
-                self._update_preview()
-                self._clear_editor()
                 self.current_schema = None
-                self._show_status(f"Imported {len(data)} schemas")
+                self._clear_editor()
+                self._show_status(f"Imported {count} schemas")
 
             except Exception as e:
                 QMessageBox.critical(self, "Import Error", str(e))
@@ -861,22 +1350,90 @@ class MainWindow(QMainWindow):
         timestamp = datetime.now().strftime("%H_%M_%m_%d_%Y")
         default_filename = f"schemas_{timestamp}.json"
 
-        file_name, _ = QFileDialog.getSaveFileName(
-            self, "Export JSON", default_filename, "JSON Files (*.json);;All Files (*)"
-        )
+        file_name = self._ask_export_path("Export JSON", default_filename)
 
         if file_name:
             try:
-                data = self.schema_manager.export_schemas()
-                with open(file_name, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                if not self._write_export(file_name):
+                    self._show_status("Export cancelled", "warning")
+                    return
 
-                self._show_status(f"Exported {len(data)} schemas")
+                # Record what was published so the next export can be a delta
+                self._last_export_dir = os.path.dirname(os.path.abspath(file_name))
+                manifest_path = os.path.join(self._last_export_dir, MANIFEST_FILENAME)
+                DeltaExporter(self.schema_manager, manifest_path).record_full_export()
+
+                self._show_status(f"Exported {len(self.schema_manager.schemas)} schemas")
 
             except Exception as e:
                 QMessageBox.critical(self, "Export Error", str(e))
                 logger.error(f"Export error: {e}")
 
+    def _ask_export_path(self, title: str, default_filename: str) -> str:
+        """Ask where to export; the chosen filter supplies a missing extension"""
+        file_name, selected_filter = QFileDialog.getSaveFileName(
+            self, title, default_filename, ";;".join(EXPORT_FILTERS)
+        )
+        if file_name and not os.path.splitext(file_name)[1]:
+            file_name += EXPORT_FILTERS.get(selected_filter, "")
+        return file_name
+
+    def _write_export(self, file_name: str, names: Optional[List[str]] = None) -> bool:
+        """Stream an export to disk behind a cancellable progress dialog"""
+        progress = QProgressDialog("Exporting schemas...", "Cancel", 0, 100, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        def report(done: int, total: int) -> bool:
+            progress.setMaximum(max(total, 1))
+            progress.setValue(done)
+            QApplication.processEvents()
+            return not progress.wasCanceled()
+
+        try:
+            return write_export(self.schema_manager, file_name, names, progress=report)
+        finally:
+            progress.reset()
+
+    def _export_changes(self):
+        """Export only what changed since the manifest in an export folder"""
+        directory = QFileDialog.getExistingDirectory(
+            self, "Export Changes (folder of the last full export)", self._last_export_dir
+        )
+        if not directory:
+            return
+
+        exporter = DeltaExporter(self.schema_manager, os.path.join(directory, MANIFEST_FILENAME))
+        try:
+            delta = exporter.pending()
+            if not delta:
+                QMessageBox.information(
+                    self, "Export Changes", "Nothing changed since the last export"
+                )
+                return
+
+            formats = ["JSON Patch", "Per-schema files"]
+            choice, ok = QInputDialog.getItem(
+                self, "Export Changes", f"{delta}. Format:", formats, 0, False
+            )
+            if not ok:
+                return
+
+            timestamp = datetime.now().strftime("%H_%M_%m_%d_%Y")
+            if choice == formats[0]:
+                target = os.path.join(directory, f"schemas_delta_{timestamp}.json")
+                delta = exporter.export_patch(target)
+            else:
+                target = os.path.join(directory, f"schemas_delta_{timestamp}")
+                delta = exporter.export_files(target)
+
+            self._last_export_dir = directory
+            self._show_status(f"Exported changes ({delta}) to {os.path.basename(target)}")
+
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", str(e))
+            logger.error(f"Delta export error: {e}")
+
     def _export_selected(self):
         """Export selected schema"""
         current = self.schema_list.currentItem()
@@ -893,34 +1450,120 @@ class MainWindow(QMainWindow):
         timestamp = datetime.now().strftime("%H_%M_%m_%d_%Y")
         default_filename = f"{schema_name}_{timestamp}.json"
 
-        file_name, _ = QFileDialog.getSaveFileName(
-            self,
-            "Export Schema",
-            default_filename,
-            "JSON Files (*.json);;All Files (*)",
-        )
+        file_name = self._ask_export_path("Export Schema", default_filename)
 
         if file_name:
             try:
-                data = {schema_name: schema.to_dict()}
-                with open(file_name, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-
+                write_export(self.schema_manager, file_name, [schema_name])
                 self._show_status(f"Exported schema: {schema_name}")
 
             except Exception as e:
                 QMessageBox.critical(self, "Export Error", str(e))
                 logger.error(f"Export error: {e}")
 
+    def _validate_records(self):
+        """Validate a content record file against the selected schema"""
+        if not self.current_schema:
+            QMessageBox.warning(self, "Error", "No schema selected")
+            return
+
+        file_name, _ = QFileDialog.getOpenFileName(
+            self,
+            "Validate Records",
+            "",
+            "NDJSON Files (*.ndjson *.jsonl);;All Files (*)",
+        )
+        if not file_name:
+            return
+
+        dialog = RecordValidationDialog(self.current_schema, file_name, self)
+        dialog.exec_()
+
+    def _generate_sample_data(self):
+        """Write generated records for the selected schema to an NDJSON file"""
+        if not self.current_schema:
+            QMessageBox.warning(self, "Error", "No schema selected")
+            return
+
+        count, ok = QInputDialog.getInt(
+            self, "Generate Sample Data", "Number of records:", 10000, 1, 100_000_000
+        )
+        if not ok:
+            return
+
+        file_name, _ = QFileDialog.getSaveFileName(
+            self,
+            "Generate Sample Data",
+            f"{self.current_schema.name}.ndjson",
+            "NDJSON Files (*.ndjson *.jsonl);;All Files (*)",
+        )
+        if not file_name:
+            return
+
+        from .generator import RecordGenerator
+
+        generator = RecordGenerator(self.current_schema)
+        progress = QProgressDialog("Generating records...", "Cancel", 0, count, self)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(300)
+
+        thread = SampleDataThread(generator, file_name, count, self)
+        thread.progress_changed.connect(progress.setValue)
+        progress.canceled.connect(thread.requestInterruption)
+        thread.finished.connect(progress.reset)
+
+        loop = QEventLoop()
+        thread.finished.connect(loop.quit)
+        thread.start()
+        loop.exec_()
+
+        if thread.failure:
+            QMessageBox.critical(self, "Generation Error", thread.failure)
+            logger.error(f"Sample data error: {thread.failure}")
+        elif thread.isInterruptionRequested():
+            self._show_status("Sample data generation cancelled", "warning")
+        else:
+            stats = generator.stats
+            self._show_status(
+                f"Wrote {stats.records:,} records to {os.path.basename(file_name)} "
+                f"(seed {generator.seed})"
+            )
+
+    def _toggle_mock_server(self, checked: bool):
+        """Start or stop the local mock content API"""
+        if not checked:
+            if self.mock_server is not None:
+                self.mock_server.stop()
+                self.mock_server = None
+            self.mock_server_btn.setText("START MOCK API")
+            self._show_status("Mock API stopped")
+            return
+
+        from .mock_server import MockContentServer
+
+        try:
+            self.mock_server = MockContentServer(self.schema_manager)
+            url = self.mock_server.start_in_thread()
+        except OSError as e:
+            self.mock_server = None
+            self.mock_server_btn.blockSignals(True)
+            self.mock_server_btn.setChecked(False)
+            self.mock_server_btn.blockSignals(False)
+            QMessageBox.critical(self, "Mock API Error", str(e))
+            logger.error(f"Mock server error: {e}")
+            return
+
+        self.mock_server_btn.setText("STOP MOCK API")
+        self._show_status(f"Mock API serving at {url}/schemas")
+
     def _format_json(self):
         """Format the JSON preview"""
         try:
             text = self.preview_text.toPlainText()
             if text:
+                # Keys keep the canonical schema order used by every export
                 data = json.loads(text)
-                formatted = json.dumps(
-                    data, indent=2, ensure_ascii=False, sort_keys=True
-                )
+                formatted = json.dumps(data, indent=2, ensure_ascii=False)
                 self.preview_text.setText(formatted)
                 self._show_status("JSON formatted")
         except Exception as e:
@@ -934,9 +1577,25 @@ class MainWindow(QMainWindow):
 
     def _filter_schemas(self, text: str):
         """Filter schema list based on search text"""
-        for i in range(self.schema_list.count()):
-            item = self.schema_list.item(i)
-            item.setHidden(text.lower() not in item.text().lower())
+        self._search_text = text.strip()
+        try:
+            ranked = self.schema_manager.query(self._search_text) if self._search_text else []
+        except QuerySyntaxError as e:
+            self._show_status(f"Query error: {e}", "error")
+            return
+        self._search_results = ranked
+        hidden = set(self._schema_names).difference(ranked) if self._search_text else set()
+
+        # Only touch items whose visibility actually changes
+        for name in hidden.symmetric_difference(self._hidden_names):
+            row = bisect_left(self._schema_names, name)
+            self.schema_list.item(row).setHidden(name in hidden)
+        self._hidden_names = hidden
+
+        # Bring the best match into view
+        if ranked:
+            row = bisect_left(self._schema_names, ranked[0])
+            self.schema_list.scrollToItem(self.schema_list.item(row))
 
     def _show_schema_menu(self, position):
         """Show context menu for schema list"""
@@ -950,8 +1609,92 @@ class MainWindow(QMainWindow):
         menu.addSeparator()
         menu.addAction("Export", self._export_selected)
 
+        if self._search_text and self._search_results:
+            count = len(self._search_results)
+            menu.addSeparator()
+            menu.addAction(f"Export {count} Matching...", self._export_matching)
+            menu.addAction(f"Edit {count} Matching...", self._edit_matching)
+            menu.addAction(f"Delete {count} Matching", self._delete_matching)
+
         menu.exec_(self.schema_list.mapToGlobal(position))
 
+    def _export_matching(self):
+        """Export every schema matching the current query"""
+        names = list(self._search_results)
+        timestamp = datetime.now().strftime("%H_%M_%m_%d_%Y")
+        file_name = self._ask_export_path("Export Matching", f"schemas_query_{timestamp}.json")
+
+        if file_name:
+            try:
+                if not self._write_export(file_name, names):
+                    self._show_status("Export cancelled", "warning")
+                    return
+
+                self._show_status(f"Exported {len(names)} schemas")
+
+            except Exception as e:
+                QMessageBox.critical(self, "Export Error", str(e))
+                logger.error(f"Export error: {e}")
+
+    def _edit_matching(self):
+        """Set a page option on every schema matching the current query"""
+        names = list(self._search_results)
+        choices = [
+            "filter_with = yes",
+            "filter_with = no",
+            "match_img = yes",
+            "match_img = no",
+        ]
+        choice, ok = QInputDialog.getItem(
+            self, "Edit Matching", f"Apply to {len(names)} schemas:", choices, 0, False
+        )
+        if not ok:
+            return
+
+        attribute, _, value = choice.partition(" = ")
+        try:
+            with self.schema_manager.batch() as batch:
+                # The dialog ran the event loop, so matches may have gone since
+                names = [name for name in names if name in self.schema_manager.schemas]
+                for name in names:
+                    schema = self.schema_manager.get_schema(name)
+                    batch.update_schema(name, replace(schema, **{attribute: value}))
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return
+
+        # The edited schemas are new objects; keep the editor on the live one
+        if self.current_schema and self.current_schema.name in names:
+            self.current_schema = self.schema_manager.get_schema(self.current_schema.name)
+            self._load_schema_to_editor(self.current_schema)
+        self._show_status(f"Set {attribute} = {value} on {len(names)} schemas")
+
+    def _delete_matching(self):
+        """Delete every schema matching the current query"""
+        names = list(self._search_results)
+        reply = QMessageBox.question(
+            self,
+            "Delete Schemas",
+            f"Delete {len(names)} schemas matching '{self._search_text}'?",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if reply != QMessageBox.Yes:
+            return
+
+        try:
+            with self.schema_manager.batch() as batch:
+                names = [name for name in names if name in self.schema_manager.schemas]
+                for name in names:
+                    batch.delete_schema(name)
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", str(e))
+            return
+
+        if self.current_schema and self.current_schema.name in names:
+            self.current_schema = None
+            self._clear_editor()
+        self._show_status(f"Deleted {len(names)} schemas")
+
     def _show_variable_menu(self, position):
         """Show context menu for variable list"""
         item = self.variables_list.itemAt(position)
@@ -961,35 +1704,85 @@ class MainWindow(QMainWindow):
         menu = QMenu(self)
         menu.addAction("Edit", self._edit_variable)
         menu.addAction("Delete", self._delete_variable)
+        menu.addSeparator()
+        menu.addAction("Find Usages", self._find_usages)
+        menu.addAction("Rename Across Workspace...", self._rename_variable_everywhere)
 
         menu.exec_(self.variables_list.mapToGlobal(position))
 
+    @property
+    def snapshot_path(self) -> str:
+        return os.path.join(self.backup_dir, self.snapshot_filename)
+
+    def _restore_snapshot(self):
+        """Reopen the workspace saved by the last session"""
+        if not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with profiling.phase("restore snapshot"):
+                count = self.schema_manager.load_snapshot(self.snapshot_path)
+                self.schema_manager.flush_events()
+            self._workspace_dirty = False
+            self._show_status(f"Restored {count} schemas from the last session")
+        except Exception as e:
+            logger.error(f"Snapshot restore error: {e}")
+            self._show_status(f"Could not restore the last session: {e}", "error")
+
+    def _save_snapshot(self):
+        """Write the workspace snapshot reopened at the next startup"""
+        try:
+            os.makedirs(self.backup_dir, exist_ok=True)
+            self.schema_manager.save_snapshot(self.snapshot_path)
+        except Exception as e:
+            # A stale snapshot would reopen outdated data
+            logger.error(f"Snapshot save error: {e}")
+            try:
+                if os.path.exists(self.snapshot_path):
+                    os.remove(self.snapshot_path)
+            except OSError as e:
+                logger.error(f"Could not remove stale snapshot: {e}")
+
+    @tracing.traced(category="io")
     def _auto_save(self):
         """Auto-save current work"""
         if self.unsaved_changes and self.current_schema:
             self._save_schema()
 
-        # Create backup
-        if self.schema_manager.schemas:
+        if self._workspace_dirty:
+            self._save_snapshot()
+
+        # Create backup only when the workspace changed since the last one
+        if self.schema_manager.schemas and self._workspace_dirty:
             try:
-                backup_dir = "backups"
+                backup_dir = self.backup_dir
                 os.makedirs(backup_dir, exist_ok=True)
 
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_file = os.path.join(backup_dir, f"backup_{timestamp}.json")
-
-                data = self.schema_manager.export_schemas()
-                with open(backup_file, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
+                extension = BACKUP_EXTENSIONS.get(self.backup_compression, "")
+                backup_file = os.path.join(backup_dir, f"backup_{timestamp}.json{extension}")
+
+                write_export(
+                    self.schema_manager,
+                    backup_file,
+                    compression=self.backup_compression,
+                    level=self.backup_compression_level,
+                )
 
-                # Keep only last 10 backups
+                # Keep only last 10 backups, whatever they were compressed with
                 backups = sorted(
-                    [f for f in os.listdir(backup_dir) if f.endswith(".json")]
+                    [
+                        f
+                        for f in os.listdir(backup_dir)
+                        if f.startswith("backup_")
+                        and f.endswith((".json", ".json.gz", ".json.xz", ".json.bz2"))
+                    ]
                 )
                 if len(backups) > 10:
                     for old_backup in backups[:-10]:
                         os.remove(os.path.join(backup_dir, old_backup))
 
+                self._workspace_dirty = False
+
             except Exception as e:
                 logger.error(f"Auto-save error: {e}")
 
@@ -1012,3 +1805,14 @@ class MainWindow(QMainWindow):
                 event.ignore()
         else:
             event.accept()
+
+        if event.isAccepted():
+            if self.mock_server is not None:
+                self.mock_server.stop()
+            self.stall_watchdog.stop()
+            if self.hud is not None:
+                tracing.remove_observer(self.hud.history)
+            # Deliver queued changes so the dirty flag reflects a final save
+            self.schema_manager.flush_events()
+            if self._workspace_dirty:
+                self._save_snapshot()
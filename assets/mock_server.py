@@ -0,0 +1,380 @@
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+from .events import ChangeKind, SchemaEvent
+from .generator import RecordGenerator
+from .models import Schema
+from .fileio import iter_workspace
+
+logger = logging.getLogger(__name__)
+
+Response = Tuple[int, Dict[str, str], bytes]
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+class RequestError(Exception):
+    """Turns into an error response with the given status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class MockContentServer:
+    """Loopback HTTP server exposing the workspace as a content API
+
+    GET /schemas?page=&per_page=         paginated schema names
+    GET /schemas/<name>                  one schema, as exported
+    GET /records/<name>?page=&per_page=  generated sample records
+
+    Responses carry an ETag and honour If-None-Match, and bodies are gzipped
+    when the client accepts it. The server thread never reads the manager:
+    it serves copies of the schemas published from the manager's thread,
+    refreshed as change events arrive. Each record is generated from its own
+    seed, so any page costs the same.
+    """
+
+    page_size = 50
+    max_page_size = 1000
+    records_per_schema = 10000
+    gzip_min_bytes = 1024
+    gzip_level = 5
+    gzip_cache_size = 512
+    max_header_lines = 100
+
+    def __init__(self, schema_manager, host: str = "127.0.0.1", port: int = 8765, seed: int = 0):
+        self.schema_manager = schema_manager
+        self.host = host
+        self.port = port
+        self.seed = seed
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        # (version, copies) is replaced as a whole, never edited in place
+        self._published: Tuple[int, Dict[str, Schema]] = (0, {})
+        self._names: Tuple[int, List[str]] = (-1, [])
+        self._generators: Dict[str, Tuple[str, RecordGenerator]] = {}
+        self._gzipped: "OrderedDict[str, bytes]" = OrderedDict()
+        self.publish()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def publish(self, names: Optional[Iterable[str]] = None):
+        """Copy schemas from the manager for the server thread to serve
+
+        Call on the thread that edits the manager. Without names the whole
+        workspace is copied; otherwise only those schemas are refreshed.
+        """
+        version, published = self._published
+        published = {} if names is None else dict(published)
+        for name in self.schema_manager.schemas if names is None else names:
+            schema = self.schema_manager.get_schema(name)
+            if schema is None:
+                published.pop(name, None)
+            else:
+                published[name] = schema.copy()
+        self._published = (version + 1, published)
+
+    def _on_schema_events(self, events: List[SchemaEvent]):
+        """Republish the schemas a batch of manager changes touched"""
+        if any(event.kind == ChangeKind.RESET for event in events):
+            self.publish()
+        else:
+            self.publish({name for e in events for name in (e.schema_name, e.old_name) if name})
+
+    # Lifecycle
+    async def start(self):
+        """Start listening; port 0 picks a free port"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Mock content server listening on {self.url}")
+
+    async def shutdown(self):
+        """Stop listening and drop open keep-alive connections"""
+        self._server.close()
+        # Closing the transport ends each handler's pending read cleanly
+        for writer in list(self._connections.values()):
+            writer.close()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+
+    async def serve_forever(self):
+        """Start and serve until cancelled"""
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start_in_thread(self) -> str:
+        """Run the server on its own event loop thread; returns the base URL"""
+        ready = threading.Event()
+        failure: List[BaseException] = []
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._loop.run_until_complete(self.start())
+            except BaseException as e:
+                failure.append(e)
+                ready.set()
+                self._loop.close()
+                return
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.shutdown())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="mock-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if failure:
+            self._thread = None
+            raise failure[0]
+        self.schema_manager.subscribe(self._on_schema_events)
+        return self.url
+
+    def stop(self):
+        """Stop a server started with start_in_thread"""
+        if self._thread is None:
+            return
+        self.schema_manager.unsubscribe(self._on_schema_events)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+        logger.info("Mock content server stopped")
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    # HTTP
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one keep-alive connection"""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                parts = request_line.decode("latin-1").split()
+                headers: Dict[str, str] = {}
+                for _ in range(self.max_header_lines):
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+                if "content-length" in headers:
+                    await reader.readexactly(int(headers["content-length"]))
+
+                if len(parts) != 3:
+                    status, response_headers, body = self._error(400, "Malformed request line")
+                    method, version = "GET", "HTTP/1.0"
+                else:
+                    method, target, version = parts
+                    status, response_headers, body = self._respond(method, target, headers)
+
+                keep_alive = (
+                    version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                )
+                response_headers["Content-Length"] = str(len(body))
+                response_headers["Connection"] = "keep-alive" if keep_alive else "close"
+                head = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+                head.extend(f"{key}: {value}" for key, value in response_headers.items())
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+                if method != "HEAD" and status != 304:
+                    writer.write(body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    def _respond(self, method: str, target: str, headers: Dict[str, str]) -> Response:
+        """Route a request and apply conditional GET and compression"""
+        if method not in ("GET", "HEAD"):
+            status, response_headers, body = self._error(405, f"{method} is not supported")
+            response_headers["Allow"] = "GET, HEAD"
+            return status, response_headers, body
+
+        try:
+            body, etag = self._route(target)
+        except RequestError as e:
+            return self._error(e.status, str(e))
+        except Exception as e:
+            logger.error(f"Mock server error for {target}: {e}")
+            return self._error(500, str(e))
+
+        response_headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "ETag": etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+            "Access-Control-Allow-Origin": "*",
+        }
+        if etag in (tag.strip() for tag in headers.get("if-none-match", "").split(",")):
+            return 304, response_headers, b""
+
+        accepts_gzip = "gzip" in headers.get("accept-encoding", "")
+        if accepts_gzip and len(body) >= self.gzip_min_bytes:
+            body = self._gzip(etag, body)
+            response_headers["Content-Encoding"] = "gzip"
+        return 200, response_headers, body
+
+    def _error(self, status: int, message: str) -> Response:
+        body = json.dumps({"error": message}).encode("utf-8")
+        return status, {"Content-Type": "application/json; charset=utf-8"}, body
+
+    def _gzip(self, etag: str, body: bytes) -> bytes:
+        """Compress a body, reusing earlier work for the same ETag"""
+        compressed = self._gzipped.get(etag)
+        if compressed is None:
+            compressed = gzip.compress(body, self.gzip_level)
+            self._gzipped[etag] = compressed
+            if len(self._gzipped) > self.gzip_cache_size:
+                self._gzipped.popitem(last=False)
+        else:
+            self._gzipped.move_to_end(etag)
+        return compressed
+
+    # Endpoints
+    def _route(self, target: str) -> Tuple[bytes, str]:
+        """Resolve a request target to a body and ETag"""
+        url = urlsplit(target)
+        segments = [unquote(segment) for segment in url.path.strip("/").split("/")]
+        query = parse_qs(url.query)
+
+        if segments == ["schemas"]:
+            return self._schema_list(query)
+        if len(segments) == 2 and segments[0] == "schemas":
+            body, digest = self._schema(segments[1]).canonical()
+            return body, f'"{digest[:20]}"'
+        if len(segments) == 2 and segments[0] == "records":
+            return self._records(segments[1], query)
+        raise RequestError(404, f"No endpoint at {url.path}")
+
+    def _schema(self, name: str) -> Schema:
+        """Published copy of a schema"""
+        schema = self._published[1].get(name)
+        if schema is None:
+            raise RequestError(404, f"Schema '{name}' not found")
+        return schema
+
+    def _page(self, query: Dict[str, List[str]]) -> Tuple[int, int]:
+        """Parse 1-based page and per_page query parameters"""
+        try:
+            page = int(query.get("page", ["1"])[0])
+            per_page = int(query.get("per_page", [str(self.page_size)])[0])
+        except ValueError:
+            raise RequestError(400, "page and per_page must be integers")
+        if page < 1 or not 1 <= per_page <= self.max_page_size:
+            raise RequestError(400, f"page must be >= 1 and per_page 1-{self.max_page_size}")
+        return page, per_page
+
+    def _page_body(self, path: str, page: int, per_page: int, total: int, items) -> bytes:
+        """Standard pagination envelope"""
+        last_page = max((total + per_page - 1) // per_page, 1)
+        document = {
+            "page": page,
+            "per_page": per_page,
+            "total": total,
+            "next": f"{path}?page={page + 1}&per_page={per_page}" if page < last_page else None,
+            "items": items,
+        }
+        return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _schema_list(self, query: Dict[str, List[str]]) -> Tuple[bytes, str]:
+        """Sorted schema names, re-sorted only when the workspace changed"""
+        page, per_page = self._page(query)
+        version, published = self._published
+        if self._names[0] != version:
+            self._names = (version, sorted(published))
+        names = self._names[1]
+        start = (page - 1) * per_page
+        items = [
+            {"name": name, "href": f"/schemas/{quote(name)}"}
+            for name in names[start : start + per_page]
+        ]
+        body = self._page_body("/schemas", page, per_page, len(names), items)
+        return body, f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+    def _records(self, name: str, query: Dict[str, List[str]]) -> Tuple[bytes, str]:
+        """One page of deterministic sample records for a schema"""
+        page, per_page = self._page(query)
+        schema = self._schema(name)
+        schema_etag = schema.canonical()[1]
+
+        # Records depend only on the schema content, seed and page, so the
+        # ETag can be computed without generating anything
+        etag = hashlib.sha1(f"{schema_etag}:{self.seed}:{page}:{per_page}".encode()).hexdigest()
+        etag = f'"{etag[:20]}"'
+
+        cached = self._generators.get(name)
+        if cached is None or cached[0] != schema_etag:
+            cached = (schema_etag, RecordGenerator(schema, self.seed))
+            self._generators[name] = cached
+
+        start = (page - 1) * per_page
+        end = min(start + per_page, self.records_per_schema)
+        items = [cached[1].record(n) for n in range(start, end)]
+        path = f"/records/{quote(name)}"
+        return self._page_body(path, page, per_page, self.records_per_schema, items), etag
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    from .schema_manager import SchemaManager
+
+    parser = argparse.ArgumentParser(
+        prog="python -m assets.mock_server",
+        description="Serve exported schemas and sample records over HTTP",
+    )
+    parser.add_argument("workspace", help="exported schemas JSON file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0, help="seed for sample records")
+    parser.add_argument(
+        "--records",
+        type=int,
+        default=MockContentServer.records_per_schema,
+        help="sample records per schema",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    manager = SchemaManager()
+    manager.import_schemas(iter_workspace(args.workspace))
+
+    server = MockContentServer(manager, args.host, args.port, args.seed)
+    server.records_per_schema = args.records
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
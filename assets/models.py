@@ -1,5 +1,6 @@
-from dataclasses import dataclass, field
-from typing import Dict, List, Any
+import hashlib
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Any, Tuple
 from enum import Enum
 
 
@@ -32,6 +33,56 @@ class Schema:
     array_variables: List[Variable] = field(default_factory=list)
     language_item_variables: List[Variable] = field(default_factory=list)
 
+    # Canonical serialization cache (not dataclass fields): the generation
+    # changes on every field assignment or invalidate(), and cached values
+    # are only used while their generation is current
+    _generation = 0
+    _canonical = None  # (generation, bytes or None, digest)
+
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name != "name":
+            object.__setattr__(self, "_generation", self._generation + 1)
+
+    def invalidate(self):
+        """Drop cached serializations after editing variable lists in place"""
+        object.__setattr__(self, "_generation", self._generation + 1)
+
+    def canonical(self, cache: bool = True) -> Tuple[bytes, str]:
+        """Canonical JSON of to_dict() and its SHA-1 hex digest
+
+        Compact UTF-8 JSON in to_dict() key order with non-ASCII text kept
+        as-is, so equal content always gives equal bytes. The name is not
+        part of the content. With cache=False only the digest is kept.
+        """
+        generation = self._generation
+        cached = self._canonical
+        if cached is not None and cached[0] == generation and cached[1] is not None:
+            return cached[1], cached[2]
+        from .encoder import encode_schema
+
+        data = encode_schema(self).encode("utf-8")
+        digest = hashlib.sha1(data).hexdigest()
+        # Tagged with the generation read before encoding, so a result that
+        # raced with an edit is never used
+        object.__setattr__(self, "_canonical", (generation, data if cache else None, digest))
+        return data, digest
+
+    def canonical_bytes(self, cache: bool = True) -> bytes:
+        """Canonical JSON bytes of the schema content"""
+        return self.canonical(cache)[0]
+
+    def content_hash(self) -> str:
+        """SHA-1 hex digest of canonical_bytes()"""
+        cached = self._canonical
+        if cached is not None and cached[0] == self._generation:
+            return cached[2]
+        return self.canonical(cache=False)[1]
+
+    def copy(self) -> "Schema":
+        """Copy whose variable lists can be edited independently"""
+        return replace(self, **{t.value: list(getattr(self, t.value)) for t in VariableType})
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert schema to dictionary format"""
         return {
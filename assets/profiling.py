@@ -0,0 +1,132 @@
+import builtins
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, TextIO, Tuple
+from . import tracing
+
+# Only standard library modules are imported here: the profiler is
+# installed before anything it is meant to measure
+
+
+class StartupProfiler:
+    """Collects import and construction timings for --profile-startup
+
+    Imports are timed by wrapping builtins.__import__ until stop(); each
+    module's first import is recorded with its total time and its self time
+    (total minus the modules it imported). Construction steps are recorded
+    with phase() and mark().
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: List[Tuple[str, float, float]] = []  # name, start, duration
+        self.marks: List[Tuple[str, float]] = []
+        self.imports: Dict[str, Tuple[float, float]] = {}  # name: (total, self)
+        self._depth = 0
+        self._original_import = None
+        self._child_time: List[float] = []
+
+    def now(self) -> float:
+        """Seconds since the profiler was created"""
+        return time.perf_counter() - self.started
+
+    def start(self):
+        """Begin timing imports"""
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+    def stop(self):
+        """Stop timing imports"""
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        if level:
+            package = (globals or {}).get("__package__") or ""
+            base = package.rsplit(".", level - 1)[0] if level > 1 else package
+            module = f"{base}.{name}" if name else base
+        else:
+            module = name
+        if module in sys.modules or original is None:
+            return original(name, globals, locals, fromlist, level)
+
+        self._child_time.append(0.0)
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            total = time.perf_counter() - started
+            children = self._child_time.pop()
+            if self._child_time:
+                self._child_time[-1] += total
+            self.imports.setdefault(module, (total, total - children))
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a construction step; phases may nest"""
+        start = self.now()
+        self._depth += 1
+        try:
+            with tracing.span(name, "startup"):
+                yield
+        finally:
+            self._depth -= 1
+            self.phases.append(("  " * self._depth + name, start, self.now() - start))
+
+    def mark(self, name: str):
+        """Record a point in time, such as the first paint"""
+        self.marks.append((name, self.now()))
+
+    def report(self, stream: Optional[TextIO] = None, limit: int = 15):
+        """Print the slowest imports, the construction phases and the marks"""
+        stream = stream or sys.stderr
+
+        def write(line: str = ""):
+            print(line, file=stream)
+
+        write(f"Slowest imports (of {len(self.imports)} modules):")
+        write(f"  {'total ms':>9} {'self ms':>8}  module")
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)
+        for module, (total, own) in slowest[:limit]:
+            write(f"  {total * 1000:9.1f} {own * 1000:8.1f}  {module}")
+
+        write()
+        write("Construction:")
+        write(f"  {'start ms':>9} {'took ms':>8}  phase")
+        # Nested phases finish first; list them in the order they began
+        for name, start, duration in sorted(self.phases, key=lambda phase: phase[1]):
+            write(f"  {start * 1000:9.1f} {duration * 1000:8.1f}  {name}")
+
+        if self.marks:
+            write()
+            for name, at in self.marks:
+                write(f"  {at * 1000:9.1f} ms  {name}")
+
+
+profiler: Optional[StartupProfiler] = None
+
+
+def enable() -> StartupProfiler:
+    """Install the startup profiler and begin timing imports"""
+    global profiler
+    if profiler is None:
+        profiler = StartupProfiler()
+        profiler.start()
+    return profiler
+
+
+def phase(name: str):
+    """Context manager timing a startup step for the profile and the trace"""
+    if profiler is None:
+        return tracing.span(name, "startup")
+    return profiler.phase(name)
+
+
+def mark(name: str):
+    """Record a startup milestone when profiling"""
+    if profiler is not None:
+        profiler.mark(name)
@@ -0,0 +1,130 @@
+import re
+import shlex
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, List, Optional, Set
+from .models import VariableType
+
+# Short aliases accepted by has:<type> and <type><op><n>
+TYPE_ALIASES = {
+    "basic": VariableType.BASIC,
+    "more": VariableType.MORE,
+    "image": VariableType.IMAGE,
+    "url": VariableType.URL,
+    "array": VariableType.ARRAY,
+    "language": VariableType.LANGUAGE,
+    "lang": VariableType.LANGUAGE,
+}
+
+_COMPARISON = re.compile(r"^([a-z_]+)(>=|<=|>|<|=)(\d+)$")
+
+
+class QuerySyntaxError(ValueError):
+    """Raised for schema queries that cannot be parsed"""
+
+
+@dataclass
+class Predicate:
+    """A single query term resolved to a posting-list lookup"""
+
+    text: str
+    lookup: Callable[[], Set[str]]
+    negate: bool = False
+
+
+@dataclass
+class QueryPlan:
+    """Compiled query: intersect positive postings, then subtract negatives"""
+
+    predicates: List[Predicate] = field(default_factory=list)
+    free_text: str = ""
+
+    def execute(self, manager) -> List[str]:
+        """Run the plan against a SchemaManager's indexes"""
+        ranked: Optional[List[str]] = None
+        positives = []
+        if self.free_text:
+            ranked = manager.search(self.free_text)
+            positives.append(set(ranked))
+        negatives = []
+        for predicate in self.predicates:
+            (negatives if predicate.negate else positives).append(predicate.lookup())
+
+        if positives:
+            positives.sort(key=len)
+            result = positives[0].intersection(*positives[1:])
+        else:
+            result = set(manager.schemas)
+        for names in negatives:
+            result -= names
+
+        # Keep relevance order when free text was given
+        if ranked is not None:
+            return [name for name in ranked if name in result]
+        return sorted(result)
+
+
+def _type_for(alias: str) -> VariableType:
+    try:
+        return TYPE_ALIASES[alias]
+    except KeyError:
+        raise QuerySyntaxError(f"Unknown variable type '{alias}'")
+
+
+def compile_query(text: str, manager) -> QueryPlan:
+    """Parse a schema query and bind each term to an index lookup
+
+    Supported terms (prefix any with '-' to negate):
+        filter_with:yes  match_img:no      flag values
+        has:image        var:cover_img_url presence of a type or variable
+        missing:cn       missing:en        any variable without that text
+        rows>3  vars<=10  image>=2         numeric comparisons
+        any other word                     full-text search
+    """
+    try:
+        terms = shlex.split(text)
+    except ValueError as e:
+        raise QuerySyntaxError(str(e))
+
+    attributes = manager.attribute_index
+    plan = QueryPlan()
+    words = []
+    for term in terms:
+        negate = term.startswith("-") and len(term) > 1
+        body = term[1:] if negate else term
+        lowered = body.lower()
+
+        comparison = _COMPARISON.match(lowered)
+        if comparison:
+            attribute, op, value = comparison.groups()
+            if attribute not in ("rows", "vars"):
+                attribute = f"count:{_type_for(attribute).value}"
+            lookup = partial(attributes.compare, attribute, op, int(value))
+        elif ":" in body:
+            key, _, value = body.partition(":")
+            key = key.lower()
+            if not value:
+                raise QuerySyntaxError(f"Missing value in '{term}'")
+            if key in ("filter_with", "match_img"):
+                lookup = partial(attributes.lookup, key, value.lower())
+            elif key == "has":
+                field_name = f"count:{_type_for(value.lower()).value}"
+                lookup = partial(attributes.compare, field_name, ">", 0)
+            elif key == "var":
+                lookup = partial(manager.variable_index.schemas_using, value)
+            elif key == "missing":
+                if value.lower() not in ("cn", "en"):
+                    raise QuerySyntaxError(f"missing: expects 'cn' or 'en', got '{value}'")
+                lookup = partial(attributes.lookup, "missing", value.lower())
+            else:
+                raise QuerySyntaxError(f"Unknown field '{key}'")
+        else:
+            if negate:
+                raise QuerySyntaxError(f"Cannot negate free text '{term}'")
+            words.append(body)
+            continue
+
+        plan.predicates.append(Predicate(term, lookup, negate))
+
+    plan.free_text = " ".join(words)
+    return plan
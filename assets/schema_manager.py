@@ -1,23 +1,490 @@
 import logging
-from typing import Dict, Optional, Any
+from contextlib import contextmanager
+from dataclasses import fields
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    Optional,
+    Tuple,
+    Union,
+)
 from .models import Schema, Variable, VariableType
+from .events import ChangeKind, SchemaEvent, coalesce_events
+from .indexes import (
+    AttributeIndex,
+    SchemaIndex,
+    TextIndex,
+    TrigramIndex,
+    VariableIndex,
+)
+from .query import compile_query
+from .snapshot import SnapshotSchemas, load_snapshot, write_snapshot
+from .encoder import encode_member
+from .tracing import span, traced
 
 logger = logging.getLogger(__name__)
 
+SchemaListener = Callable[[List[SchemaEvent]], None]
+
+
+class BatchError(ValueError):
+    """Raised when a batch fails validation; nothing has been applied"""
+
+    def __init__(self, errors: List[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+class SchemaTransaction:
+    """Mutations recorded inside SchemaManager.batch() and applied together"""
+
+    def __init__(self, manager: "SchemaManager"):
+        self._manager = manager
+        self._operations: List[Tuple[str, tuple]] = []
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def add_schema(self, schema: Schema):
+        """Queue adding a schema"""
+        self._operations.append(("add_schema", (schema,)))
+
+    def update_schema(self, old_name: str, schema: Schema):
+        """Queue replacing a schema (renaming it if the name differs)"""
+        self._operations.append(("update_schema", (old_name, schema)))
+
+    def rename_schema(self, old_name: str, new_name: str):
+        """Queue renaming a schema"""
+        self._operations.append(("rename_schema", (old_name, new_name)))
+
+    def delete_schema(self, name: str):
+        """Queue deleting a schema"""
+        self._operations.append(("delete_schema", (name,)))
+
+    def add_variable(
+        self,
+        schema_name: str,
+        var_type: VariableType,
+        variable: Variable,
+        index: Optional[int] = None,
+    ):
+        """Queue inserting a variable"""
+        self._operations.append(
+            ("add_variable", (schema_name, var_type, variable, index))
+        )
+
+    def update_variable(
+        self, schema_name: str, var_type: VariableType, index: int, variable: Variable
+    ):
+        """Queue replacing a variable"""
+        self._operations.append(
+            ("update_variable", (schema_name, var_type, index, variable))
+        )
+
+    def remove_variable(self, schema_name: str, var_type: VariableType, index: int):
+        """Queue removing a variable"""
+        self._operations.append(("remove_variable", (schema_name, var_type, index)))
+
+    def validate(self) -> List[str]:
+        """Check every queued operation against the state it will see"""
+        errors = []
+        # Shadow state layered over the manager: replaced schemas, deleted
+        # names and per-(schema, type) list lengths touched by the batch
+        overlay: Dict[str, Schema] = {}
+        deleted = set()
+        lengths: Dict[Tuple[str, VariableType], int] = {}
+
+        def source(name: str) -> Optional[Schema]:
+            if name in deleted:
+                return None
+            return overlay.get(name) or self._manager.schemas.get(name)
+
+        def length(name: str, var_type: VariableType) -> int:
+            key = (name, var_type)
+            if key not in lengths:
+                lengths[key] = len(getattr(source(name), var_type.value))
+            return lengths[key]
+
+        def place(name: str, schema: Schema):
+            deleted.discard(name)
+            overlay[name] = schema
+            for var_type in VariableType:
+                lengths.pop((name, var_type), None)
+
+        for position, (op, args) in enumerate(self._operations, 1):
+            if op == "add_schema":
+                schema = args[0]
+                if not schema.name:
+                    errors.append(f"#{position}: schema name is required")
+                elif source(schema.name) is not None:
+                    errors.append(f"#{position}: schema '{schema.name}' already exists")
+                else:
+                    place(schema.name, schema)
+            elif op in ("update_schema", "rename_schema"):
+                old_name = args[0]
+                new_name = args[1].name if op == "update_schema" else args[1]
+                current = source(old_name)
+                if current is None:
+                    errors.append(f"#{position}: schema '{old_name}' does not exist")
+                elif not new_name:
+                    errors.append(f"#{position}: schema name is required")
+                elif new_name != old_name and source(new_name) is not None:
+                    errors.append(f"#{position}: schema '{new_name}' already exists")
+                elif op == "update_schema":
+                    deleted.add(old_name)
+                    place(new_name, args[1])
+                elif new_name != old_name:
+                    moved = {
+                        t: lengths.pop((old_name, t))
+                        for t in VariableType
+                        if (old_name, t) in lengths
+                    }
+                    deleted.add(old_name)
+                    place(new_name, current)
+                    for var_type, count in moved.items():
+                        lengths[(new_name, var_type)] = count
+            elif op == "delete_schema":
+                if source(args[0]) is None:
+                    errors.append(f"#{position}: schema '{args[0]}' does not exist")
+                else:
+                    deleted.add(args[0])
+            else:
+                schema_name, var_type = args[0], args[1]
+                if source(schema_name) is None:
+                    errors.append(
+                        f"#{position}: schema '{schema_name}' does not exist"
+                    )
+                elif op == "add_variable":
+                    if not args[2].name:
+                        errors.append(f"#{position}: variable name is required")
+                    else:
+                        lengths[(schema_name, var_type)] = (
+                            length(schema_name, var_type) + 1
+                        )
+                elif not 0 <= args[2] < length(schema_name, var_type):
+                    errors.append(
+                        f"#{position}: no {var_type.value} at index {args[2]} in '{schema_name}'"
+                    )
+                elif op == "update_variable" and not args[3].name:
+                    errors.append(f"#{position}: variable name is required")
+                elif op == "remove_variable":
+                    lengths[(schema_name, var_type)] -= 1
+        return errors
+
+    @staticmethod
+    def _touched(op: str, args: tuple) -> Tuple[str, ...]:
+        """Names of the schemas an operation changes"""
+        if op == "add_schema":
+            return (args[0].name,)
+        if op == "update_schema":
+            return (args[0], args[1].name)
+        if op == "rename_schema":
+            return (args[0], args[1])
+        return (args[0],)
+
+    @traced("SchemaManager.batch", category="manager")
+    def _apply(self):
+        """Apply queued operations in order (after successful validation)
+
+        If an operation raises, every schema the batch touched is put back
+        as it was and the batch's events are dropped.
+        """
+        manager = self._manager
+        saved: Dict[str, Optional[Tuple[Schema, Schema]]] = {}
+        events = len(manager._pending_events)
+        try:
+            for op, args in self._operations:
+                for name in self._touched(op, args):
+                    if name not in saved:
+                        schema = manager.schemas.get(name)
+                        saved[name] = None if schema is None else (schema, schema.copy())
+                getattr(manager, op)(*args)
+        except Exception:
+            manager._rollback(saved, events)
+            raise
+
 
 class SchemaManager:
     """Business logic for schema management"""
 
     def __init__(self):
-        self.schemas: Dict[str, Schema] = {}
+        # A plain dict, or a SnapshotSchemas that decodes entries on first use
+        self.schemas: MutableMapping[str, Schema] = {}
+        self._listeners: List[SchemaListener] = []
+        self._pending_events: List[SchemaEvent] = []
+        self._flush_scheduled = False
+        self._scheduler: Optional[Callable[[Callable[[], None]], None]] = None
+        self._batch_depth = 0
+        self._transaction: Optional[SchemaTransaction] = None
+
+        # Indented export members, dropped as soon as a schema changes; the
+        # canonical compact form is cached on each Schema instead
+        self.revision = 0
+        self._members: Dict[str, str] = {}
+        self._variable_total = (-1, 0)  # (revision, count)
+
+        # Indexes are updated synchronously so queries never see stale data;
+        # after a bulk import or snapshot load they are built on first use
+        self._variable_index = VariableIndex()
+        self._text_index = TextIndex()
+        self._name_index = TrigramIndex()
+        self._attribute_index = AttributeIndex()
+        self._indexes: List[SchemaIndex] = [
+            self._variable_index,
+            self._text_index,
+            self._name_index,
+            self._attribute_index,
+        ]
+        self._indexes_built = True
+
+    # Change notification
+    def subscribe(self, listener: SchemaListener):
+        """Register a listener for coalesced change events"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: SchemaListener):
+        """Remove a previously registered listener"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def set_scheduler(self, scheduler: Optional[Callable[[Callable[[], None]], None]]):
+        """Set the callable used to defer event delivery to the next loop tick
+
+        Without a scheduler events are delivered synchronously, which keeps the
+        manager usable outside of a Qt event loop.
+        """
+        self._scheduler = scheduler
+
+    def flush_events(self):
+        """Deliver all pending events to listeners as one coalesced batch"""
+        self._flush_scheduled = False
+        if not self._pending_events:
+            return
+        events = coalesce_events(self._pending_events)
+        self._pending_events = []
+        with span("SchemaManager.flush_events", "manager", events=len(events)):
+            for listener in list(self._listeners):
+                try:
+                    listener(events)
+                except Exception as e:
+                    logger.error(f"Schema listener error: {e}")
+
+    def _emit(self, kind: ChangeKind, schema_name: str = "", **details):
+        """Queue a change event and schedule its delivery"""
+        self.revision += 1
+        if kind == ChangeKind.RESET:
+            self._members.clear()
+        else:
+            for name in (schema_name, details.get("old_name")):
+                self._members.pop(name, None)
+        self._pending_events.append(SchemaEvent(kind, schema_name, **details))
+        if self._batch_depth == 0:
+            self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Deliver pending events now or on the next scheduler tick"""
+        if not self._pending_events:
+            return
+        if self._scheduler is None:
+            self.flush_events()
+        elif not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._scheduler(self.flush_events)
+
+    # Indexes
+    @property
+    def variable_index(self) -> VariableIndex:
+        self._build_indexes()
+        return self._variable_index
+
+    @property
+    def text_index(self) -> TextIndex:
+        self._build_indexes()
+        return self._text_index
+
+    @property
+    def name_index(self) -> TrigramIndex:
+        self._build_indexes()
+        return self._name_index
+
+    @property
+    def attribute_index(self) -> AttributeIndex:
+        self._build_indexes()
+        return self._attribute_index
+
+    def _build_indexes(self):
+        """Populate indexes after _defer_indexes"""
+        if self._indexes_built:
+            return
+        self._indexes_built = True
+        with span("SchemaManager.build_indexes", "manager", schemas=len(self.schemas)):
+            for index in self._indexes:
+                index.clear()
+            for schema in self.schemas.values():
+                for index in self._indexes:
+                    index.add(schema)
+
+    def _defer_indexes(self):
+        """Empty the indexes and rebuild them when next used"""
+        self._indexes_built = False
+        for index in self._indexes:
+            index.clear()
+
+    def register_index(self, index: SchemaIndex):
+        """Attach an index and populate it from the current workspace"""
+        index.clear()
+        if self._indexes_built:
+            for schema in self.schemas.values():
+                index.add(schema)
+        self._indexes.append(index)
+
+    def _index_schema(self, schema: Schema, old_name: Optional[str] = None):
+        """Refresh every index entry for a schema"""
+        if not self._indexes_built:
+            return
+        for index in self._indexes:
+            index.discard(schema.name if old_name is None else old_name)
+            index.add(schema)
 
+    def _index_variable(
+        self,
+        schema: Schema,
+        var_type: VariableType,
+        old: Optional[Variable],
+        new: Optional[Variable],
+    ):
+        """Forward a single variable change to every index"""
+        if not self._indexes_built:
+            return
+        for index in self._indexes:
+            index.update_variable(schema, var_type, old, new)
+
+    def _rollback(self, saved: Dict[str, Optional[Tuple[Schema, Schema]]], events: int):
+        """Restore schemas saved by a failed transaction and drop its events"""
+        del self._pending_events[events:]
+        self.revision += 1
+        for name in saved:
+            self.schemas.pop(name, None)
+            self._members.pop(name, None)
+        for name, state in saved.items():
+            if state is None:
+                self._unindex_schema(name)
+                continue
+            schema, copy = state
+            for f in fields(Schema):
+                setattr(schema, f.name, getattr(copy, f.name))
+            self.schemas[name] = schema
+            self._index_schema(schema)
+
+    def _unindex_schema(self, name: str):
+        """Remove a schema from every index"""
+        if not self._indexes_built:
+            return
+        for index in self._indexes:
+            index.discard(name)
+
+    def serialized_schema(self, name: str, cache: bool = True) -> Optional[Tuple[bytes, str]]:
+        """Canonical bytes of a schema and their SHA-1 (see Schema.canonical)
+
+        Safe to call from a reader thread: bytes serialized while the schema
+        changed underneath are returned but never reused.
+        """
+        schema = self.schemas.get(name)
+        if schema is None:
+            return None
+        return schema.canonical(cache)
+
+    def indented_member(self, name: str, cache: bool = True) -> Optional[str]:
+        """A schema as it appears in the indent=2 export: '  "name": {...}'
+
+        Joining members with ",\n" inside "{\n" and "\n}" reproduces
+        json.dumps(export_schemas(), indent=2, ensure_ascii=False) exactly.
+        """
+        member = self._members.get(name)
+        if member is not None:
+            return member
+        schema = self.schemas.get(name)
+        if schema is None:
+            return None
+        member = encode_member(name, schema)
+        if cache:
+            self._members[name] = member
+        return member
+
+    def schema_hash(self, name: str) -> Optional[str]:
+        """Content hash of a schema's exported data"""
+        schema = self.schemas.get(name)
+        return schema.content_hash() if schema is not None else None
+
+    def find_usages(self, var_name: str) -> List[Tuple[str, VariableType]]:
+        """List (schema name, variable type) pairs that use a variable name"""
+        return self.variable_index.usages(var_name)
+
+    @traced(category="manager")
+    def search(self, text: str, limit: Optional[int] = None) -> List[str]:
+        """Full-text search over names, page titles and variable labels"""
+        return self.text_index.search(text, limit)
+
+    @traced(category="manager")
+    def fuzzy_find(self, text: str, limit: int = 20) -> List[Tuple[str, float]]:
+        """Typo-tolerant schema name lookup ranked by similarity"""
+        return self.name_index.search(text, limit)
+
+    @traced(category="manager")
+    def query(self, text: str) -> List[str]:
+        """Run a schema query such as 'filter_with:yes has:image rows>3'"""
+        return compile_query(text, self).execute(self)
+
+    @contextmanager
+    def batch(self) -> Iterator[SchemaTransaction]:
+        """Group mutations into one validated, atomic change
+
+        Operations queued on the yielded transaction are validated together
+        when the block exits and applied only if all of them are valid;
+        otherwise BatchError is raised and the workspace is left untouched.
+        Listeners receive a single coalesced notification at the end.
+        A batch opened inside another one joins the outermost batch: its
+        operations are validated and applied only when that one exits.
+        """
+        transaction = SchemaTransaction(self)
+        outer = self._transaction
+        if outer is None:
+            self._transaction = transaction
+        self._batch_depth += 1
+        try:
+            yield transaction
+            if outer is not None:
+                outer._operations.extend(transaction._operations)
+            else:
+                errors = transaction.validate()
+                if errors:
+                    raise BatchError(errors)
+                transaction._apply()
+        finally:
+            self._batch_depth -= 1
+            if outer is None:
+                self._transaction = None
+            if self._batch_depth == 0:
+                self._schedule_flush()
+
+    # Schema operations
+    @traced(category="manager")
     def add_schema(self, schema: Schema) -> bool:
         """Add a new schema"""
         if schema.name in self.schemas:
             return False
         self.schemas[schema.name] = schema
+        self._index_schema(schema)
+        self._emit(ChangeKind.SCHEMA_ADDED, schema.name)
         return True
 
+    @traced(category="manager")
     def update_schema(self, old_name: str, schema: Schema) -> bool:
         """Update an existing schema"""
         if old_name != schema.name and schema.name in self.schemas:
@@ -25,12 +492,33 @@ class SchemaManager:
         if old_name != schema.name:
             del self.schemas[old_name]
         self.schemas[schema.name] = schema
+        self._index_schema(schema, old_name)
+        if old_name != schema.name:
+            self._emit(ChangeKind.SCHEMA_RENAMED, schema.name, old_name=old_name)
+        else:
+            self._emit(ChangeKind.SCHEMA_UPDATED, schema.name)
         return True
 
+    @traced(category="manager")
+    def rename_schema(self, old_name: str, new_name: str) -> bool:
+        """Rename a schema"""
+        schema = self.schemas.get(old_name)
+        if not schema or not new_name:
+            return False
+        if old_name == new_name:
+            return True
+        if new_name in self.schemas:
+            return False
+        schema.name = new_name
+        return self.update_schema(old_name, schema)
+
+    @traced(category="manager")
     def delete_schema(self, name: str) -> bool:
         """Delete a schema"""
         if name in self.schemas:
             del self.schemas[name]
+            self._unindex_schema(name)
+            self._emit(ChangeKind.SCHEMA_REMOVED, name)
             return True
         return False
 
@@ -38,6 +526,29 @@ class SchemaManager:
         """Get a schema by name"""
         return self.schemas.get(name)
 
+    def variable_count(self) -> int:
+        """Variables across the workspace, recounted only after changes"""
+        revision, count = self._variable_total
+        if revision != self.revision:
+            counter = getattr(self.schemas, "variable_count", None)
+            if counter is not None:
+                count = counter()
+            else:
+                count = sum(
+                    len(getattr(schema, var_type.value))
+                    for schema in self.schemas.values()
+                    for var_type in VariableType
+                )
+            self._variable_total = (self.revision, count)
+        return count
+
+    @traced(category="manager")
+    def sort_schemas(self, key: Optional[Callable[[str], Any]] = None):
+        """Reorder the workspace by schema name (or key(name))"""
+        self.schemas = {name: self.schemas[name] for name in sorted(self.schemas, key=key)}
+        self._emit(ChangeKind.RESET)
+
+    @traced(category="manager")
     def duplicate_schema(self, name: str, new_name: str) -> bool:
         """Duplicate a schema"""
         if name not in self.schemas or new_name in self.schemas:
@@ -58,19 +569,168 @@ class SchemaManager:
             language_item_variables=original.language_item_variables.copy(),
         )
         self.schemas[new_name] = new_schema
+        self._index_schema(new_schema)
+        self._emit(ChangeKind.SCHEMA_ADDED, new_name)
+        return True
+
+    # Variable operations
+    @traced(category="manager")
+    def add_variable(
+        self,
+        schema_name: str,
+        var_type: VariableType,
+        variable: Variable,
+        index: Optional[int] = None,
+    ) -> bool:
+        """Insert a variable into a schema (appends when no index is given)"""
+        schema = self.schemas.get(schema_name)
+        if not schema:
+            return False
+        var_list = getattr(schema, var_type.value)
+        if index is None or index > len(var_list):
+            index = len(var_list)
+        var_list.insert(index, variable)
+        schema.invalidate()
+        self._index_variable(schema, var_type, None, variable)
+        self._emit(
+            ChangeKind.VARIABLE_INSERTED,
+            schema_name,
+            var_type=var_type,
+            index=index,
+            variable=variable,
+        )
+        return True
+
+    @traced(category="manager")
+    def update_variable(
+        self, schema_name: str, var_type: VariableType, index: int, variable: Variable
+    ) -> bool:
+        """Replace the variable at the given index"""
+        schema = self.schemas.get(schema_name)
+        if not schema:
+            return False
+        var_list = getattr(schema, var_type.value)
+        if not 0 <= index < len(var_list):
+            return False
+        old = var_list[index]
+        var_list[index] = variable
+        schema.invalidate()
+        self._index_variable(schema, var_type, old, variable)
+        self._emit(
+            ChangeKind.VARIABLE_UPDATED,
+            schema_name,
+            var_type=var_type,
+            index=index,
+            variable=variable,
+        )
+        return True
+
+    @traced(category="manager")
+    def remove_variable(
+        self, schema_name: str, var_type: VariableType, index: int
+    ) -> bool:
+        """Remove the variable at the given index"""
+        schema = self.schemas.get(schema_name)
+        if not schema:
+            return False
+        var_list = getattr(schema, var_type.value)
+        if not 0 <= index < len(var_list):
+            return False
+        variable = var_list.pop(index)
+        schema.invalidate()
+        self._index_variable(schema, var_type, variable, None)
+        self._emit(
+            ChangeKind.VARIABLE_REMOVED,
+            schema_name,
+            var_type=var_type,
+            index=index,
+            variable=variable,
+        )
         return True
 
-    def export_schemas(self) -> Dict[str, Any]:
-        """Export all schemas as dictionary"""
-        return {name: schema.to_dict() for name, schema in self.schemas.items()}
+    # Refactoring
+    def plan_variable_rename(
+        self, old_name: str, var_type: Optional[VariableType] = None
+    ) -> List[Tuple[str, VariableType, int]]:
+        """Locate every (schema, type, index) holding a variable name"""
+        occurrences = []
+        for schema_name, usage_type in self.find_usages(old_name):
+            if var_type is not None and usage_type != var_type:
+                continue
+            var_list = getattr(self.schemas[schema_name], usage_type.value)
+            for index, var in enumerate(var_list):
+                if var.name == old_name:
+                    occurrences.append((schema_name, usage_type, index))
+        return occurrences
+
+    @traced(category="manager")
+    def rename_variable(
+        self, old_name: str, new_name: str, var_type: Optional[VariableType] = None
+    ) -> int:
+        """Rename a variable in every schema as one batch; returns the count"""
+        if not new_name or old_name == new_name:
+            return 0
+        occurrences = self.plan_variable_rename(old_name, var_type)
+        with self.batch() as batch:
+            for schema_name, usage_type, index in occurrences:
+                variable = getattr(self.schemas[schema_name], usage_type.value)[index]
+                renamed = Variable(
+                    new_name, variable.en_text, variable.cn_text, variable.rows
+                )
+                batch.update_variable(schema_name, usage_type, index, renamed)
+        return len(occurrences)
+
+    @traced(category="manager")
+    def export_schemas(self, names: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Export all (or the named) schemas as dictionary"""
+        if names is None:
+            return {name: schema.to_dict() for name, schema in self.schemas.items()}
+        return {name: self.schemas[name].to_dict() for name in names if name in self.schemas}
 
-    def import_schemas(self, data: Dict[str, Any]):
-        """Import schemas from dictionary"""
-        self.schemas.clear()
-        for name, schema_data in data.items():
+    @traced(category="manager")
+    def import_schemas(
+        self, data: Union[Dict[str, Any], Iterable[Tuple[str, Dict[str, Any]]]]
+    ) -> int:
+        """Replace the workspace with schemas from a dictionary or (name, data) pairs
+
+        Pairs may come from a streaming reader; the workspace is only replaced
+        once every item has been read. Indexes are rebuilt on the first query,
+        so imports that are only exported again never pay for them. Returns
+        the number of schemas imported.
+        """
+        items = data.items() if isinstance(data, dict) else data
+        imported: Dict[str, Schema] = {}
+        for name, schema_data in items:
             schema = self._parse_schema(name, schema_data)
             if schema:
-                self.schemas[name] = schema
+                imported[name] = schema
+
+        self.schemas = imported
+        self._defer_indexes()
+        self._emit(ChangeKind.RESET)
+        return len(imported)
+
+    @traced(category="manager")
+    def load_snapshot(self, path: str) -> int:
+        """Replace the workspace with a binary snapshot written by save_snapshot
+
+        Only the schema names are read up front: schemas are decoded from the
+        memory-mapped file when first accessed, and indexes are built on the
+        first query. Returns the number of schemas.
+        """
+        self.schemas = load_snapshot(path)
+        self._defer_indexes()
+        self._emit(ChangeKind.RESET)
+        return len(self.schemas)
+
+    @traced(category="manager")
+    def save_snapshot(self, path: str):
+        """Write the workspace as a binary snapshot for fast reopening"""
+        if isinstance(self.schemas, SnapshotSchemas):
+            # The file being replaced may be the one still mapped, which
+            # Windows refuses to overwrite
+            self.schemas.decode_all()
+        write_snapshot(self.schemas, path)
 
     def _parse_schema(self, name: str, data: Dict[str, Any]) -> Optional[Schema]:
         """Parse schema from dictionary"""
@@ -0,0 +1,327 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from itertools import accumulate
+from typing import Dict, Iterator, List, Mapping, MutableMapping, Optional
+from .models import Schema, Variable, VariableType
+
+# File layout, all integers little-endian:
+#   header        HEADER struct below
+#   string index  string_count + 1 int64 byte offsets into the string data
+#   string data   UTF-8 text of every distinct string, back to back
+#   schemas       SCHEMA_FIELDS int32 per schema: name, page_title_cn,
+#                 page_title_en, match_img, filter_with (string ids), first
+#                 variable, then one variable count per VariableType
+#   variables     VARIABLE_FIELDS int32 per variable: name, en, cn (string
+#                 ids) and rows, grouped by schema and then by type
+# Sections start on 8-byte boundaries.
+SNAPSHOT_MAGIC = b"SDSNAP\r\n"
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct("<8sIIII5Q")
+SCHEMA_FIELDS = 6 + len(VariableType)
+VARIABLE_FIELDS = 4
+
+_VARIABLE_FIELDS = [var_type.value for var_type in VariableType]
+_INT32_MAX = 2**31 - 1
+_SWAP = sys.byteorder == "big"
+
+
+def _int32_array(values: List[int]) -> array:
+    table = array("i", values)
+    if _SWAP:
+        table.byteswap()
+    return table
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % 8)
+
+
+def write_snapshot(schemas: Mapping[str, Schema], path: str):
+    """Write a workspace snapshot atomically
+
+    Strings are deduplicated into one table, so labels repeated across
+    schemas are stored once. Raises ValueError for values the format cannot
+    hold (non-string text, rows outside the int32 range).
+    """
+    strings: Dict[str, int] = {}
+    intern = strings.setdefault
+    schema_table: List[int] = []
+    variable_table: List[int] = []
+    variable_count = 0
+
+    for name, schema in schemas.items():
+        for text in (
+            name,
+            schema.page_title_cn,
+            schema.page_title_en,
+            schema.match_img,
+            schema.filter_with,
+        ):
+            if not isinstance(text, str):
+                raise ValueError(f"Schema '{name}' has a non-text field: {text!r}")
+            schema_table.append(intern(text, len(strings)))
+        schema_table.append(variable_count)
+        for field in _VARIABLE_FIELDS:
+            variables = getattr(schema, field)
+            schema_table.append(len(variables))
+            variable_count += len(variables)
+            for var in variables:
+                var_name, en_text, cn_text, rows = var.name, var.en_text, var.cn_text, var.rows
+                if not (
+                    isinstance(var_name, str)
+                    and isinstance(en_text, str)
+                    and isinstance(cn_text, str)
+                ):
+                    raise ValueError(f"Variable '{var_name}' in '{name}' has non-text fields")
+                if not isinstance(rows, int) or not -_INT32_MAX <= rows <= _INT32_MAX:
+                    raise ValueError(f"Variable '{var_name}' in '{name}' has invalid rows: {rows!r}")
+                variable_table += (
+                    intern(var_name, len(strings)),
+                    intern(en_text, len(strings)),
+                    intern(cn_text, len(strings)),
+                    rows,
+                )
+
+    encoded = [text.encode("utf-8") for text in strings]
+    offsets = array("q", accumulate(map(len, encoded), initial=0))
+    if _SWAP:
+        offsets.byteswap()
+    string_data = b"".join(encoded)
+    sections = [
+        offsets.tobytes(),
+        string_data + _padding(len(string_data)),
+        _int32_array(schema_table).tobytes(),
+        _int32_array(variable_table).tobytes(),
+    ]
+    positions = list(accumulate(map(len, sections), initial=HEADER.size))
+    header = HEADER.pack(
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_VERSION,
+        len(strings),
+        len(schemas),
+        variable_count,
+        *positions,
+    )
+
+    temp_path = f"{path}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(header)
+            for section in sections:
+                f.write(section)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+class Snapshot:
+    """Read-only view of a snapshot file through mmap
+
+    Opening only validates the header; strings and schemas are decoded when
+    they are first asked for.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._open()
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _open(self):
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f"{self.path} is not a workspace snapshot")
+        (
+            magic,
+            version,
+            self.string_count,
+            self.schema_count,
+            self.variable_count,
+            offsets_at,
+            strings_at,
+            schemas_at,
+            variables_at,
+            end,
+        ) = HEADER.unpack_from(self._mm)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"{self.path} is not a workspace snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version}")
+        if end != len(self._mm):
+            raise ValueError(f"{self.path} is truncated")
+        if (
+            offsets_at != HEADER.size
+            or strings_at - offsets_at != (self.string_count + 1) * 8
+            or variables_at - schemas_at != self.schema_count * SCHEMA_FIELDS * 4
+            or end - variables_at != self.variable_count * VARIABLE_FIELDS * 4
+        ):
+            raise ValueError(f"{self.path} has inconsistent section sizes")
+
+        view = memoryview(self._mm)
+        self._offsets = self._table(view, offsets_at, strings_at, "q")
+        self._schemas = self._table(view, schemas_at, variables_at, "i")
+        self._variables = self._table(view, variables_at, end, "i")
+        view.release()
+        self._strings_at = strings_at
+        self._strings: List[Optional[str]] = [None] * self.string_count
+
+    @staticmethod
+    def _table(view: memoryview, start: int, stop: int, typecode: str):
+        """Zero-copy integer table, or a byte-swapped copy on big-endian hosts"""
+        table = view[start:stop].cast(typecode)
+        if _SWAP:
+            table = array(typecode, table)
+            table.byteswap()
+        return table
+
+    def close(self):
+        """Release the mapping; decoded schemas stay valid"""
+        for table in (self._offsets, self._schemas, self._variables):
+            if isinstance(table, memoryview):
+                table.release()
+        self._mm.close()
+
+    def string(self, index: int) -> str:
+        """Decode a string table entry once and reuse it afterwards"""
+        text = self._strings[index]
+        if text is None:
+            start = self._strings_at + self._offsets[index]
+            end = self._strings_at + self._offsets[index + 1]
+            text = self._strings[index] = self._mm[start:end].decode("utf-8")
+        return text
+
+    def names(self) -> List[str]:
+        """Schema names in workspace order"""
+        table, string = self._schemas, self.string
+        return [string(table[i]) for i in range(0, len(table), SCHEMA_FIELDS)]
+
+    def schema_variable_count(self, position: int) -> int:
+        """Variables of the schema at a position, without decoding it"""
+        return sum(self._schemas[position * SCHEMA_FIELDS + 6 : (position + 1) * SCHEMA_FIELDS])
+
+    def schema(self, position: int) -> Schema:
+        """Decode the schema stored at a position"""
+        string = self.string
+        row = self._schemas[position * SCHEMA_FIELDS : (position + 1) * SCHEMA_FIELDS]
+        schema = Schema(
+            string(row[0]), string(row[1]), string(row[2]), string(row[3]), string(row[4])
+        )
+        variables = self._variables
+        at = row[5] * VARIABLE_FIELDS
+        for field, count in zip(_VARIABLE_FIELDS, row[6:]):
+            end = at + count * VARIABLE_FIELDS
+            setattr(
+                schema,
+                field,
+                [
+                    Variable(
+                        string(variables[i]),
+                        string(variables[i + 1]),
+                        string(variables[i + 2]),
+                        variables[i + 3],
+                    )
+                    for i in range(at, end, VARIABLE_FIELDS)
+                ],
+            )
+            at = end
+        return schema
+
+
+class SnapshotSchemas(MutableMapping[str, Schema]):
+    """Schema mapping that decodes snapshot entries on first access
+
+    Behaves like the plain dict SchemaManager normally uses, preserving
+    workspace order. The mapping is released once every schema has been
+    decoded, replaced or deleted.
+    """
+
+    def __init__(self, snapshot: Snapshot):
+        self._snapshot: Optional[Snapshot] = snapshot
+        names = snapshot.names()
+        self._data: Dict[str, Optional[Schema]] = dict.fromkeys(names)
+        self._positions = {name: position for position, name in enumerate(names)}
+        self._lock = threading.Lock()
+        if not self._positions:
+            self._release()
+
+    @property
+    def pending(self) -> int:
+        """Schemas not decoded yet"""
+        return len(self._positions)
+
+    def variable_count(self) -> int:
+        """Variables in all schemas; pending entries are counted from the file"""
+        with self._lock:
+            total = 0
+            for name, schema in self._data.items():
+                if schema is None:
+                    total += self._snapshot.schema_variable_count(self._positions[name])
+                else:
+                    total += sum(len(getattr(schema, field)) for field in _VARIABLE_FIELDS)
+            return total
+
+    def decode_all(self):
+        """Decode every pending schema and release the file"""
+        with self._lock:
+            for name, position in self._positions.items():
+                self._data[name] = self._snapshot.schema(position)
+            self._positions.clear()
+            self._release()
+
+    def _release(self):
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+
+    def __getitem__(self, name: str) -> Schema:
+        schema = self._data[name]
+        if schema is None:
+            # The mock server reads from its own thread; decode each entry once
+            with self._lock:
+                schema = self._data[name]
+                if schema is None:
+                    schema = self._snapshot.schema(self._positions.pop(name))
+                    self._data[name] = schema
+                    if not self._positions:
+                        self._release()
+        return schema
+
+    def __setitem__(self, name: str, schema: Schema):
+        with self._lock:
+            self._data[name] = schema
+            if self._positions.pop(name, None) is not None and not self._positions:
+                self._release()
+
+    def __delitem__(self, name: str):
+        with self._lock:
+            del self._data[name]
+            if self._positions.pop(name, None) is not None and not self._positions:
+                self._release()
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._positions.clear()
+            self._release()
+
+
+def load_snapshot(path: str) -> SnapshotSchemas:
+    """Open a snapshot as a lazily decoded schema mapping"""
+    return SnapshotSchemas(Snapshot(path))
@@ -0,0 +1,79 @@
+import copy
+import random
+from assets.diff import SchemaChange, apply_patch, diff_variable_list, diff_workspaces, pointer
+
+
+def variables(*names, text="a"):
+    return [{name: {"en": text, "cn": "", "rows": 0}} for name in names]
+
+
+def schema(*names, **fields):
+    data = {"page_title_en": "Page", "match_img": "no", "basic_variables": variables(*names)}
+    data.update(fields)
+    return data
+
+
+def test_pointer_escapes_separators():
+    assert pointer("a/b", "c~d", 3) == "/a~1b/c~0d/3"
+
+
+def test_one_move_for_one_displaced_variable():
+    change = SchemaChange("page")
+    old = variables("a", "b", "c", "d", "e")
+    new = variables("b", "c", "d", "e", "a")
+
+    ops = diff_variable_list("page", "basic_variables", old, new, change)
+
+    assert [op["op"] for op in ops] == ["move"]
+    assert change.moved == [("basic", "a")]
+
+
+def test_malformed_variables_replace_the_list():
+    change = SchemaChange("page")
+    new = variables("a") + [{}, "b"]
+
+    ops = diff_variable_list("page", "basic_variables", variables("a", "b"), new, change)
+
+    assert ops == [{"op": "replace", "path": "/page/basic_variables", "value": new}]
+
+
+def test_patch_reproduces_shuffled_lists():
+    rng = random.Random(5)
+    for _ in range(200):
+        old_names = rng.sample(range(40), rng.randrange(20))
+        new_names = [n for n in old_names if rng.random() < 0.8] + rng.sample(range(40, 50), 3)
+        rng.shuffle(new_names)
+        old = variables(*map(str, old_names))
+        new = variables(*map(str, new_names))
+        ops = diff_variable_list("page", "basic_variables", old, new, SchemaChange("page"))
+        result = apply_patch({"page": {"basic_variables": old}}, ops)
+        assert result["page"]["basic_variables"] == new
+
+
+def test_workspace_diff_round_trip():
+    old = {
+        "home": schema("title", "body"),
+        "about": schema("name"),
+        "gone": schema("x"),
+    }
+    new = {
+        "home": schema("body", "title", "footer", match_img="yes"),
+        "about_us": schema("name"),
+        "fresh": schema("y"),
+    }
+    result = diff_workspaces(old, new)
+
+    assert result.renamed == [("about", "about_us")]
+    assert result.added == ["fresh"]
+    assert result.removed == ["gone"]
+    assert [change.name for change in result.changed] == ["home"]
+    before = copy.deepcopy(old)
+    assert apply_patch(old, result.patch) == new
+    assert old == before
+
+
+def test_identical_workspaces_have_no_patch():
+    workspace = {"home": schema("title")}
+    result = diff_workspaces(workspace, copy.deepcopy(workspace))
+    assert not result
+    assert result.summary() == "No differences"
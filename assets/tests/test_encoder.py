@@ -0,0 +1,52 @@
+import json
+from assets.encoder import encode_member, encode_schema
+from assets.models import Schema, Variable
+
+
+def make_schema() -> Schema:
+    return Schema(
+        "page",
+        page_title_cn="页面 \"标题\"",
+        page_title_en="Tab\tand\nnewline \\ slash",
+        match_img="yes",
+        basic_variables=[Variable("title", "Title", "标题", 1), Variable("émoji", "😀")],
+        url_variables=[Variable("link", rows=-3)],
+    )
+
+
+def test_compact_matches_json_dumps():
+    schema = make_schema()
+    expected = json.dumps(schema.to_dict(), ensure_ascii=False, separators=(",", ":"))
+    assert encode_schema(schema) == expected
+
+
+def test_indented_matches_json_dumps():
+    schema = make_schema()
+    for indent in (2, 4):
+        expected = json.dumps(schema.to_dict(), ensure_ascii=False, indent=indent)
+        assert encode_schema(schema, indent) == expected
+
+
+def test_members_join_into_an_export():
+    schemas = [make_schema(), Schema("empty")]
+    text = "{\n" + ",\n".join(encode_member(s.name, s) for s in schemas) + "\n}"
+    expected = {s.name: s.to_dict() for s in schemas}
+    assert text == json.dumps(expected, ensure_ascii=False, indent=2)
+
+
+def test_unexpected_values_fall_back_to_json_dumps():
+    schema = Schema("odd", match_img=None, basic_variables=[Variable("x", rows=1.5)])
+    assert encode_schema(schema) == json.dumps(
+        schema.to_dict(), ensure_ascii=False, separators=(",", ":")
+    )
+    assert encode_schema(schema, 2) == json.dumps(schema.to_dict(), ensure_ascii=False, indent=2)
+
+
+def test_canonical_bytes_track_edits():
+    schema = make_schema()
+    before = schema.content_hash()
+    schema.basic_variables.append(Variable("body"))
+    assert schema.content_hash() == before
+    schema.invalidate()
+    assert schema.content_hash() != before
+    assert schema.canonical_bytes() == encode_schema(schema).encode("utf-8")
@@ -0,0 +1,69 @@
+import json
+import pytest
+from assets.exporters import DeltaExporter, detect_export_format, write_export
+from assets.fileio import detect_codec, load_workspace
+from assets.models import Schema, Variable
+from assets.schema_manager import SchemaManager
+
+
+@pytest.fixture
+def manager() -> SchemaManager:
+    manager = SchemaManager()
+    for i in range(5):
+        manager.add_schema(
+            Schema(
+                f"page_{i}",
+                page_title_cn=f"页面 {i}",
+                basic_variables=[Variable("title", f"Title {i}", "标题", i)],
+            )
+        )
+    return manager
+
+
+def test_detect_export_format():
+    assert detect_export_format("a.ndjson.gz") == ("ndjson", "gzip")
+    assert detect_export_format("a.min.json.xz") == ("minified", "xz")
+    assert detect_export_format("a.json") == ("json", None)
+
+
+def test_json_export_matches_json_dump(manager, tmp_path):
+    path = tmp_path / "schemas.json"
+    assert write_export(manager, str(path))
+    expected = json.dumps(manager.export_schemas(), ensure_ascii=False, indent=2)
+    assert path.read_text(encoding="utf-8") == expected
+
+
+def test_cancelled_export_leaves_target(manager, tmp_path):
+    path = tmp_path / "schemas.json"
+    path.write_text("previous", encoding="utf-8")
+
+    assert not write_export(manager, str(path), progress=lambda done, total: False)
+    assert path.read_text(encoding="utf-8") == "previous"
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize("name", ["w.json.gz", "w.min.json.xz", "w.ndjson.bz2", "w.jsonl"])
+def test_round_trip_through_every_format(manager, tmp_path, name):
+    path = tmp_path / name
+    write_export(manager, str(path), names=["page_3", "page_1", "missing"])
+
+    codec = {".gz": "gzip", ".xz": "xz", ".bz2": "bz2"}.get(path.suffix)
+    assert detect_codec(str(path)) == codec
+    assert load_workspace(str(path)) == manager.export_schemas(["page_3", "page_1"])
+
+
+def test_delta_export_since_last_full_export(manager, tmp_path):
+    exporter = DeltaExporter(manager, str(tmp_path / "manifest.json"))
+    exporter.record_full_export()
+    manager.delete_schema("page_0")
+    manager.update_schema("page_1", Schema("page_1", page_title_en="Changed"))
+    manager.add_schema(Schema("page_9"))
+
+    delta = exporter.pending()
+    assert (delta.added, delta.changed, delta.removed) == (["page_9"], ["page_1"], ["page_0"])
+
+    patch_path = tmp_path / "delta.json"
+    exporter.export_patch(str(patch_path))
+    ops = [(op["op"], op["path"]) for op in json.loads(patch_path.read_text(encoding="utf-8"))]
+    assert ops == [("remove", "/page_0"), ("replace", "/page_1"), ("add", "/page_9")]
+    assert not exporter.pending()
@@ -0,0 +1,70 @@
+import json
+from assets.generator import (
+    CHARS_PER_ROW,
+    CORPUS_WORDS,
+    DEFAULT_ARRAY_LENGTH,
+    WORDS_PER_ROW,
+    RecordGenerator,
+    _chunk_rng,
+)
+from assets.models import Schema, Variable
+
+
+def make_schema(**variables) -> Schema:
+    return Schema("page", **{field: list(values) for field, values in variables.items()})
+
+
+def test_record_fields_follow_variable_types():
+    schema = make_schema(
+        basic_variables=[Variable("title", rows=2)],
+        image_variables=[Variable("cover")],
+        url_variables=[Variable("link")],
+        array_variables=[Variable("tags"), Variable("credits", rows=5)],
+        language_item_variables=[Variable("caption", rows=1)],
+    )
+    record = next(RecordGenerator(schema, seed=1).records(1))
+
+    assert len(record["title"].split(" ")) == 2 * WORDS_PER_ROW
+    assert record["cover"] == "/images/cover/0.jpg"
+    assert record["link"] == "https://example.com/link/0"
+    assert len(record["tags"]) == DEFAULT_ARRAY_LENGTH
+    assert len(record["credits"]) == 5
+    assert len(record["caption"]["cn"]) == CHARS_PER_ROW
+
+
+def test_rows_above_corpus_size_keep_requested_length():
+    rows = CORPUS_WORDS // WORDS_PER_ROW + 1000
+    schema = make_schema(
+        basic_variables=[Variable("body", rows=rows)],
+        language_item_variables=[Variable("text", rows=5000)],
+    )
+    for record in RecordGenerator(schema, seed=3).records(3):
+        assert len(record["body"].split(" ")) == rows * WORDS_PER_ROW
+        assert len(record["text"]["en"].split(" ")) == 5000 * WORDS_PER_ROW
+        assert len(record["text"]["cn"]) == 5000 * CHARS_PER_ROW
+
+
+def test_exact_multiple_of_corpus_size():
+    schema = make_schema(language_item_variables=[Variable("text", rows=CORPUS_WORDS)])
+    record = next(RecordGenerator(schema, seed=0).records(1))
+    assert len(record["text"]["en"].split(" ")) == CORPUS_WORDS * WORDS_PER_ROW
+    assert len(record["text"]["cn"]) == CORPUS_WORDS * CHARS_PER_ROW
+
+
+def test_records_match_written_file(tmp_path):
+    schema = make_schema(basic_variables=[Variable("title")], url_variables=[Variable("link")])
+    generator = RecordGenerator(schema, seed=7)
+    generator.chunk_records = 4
+    path = tmp_path / "page.ndjson"
+
+    stats = generator.write_ndjson(str(path), 10, workers=1)
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert stats.records == 10
+    assert [json.loads(line) for line in lines] == list(generator.records(10))
+    assert list(generator.records(3, start=5)) == list(generator.records(10))[5:8]
+
+
+def test_chunk_streams_do_not_overlap():
+    assert _chunk_rng(1, 1_000_003).random() != _chunk_rng(2, 0).random()
+    assert _chunk_rng(7, 64).random() == _chunk_rng(7, 64).random()
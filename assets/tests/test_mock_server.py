@@ -0,0 +1,33 @@
+import json
+from assets.mock_server import MockContentServer
+from assets.models import Schema, Variable, VariableType
+from assets.schema_manager import SchemaManager
+
+
+def make_server() -> MockContentServer:
+    manager = SchemaManager()
+    manager.add_schema(Schema("home", basic_variables=[Variable("title", rows=1)]))
+    return MockContentServer(manager)
+
+
+def records(server: MockContentServer, target: str):
+    return json.loads(server._route(target)[0])["items"]
+
+
+def test_server_serves_published_copies():
+    server = make_server()
+    manager = server.schema_manager
+    manager.add_variable("home", VariableType.BASIC, Variable("body"))
+    assert "body" not in server._route("/schemas/home")[0].decode()
+
+    manager.subscribe(server._on_schema_events)
+    manager.rename_schema("home", "start")
+    assert json.loads(server._route("/schemas")[0])["total"] == 1
+    assert "body" in server._route("/schemas/start")[0].decode()
+
+
+def test_record_pages_do_not_depend_on_pagination():
+    server = make_server()
+    deep = records(server, "/records/home?page=200&per_page=50")
+    assert len(deep) == 50
+    assert records(server, "/records/home?page=9951&per_page=1") == deep[:1]
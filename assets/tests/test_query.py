@@ -0,0 +1,68 @@
+import pytest
+from assets.models import Schema, Variable, VariableType
+from assets.query import QuerySyntaxError
+from assets.schema_manager import SchemaManager
+
+
+@pytest.fixture
+def manager() -> SchemaManager:
+    manager = SchemaManager()
+    manager.add_schema(
+        Schema(
+            "gallery",
+            page_title_en="Photo gallery",
+            filter_with="yes",
+            image_variables=[Variable("cover_img", "Cover", "封面", 1)],
+            array_variables=[Variable("photos", "Photos", "照片", 12)],
+        )
+    )
+    manager.add_schema(
+        Schema(
+            "blog",
+            page_title_en="Blog post",
+            basic_variables=[Variable("title", "Title"), Variable("body", "Body", "正文", 5)],
+        )
+    )
+    manager.add_schema(
+        Schema("contact", page_title_en="Contact", url_variables=[Variable("map", "Map", "地图")])
+    )
+    return manager
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("filter_with:yes", ["gallery"]),
+        ("-filter_with:yes", ["blog", "contact"]),
+        ("has:image", ["gallery"]),
+        ("has:url -has:image", ["contact"]),
+        ("var:title", ["blog"]),
+        ("missing:cn", ["blog"]),
+        ("rows>3", ["blog", "gallery"]),
+        ("rows>3 vars<=1", []),
+        ("vars>=2", ["blog", "gallery"]),
+        ("array=1", ["gallery"]),
+        ("gallery", ["gallery"]),
+        ("post has:basic", ["blog"]),
+        ("", ["blog", "contact", "gallery"]),
+    ],
+)
+def test_queries(manager, text, expected):
+    assert manager.query(text) == expected
+
+
+def test_results_follow_edits(manager):
+    manager.add_variable("contact", VariableType.IMAGE, Variable("logo"))
+    assert manager.query("has:image") == ["contact", "gallery"]
+    manager.rename_schema("contact", "about")
+    assert manager.query("has:image -filter_with:yes") == ["about"]
+    manager.delete_schema("about")
+    assert manager.query("has:image") == ["gallery"]
+
+
+@pytest.mark.parametrize(
+    "text", ["has:widget", "colour:red", "missing:fr", "filter_with:", "-word", '"open']
+)
+def test_syntax_errors(manager, text):
+    with pytest.raises(QuerySyntaxError):
+        manager.query(text)
@@ -0,0 +1,146 @@
+import pytest
+from assets.events import ChangeKind
+from assets.models import Schema, Variable, VariableType
+from assets.schema_manager import BatchError, SchemaManager
+
+
+@pytest.fixture
+def manager() -> SchemaManager:
+    manager = SchemaManager()
+    manager.add_schema(Schema("home", basic_variables=[Variable("title"), Variable("body")]))
+    manager.add_schema(Schema("about", basic_variables=[Variable("title")]))
+    return manager
+
+
+def record_events(manager):
+    batches = []
+    manager.subscribe(batches.append)
+    return batches
+
+
+def test_scheduler_defers_and_coalesces(manager):
+    scheduled = []
+    manager.set_scheduler(scheduled.append)
+    batches = record_events(manager)
+    var = manager.schemas["home"].basic_variables[0]
+    for text in ("a", "b", "c"):
+        manager.update_variable("home", VariableType.BASIC, 0, Variable(var.name, text))
+
+    assert batches == [] and len(scheduled) == 1
+    scheduled.pop()()
+    assert [(event.kind, event.variable.en_text) for event in batches[0]] == [
+        (ChangeKind.VARIABLE_UPDATED, "c")
+    ]
+
+
+def test_reset_absorbs_the_rest_of_the_tick(manager):
+    scheduled = []
+    manager.set_scheduler(scheduled.append)
+    batches = record_events(manager)
+    manager.import_schemas({"a": {}})
+    manager.add_schema(Schema("b"))
+
+    scheduled.pop()()
+    assert [event.kind for event in batches[0]] == [ChangeKind.RESET]
+
+
+def test_import_replaces_workspace(manager):
+    batches = record_events(manager)
+    data = {
+        "a": {"basic_variables": [{"x": {"en": "X"}}], "url_variables": [{"u": {}}]},
+        "b": {"page_title_en": "B"},
+    }
+
+    manager.import_schemas(data)
+    assert list(manager.schemas) == ["a", "b"]
+    assert [event.kind for event in batches[0]] == [ChangeKind.RESET]
+    assert manager.export_schemas(["b"]) == {"b": Schema("b", page_title_en="B").to_dict()}
+
+
+def test_batch_notifies_once(manager):
+    batches = record_events(manager)
+    with manager.batch() as batch:
+        batch.add_schema(Schema("news"))
+        batch.rename_schema("about", "team")
+        batch.remove_variable("home", VariableType.BASIC, 1)
+
+    assert len(batches) == 1
+    assert [event.kind for event in batches[0]] == [
+        ChangeKind.SCHEMA_ADDED,
+        ChangeKind.SCHEMA_RENAMED,
+        ChangeKind.VARIABLE_REMOVED,
+    ]
+    assert list(manager.schemas) == ["home", "news", "team"]
+
+
+def test_invalid_batch_changes_nothing(manager):
+    batches = record_events(manager)
+    with pytest.raises(BatchError) as raised:
+        with manager.batch() as batch:
+            batch.delete_schema("home")
+            batch.remove_variable("home", VariableType.BASIC, 0)
+            batch.rename_schema("about", "")
+
+    assert raised.value.errors == [
+        "#2: schema 'home' does not exist",
+        "#3: schema name is required",
+    ]
+    assert list(manager.schemas) == ["home", "about"]
+    assert len(manager.schemas["home"].basic_variables) == 2
+    assert batches == []
+
+
+def test_nested_batch_waits_for_the_outer_one(manager):
+    with pytest.raises(BatchError):
+        with manager.batch() as outer:
+            with manager.batch() as inner:
+                inner.add_schema(Schema("news"))
+            assert "news" not in manager.schemas
+            outer.delete_schema("missing")
+
+    assert list(manager.schemas) == ["home", "about"]
+
+
+def test_failed_apply_rolls_back(manager, monkeypatch):
+    batches = record_events(manager)
+    home = manager.schemas["home"]
+
+    def broken(name):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(manager, "delete_schema", broken)
+    with pytest.raises(RuntimeError):
+        with manager.batch() as batch:
+            batch.rename_schema("home", "start")
+            batch.remove_variable("start", VariableType.BASIC, 0)
+            batch.add_schema(Schema("news"))
+            batch.delete_schema("about")
+
+    assert list(manager.schemas) == ["home", "about"] and manager.schemas["home"] is home
+    assert [v.name for v in home.basic_variables] == ["title", "body"]
+    assert sorted(manager.find_usages("body")) == [("home", VariableType.BASIC)]
+    assert batches == []
+
+
+def test_find_usages_follow_edits(manager):
+    assert sorted(manager.find_usages("title")) == [
+        ("about", VariableType.BASIC),
+        ("home", VariableType.BASIC),
+    ]
+    manager.delete_schema("about")
+    manager.add_variable("home", VariableType.URL, Variable("link"))
+    assert manager.find_usages("title") == [("home", VariableType.BASIC)]
+    assert manager.find_usages("link") == [("home", VariableType.URL)]
+
+
+def test_rename_variable_everywhere(manager):
+    assert manager.rename_variable("title", "heading") == 2
+    assert sorted(schema for schema, _ in manager.find_usages("heading")) == ["about", "home"]
+    assert manager.find_usages("title") == []
+
+
+def test_variable_count_follows_edits(manager):
+    assert manager.variable_count() == 3
+    manager.add_variable("about", VariableType.IMAGE, Variable("cover"))
+    manager.delete_schema("home")
+    assert manager.variable_count() == 2
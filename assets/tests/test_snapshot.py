@@ -0,0 +1,90 @@
+import pytest
+from assets.linter import WorkspaceLinter
+from assets.models import Schema, Variable, VariableType
+from assets.schema_manager import SchemaManager
+from assets.snapshot import load_snapshot, write_snapshot
+
+
+def make_schemas():
+    return {
+        "home": Schema(
+            "home",
+            page_title_cn="首页",
+            page_title_en="Home",
+            match_img="yes",
+            basic_variables=[Variable("title", "Title", "标题", 1)],
+            image_variables=[Variable("hero", "Hero")],
+        ),
+        "about": Schema("about", page_title_en="About", more_variables=[Variable("bio", rows=4)]),
+        "empty": Schema("empty"),
+    }
+
+
+def test_round_trip_preserves_order_and_content(tmp_path):
+    schemas = make_schemas()
+    path = str(tmp_path / "workspace.snapshot")
+    write_snapshot(schemas, path)
+
+    loaded = load_snapshot(path)
+    assert list(loaded) == list(schemas)
+    assert loaded.pending == 3
+    assert loaded.variable_count() == 3
+    assert loaded["home"] == schemas["home"]
+    assert loaded.pending == 2
+    assert dict(loaded.items()) == schemas
+    assert loaded.pending == 0
+
+
+def test_edits_replace_pending_entries(tmp_path):
+    path = str(tmp_path / "workspace.snapshot")
+    write_snapshot(make_schemas(), path)
+    loaded = load_snapshot(path)
+
+    loaded["about"] = Schema("about", basic_variables=[Variable("a"), Variable("b")])
+    del loaded["empty"]
+
+    assert loaded.pending == 1
+    assert loaded.variable_count() == 4
+    loaded.decode_all()
+    assert loaded.pending == 0
+    assert loaded["home"].basic_variables[0].cn_text == "标题"
+
+
+def test_save_over_the_loaded_snapshot(tmp_path):
+    path = str(tmp_path / "workspace.snapshot")
+    write_snapshot(make_schemas(), path)
+    manager = SchemaManager()
+    manager.load_snapshot(path)
+    manager.add_schema(Schema("new", url_variables=[Variable("link")]))
+
+    manager.save_snapshot(path)
+
+    assert manager.schemas.pending == 0
+    reloaded = load_snapshot(path)
+    assert list(reloaded) == ["home", "about", "empty", "new"]
+    assert reloaded["new"].url_variables == [Variable("link")]
+
+
+def test_rejects_values_the_format_cannot_hold(tmp_path):
+    path = tmp_path / "workspace.snapshot"
+    schema = Schema("bad", basic_variables=[Variable("x", rows=2**40)])
+    with pytest.raises(ValueError):
+        write_snapshot({"bad": schema}, str(path))
+    assert not path.exists()
+
+
+def test_linter_leaves_untouched_entries_undecoded(tmp_path):
+    path = str(tmp_path / "workspace.snapshot")
+    write_snapshot(make_schemas(), path)
+    manager = SchemaManager()
+    linter = WorkspaceLinter(manager)
+    manager.load_snapshot(path)
+    manager.add_variable("about", VariableType.BASIC, Variable(""))
+
+    linter.run(unchecked=False)
+    assert manager.schemas.pending == 2
+    assert {issue.schema_name for issue in linter.issues()} == {"about"}
+    assert linter.unchecked == 2
+
+    linter.run(limit=1)
+    assert manager.schemas.pending == 1
@@ -0,0 +1,91 @@
+import json
+from assets.generator import RecordGenerator
+from assets.models import Schema, Variable
+from assets.validator import RecordValidator
+
+
+def make_schema() -> Schema:
+    return Schema(
+        "page",
+        basic_variables=[Variable("title")],
+        more_variables=[Variable("note")],
+        image_variables=[Variable("cover")],
+        url_variables=[Variable("link")],
+        array_variables=[Variable("tags")],
+        language_item_variables=[Variable("caption")],
+    )
+
+
+VALID = {
+    "title": "Title",
+    "cover": "/images/cover.jpg",
+    "link": "https://example.com/a",
+    "tags": ["a"],
+    "caption": {"en": "Hello", "cn": "你好"},
+}
+
+
+def keys(errors):
+    return sorted((error.key, error.message) for error in errors)
+
+
+def test_valid_record_has_no_errors():
+    assert RecordValidator(make_schema()).validate(VALID) == []
+
+
+def test_errors_per_variable_type():
+    record = {
+        "title": {"nested": True},
+        "note": [],
+        "cover": "",
+        "link": "not a url",
+        "tags": "a",
+        "caption": {"en": "Hello"},
+    }
+    assert keys(RecordValidator(make_schema()).validate(record)) == [
+        ("caption", "expected an {en, cn} object"),
+        ("cover", "expected an image path"),
+        ("link", "expected a URL"),
+        ("note", "expected a scalar value"),
+        ("tags", "expected an array"),
+        ("title", "expected a scalar value"),
+    ]
+
+
+def test_missing_and_unknown_keys():
+    record = dict(VALID, extra=1)
+    del record["title"]
+
+    assert keys(RecordValidator(make_schema()).validate(record)) == [
+        ("title", "missing required key")
+    ]
+    assert keys(RecordValidator(make_schema(), strict=True).validate(record)) == [
+        ("extra", "unknown key"),
+        ("title", "missing required key"),
+    ]
+    assert [e.key for e in RecordValidator(make_schema()).validate([1])] == [None]
+
+
+def test_file_line_numbers_across_chunks(tmp_path):
+    path = tmp_path / "records.ndjson"
+    lines = [json.dumps(VALID)] * 50
+    lines[9] = "{broken"
+    lines[30] = json.dumps(dict(VALID, tags=None))
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    validator = RecordValidator(make_schema())
+    validator.chunk_bytes = 256
+
+    errors = validator.validate_file(str(path), workers=1)
+
+    assert [(error.line, error.key) for error in errors] == [(10, None), (31, "tags")]
+    assert validator.stats.records == 50
+    assert validator.stats.invalid_records == 2
+    assert len(validator.validate_file(str(path), workers=1, max_errors=1)) == 1
+
+
+def test_generated_records_validate(tmp_path):
+    schema = make_schema()
+    path = tmp_path / "records.ndjson"
+    RecordGenerator(schema, seed=2).write_ndjson(str(path), 200, workers=1)
+
+    assert RecordValidator(schema, strict=True).validate_file(str(path), workers=1) == []
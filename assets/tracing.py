@@ -0,0 +1,241 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import nullcontext
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Set to a file path to record a trace from startup and write it on exit
+TRACE_ENV = "SCHEMADESIGNER_TRACE"
+
+# name, category, start, duration (seconds, perf_counter), thread id, args
+TraceEvent = Tuple[str, str, float, float, int, Optional[Dict[str, Any]]]
+
+
+class Tracer:
+    """Records timed spans in memory and writes them as Chrome trace JSON
+
+    The output loads in chrome://tracing, Perfetto and speedscope. Events
+    are kept as tuples and only converted to trace-event dicts on save.
+    """
+
+    max_events = 1_000_000
+
+    def __init__(self):
+        self.events: List[TraceEvent] = []
+        self.dropped = 0
+        self.started = time.perf_counter()
+        self._threads: Dict[int, str] = {}
+
+    def complete(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        args: Optional[Dict[str, Any]] = None,
+    ):
+        """Record a span that ran from start to end"""
+        if len(self.events) >= self.max_events:
+            self.dropped += 1
+            return
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        self.events.append((name, category, start, end - start, tid, args))
+
+    def instant(self, name: str, category: str = "app", **args):
+        """Record a point in time, such as a user action"""
+        now = time.perf_counter()
+        self.complete(name, category, now, now, args or None)
+
+    def to_json(self) -> Dict[str, Any]:
+        """The trace as a Chrome trace-event document"""
+        pid = os.getpid()
+        origin = self.started
+        trace: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "Schema Designer"}}
+        ]
+        trace += [
+            {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+            for tid, name in self._threads.items()
+        ]
+        for name, category, start, duration, tid, args in self.events:
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": "X" if duration else "i",
+                "ts": round((start - origin) * 1e6, 3),
+                "pid": pid,
+                "tid": tid,
+            }
+            if duration:
+                event["dur"] = round(duration * 1e6, 3)
+            else:
+                event["s"] = "t"
+            if args:
+                event["args"] = args
+            trace.append(event)
+        return {
+            "traceEvents": trace,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": self.dropped},
+        }
+
+    def save(self, path: str):
+        """Write the trace atomically"""
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_json(), f, default=str)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        logger.info(f"Wrote {len(self.events)} trace events to {path}")
+
+
+class _Fanout:
+    """Passes each span to several sinks"""
+
+    def __init__(self, sinks: List):
+        self.sinks = sinks
+
+    def complete(self, *event):
+        for sink in self.sinks:
+            sink.complete(*event)
+
+
+_tracer: Optional[Tracer] = None
+# Anything with Tracer.complete's signature, such as the performance HUD
+_observers: List = []
+# Where spans go: None when nothing listens, so instrumented code returns early
+_sink = None
+
+
+def _update_sink():
+    global _sink
+    sinks = ([_tracer] if _tracer is not None else []) + _observers
+    _sink = None if not sinks else sinks[0] if len(sinks) == 1 else _Fanout(sinks)
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+def start() -> Tracer:
+    """Begin recording; returns the active tracer"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+        _update_sink()
+    return _tracer
+
+
+def stop() -> Optional[Tracer]:
+    """Stop recording and return what was recorded"""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    _update_sink()
+    return tracer
+
+
+def add_observer(observer):
+    """Also pass every span to observer.complete(name, category, start, end, args)"""
+    if observer not in _observers:
+        _observers.append(observer)
+        _update_sink()
+
+
+def remove_observer(observer):
+    if observer in _observers:
+        _observers.remove(observer)
+        _update_sink()
+
+
+def start_from_environment() -> Optional[str]:
+    """Start recording if TRACE_ENV names an output file; it is written at exit"""
+    path = os.environ.get(TRACE_ENV)
+    if not path:
+        return None
+    start()
+
+    def save():
+        tracer = stop()
+        if tracer is not None:
+            try:
+                tracer.save(path)
+            except OSError as e:
+                logger.error(f"Could not write trace to {path}: {e}")
+
+    atexit.register(save)
+    return path
+
+
+def record(name: str, category: str, start: float, end: float, **args):
+    """Report a span measured elsewhere, such as an event-loop stall"""
+    sink = _sink
+    if sink is not None:
+        sink.complete(name, category, start, end, args or None)
+
+
+class _Span:
+    __slots__ = ("sink", "name", "category", "args", "start")
+
+    def __init__(self, sink, name: str, category: str, args: Dict[str, Any]):
+        self.sink = sink
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.sink.complete(
+            self.name, self.category, self.start, time.perf_counter(), self.args or None
+        )
+
+
+_NO_SPAN = nullcontext()
+
+
+def span(name: str, category: str = "app", **args):
+    """Context manager recording a span; costs one global lookup when off"""
+    sink = _sink
+    if sink is None:
+        return _NO_SPAN
+    return _Span(sink, name, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = "app") -> Callable:
+    """Decorator recording every call of a function as a span
+
+    Only for functions called directly or from signals without arguments:
+    PyQt drops surplus signal arguments only for callables it can inspect,
+    so other slots use span() in their body instead.
+    """
+
+    def decorate(func: Callable) -> Callable:
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            sink = _sink
+            if sink is None:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sink.complete(label, category, started, time.perf_counter())
+
+        return wrapper
+
+    return decorate
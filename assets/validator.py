@@ -0,0 +1,258 @@
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+from json.decoder import JSONDecoder
+from .models import Schema, VariableType
+
+logger = logging.getLogger(__name__)
+
+URL_PATTERN = re.compile(r"^(?:https?://[^\s/?#]+|/)[^\s]*$")
+
+_MISSING = object()
+_scan_once = JSONDecoder().scan_once
+_SCALARS = frozenset((str, int, float, bool))
+
+# Expected value shape per variable type: (required, condition on v, message)
+_RULES = {
+    VariableType.BASIC: (True, "type(v) not in _SCALARS", "expected a scalar value"),
+    VariableType.MORE: (
+        False,
+        "v is not None and type(v) not in _SCALARS",
+        "expected a scalar value",
+    ),
+    VariableType.IMAGE: (True, "type(v) is not str or not v", "expected an image path"),
+    VariableType.URL: (True, "type(v) is not str or not _url(v)", "expected a URL"),
+    VariableType.ARRAY: (True, "type(v) is not list", "expected an array"),
+    VariableType.LANGUAGE: (
+        True,
+        "type(v) is not dict or type(v.get('en')) is not str"
+        " or type(v.get('cn')) is not str",
+        "expected an {en, cn} object",
+    ),
+}
+
+
+class RecordError(NamedTuple):
+    """A problem with one record; line is 1-based, key is None for the whole record"""
+
+    line: int
+    key: Optional[str]
+    message: str
+
+
+RecordCheck = Callable[[object], List[Tuple[Optional[str], str]]]
+
+
+def compile_schema(schema: Schema, strict: bool = False) -> RecordCheck:
+    """Generate a check function specialized to one schema
+
+    The function takes a decoded record and returns a list of (key, message)
+    pairs, empty when the record is valid. Unrolling the variables into
+    straight-line code avoids per-record loops over the schema.
+    """
+    lines = [
+        "def check(record):",
+        "    if type(record) is not dict:",
+        "        return [(None, 'record is not a JSON object')]",
+        "    errors = []",
+        "    get = record.get",
+    ]
+    known: List[str] = []
+    seen = set()
+    for var_type in VariableType:
+        required, condition, message = _RULES[var_type]
+        for var in getattr(schema, var_type.value):
+            # A duplicated name is reported by the linter; check the first one
+            if var.name in seen:
+                continue
+            seen.add(var.name)
+            known.append(var.name)
+            key = repr(var.name)
+            lines.append(f"    v = get({key}, _MISSING)")
+            if required:
+                lines.append("    if v is _MISSING:")
+                lines.append(f"        errors.append(({key}, 'missing required key'))")
+                lines.append(f"    elif {condition}:")
+            else:
+                lines.append(f"    if v is not _MISSING and ({condition}):")
+            lines.append(f"        errors.append(({key}, {message!r}))")
+
+    if strict:
+        lines.append(f"    if len(record) > {len(known)} or not _known.issuperset(record):")
+        lines.append("        for k in record:")
+        lines.append("            if k not in _known:")
+        lines.append("                errors.append((k, 'unknown key'))")
+    lines.append("    return errors")
+
+    namespace = {
+        "_MISSING": _MISSING,
+        "_SCALARS": _SCALARS,
+        "_url": URL_PATTERN.match,
+        "_known": frozenset(seen),
+    }
+    exec(compile("\n".join(lines), f"<validator {schema.name}>", "exec"), namespace)
+    return namespace["check"]
+
+
+@dataclass
+class ValidationStats:
+    """Running totals for a file validation"""
+
+    records: int = 0
+    invalid_records: int = 0
+    errors: int = 0
+    bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def records_per_second(self) -> float:
+        return self.records / self.elapsed if self.elapsed else 0.0
+
+
+ChunkResult = Tuple[int, int, int, List[RecordError]]
+
+_worker_check: Optional[RecordCheck] = None
+
+
+def _init_worker(schema: Schema, strict: bool):
+    """Compile the schema once per worker process"""
+    global _worker_check
+    _worker_check = compile_schema(schema, strict)
+
+
+def _validate_lines(check: RecordCheck, data: bytes) -> ChunkResult:
+    """Validate a block of NDJSON; line numbers are relative to the block"""
+    loads = json.loads
+    scan = _scan_once
+    records = invalid = 0
+    errors: List[RecordError] = []
+    lines = data.decode("utf-8", errors="replace").split("\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    for line_no, line in enumerate(lines, 1):
+        if not line or line.isspace():
+            continue
+        records += 1
+        # The C scanner skips loads()'s per-call setup; anything unusual
+        # (surrounding whitespace, bad JSON) goes through loads() instead
+        try:
+            record, end = scan(line, 0)
+            if end != len(line):
+                raise ValueError
+        except (StopIteration, ValueError):
+            try:
+                record = loads(line)
+            except ValueError as e:
+                invalid += 1
+                errors.append(RecordError(line_no, None, f"invalid JSON: {e}"))
+                continue
+        problems = check(record)
+        if problems:
+            invalid += 1
+            errors.extend(RecordError(line_no, key, message) for key, message in problems)
+    return len(lines), records, invalid, errors
+
+
+def _validate_chunk(job: Tuple[str, int, int]) -> ChunkResult:
+    """Worker entry point: validate one byte range of a file"""
+    path, start, end = job
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return _validate_lines(_worker_check, data)
+
+
+class RecordValidator:
+    """Validates content records against a schema"""
+
+    chunk_bytes = 4 * 1024 * 1024
+
+    def __init__(self, schema: Schema, strict: bool = False):
+        self.schema = schema
+        self.strict = strict
+        self.check = compile_schema(schema, strict)
+        self.stats = ValidationStats()
+
+    def validate(self, record) -> List[RecordError]:
+        """Validate a single decoded record"""
+        return [RecordError(0, key, message) for key, message in self.check(record)]
+
+    def _chunks(self, path: str) -> List[Tuple[str, int, int]]:
+        """Split a file into byte ranges that end on line boundaries"""
+        size = os.path.getsize(path)
+        jobs = []
+        with open(path, "rb") as f:
+            start = 0
+            while start < size:
+                f.seek(min(start + self.chunk_bytes, size))
+                f.readline()
+                end = min(f.tell(), size)
+                jobs.append((path, start, end))
+                start = end
+        return jobs
+
+    def iter_file(
+        self,
+        path: str,
+        workers: Optional[int] = None,
+        max_errors: Optional[int] = None,
+        mp_context: Optional[str] = None,
+        progress: Optional[Callable[[ValidationStats], bool]] = None,
+    ) -> Iterator[RecordError]:
+        """Validate an NDJSON file, yielding errors in file order as chunks finish
+
+        Chunks are spread over a process pool when there is more than one
+        chunk and more than one worker. self.stats is updated as results
+        stream in and passed to progress after each chunk; returning False
+        from progress, or closing the iterator early, stops the pool.
+        """
+        self.stats = stats = ValidationStats()
+        started = time.perf_counter()
+        jobs = self._chunks(path)
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+        if workers > 1:
+            import multiprocessing
+
+            context = multiprocessing.get_context(mp_context)
+            pool = context.Pool(workers, _init_worker, (self.schema, self.strict))
+            results = pool.imap(_validate_chunk, jobs)
+        else:
+            pool = None
+            _init_worker(self.schema, self.strict)
+            results = map(_validate_chunk, jobs)
+
+        line_offset = 0
+        try:
+            for (_, start, end), (line_count, records, invalid, errors) in zip(
+                jobs, results
+            ):
+                stats.records += records
+                stats.invalid_records += invalid
+                stats.bytes += end - start
+                stats.elapsed = time.perf_counter() - started
+                for error in errors:
+                    stats.errors += 1
+                    yield error._replace(line=error.line + line_offset)
+                    if max_errors is not None and stats.errors >= max_errors:
+                        return
+                line_offset += line_count
+                if progress is not None and progress(stats) is False:
+                    return
+        finally:
+            stats.elapsed = time.perf_counter() - started
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+            logger.info(
+                f"Validated {stats.records} records from {path} in "
+                f"{stats.elapsed:.2f}s ({stats.invalid_records} invalid)"
+            )
+
+    def validate_file(self, path: str, **kwargs) -> List[RecordError]:
+        """Validate an NDJSON file and collect every error"""
+        return list(self.iter_file(path, **kwargs))
@@ -0,0 +1,128 @@
+import inspect
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from types import CodeType
+from typing import Deque, Dict, Optional, Tuple
+from PyQt5.QtCore import *
+from . import tracing
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Stall:
+    """A period in which the event loop did not run"""
+
+    duration: float  # seconds
+    handler: str  # outermost watched method on the stack, "" if none
+    stack: str  # GUI thread stack sampled during the stall
+
+
+class StallWatchdog(QObject):
+    """Detects event-loop stalls and reports the Python code behind them
+
+    A precise timer beats on the GUI thread. A background thread samples the
+    GUI thread's stack once a beat is threshold_ms overdue and logs it, so
+    even a stall that never ends is diagnosed. When the loop runs again the
+    stall is logged with its length and emitted as stalled(Stall).
+    """
+
+    stalled = pyqtSignal(object)
+
+    heartbeat_ms = 50
+    history = 20
+
+    def __init__(self, threshold_ms: int = 200, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.stalls: Deque[Stall] = deque(maxlen=self.history)
+        self.count = 0
+        self._handlers: Dict[CodeType, str] = {}
+        self._gui_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._sample: Optional[Tuple[float, str, str]] = None  # (beat, handler, stack)
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(self.heartbeat_ms)
+        self._timer.timeout.connect(self._beat)
+
+    def watch(self, cls: type):
+        """Name stalls after the methods of cls they happened in"""
+        for name, member in vars(cls).items():
+            code = getattr(inspect.unwrap(member), "__code__", None) if callable(member) else None
+            if code is not None:
+                self._handlers[code] = f"{cls.__name__}.{name}"
+
+    def start(self):
+        """Begin watching; call from the GUI thread"""
+        if self._thread is not None:
+            return
+        self._gui_thread = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._watch, name="StallWatchdog", daemon=True)
+        self._thread.start()
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+
+    def _beat(self):
+        """Runs on the GUI thread; a late beat ends a stall"""
+        now = time.perf_counter()
+        beat, self._last_beat = self._last_beat, now
+        late = now - beat - self.heartbeat_ms / 1000
+        if late < self.threshold:
+            return
+
+        sample = self._sample
+        handler, stack = sample[1:] if sample is not None and sample[0] == beat else ("", "")
+        stall = Stall(late, handler, stack)
+        self.stalls.append(stall)
+        self.count += 1
+        where = f" in {handler}" if handler else ""
+        logger.warning(f"Event loop stalled for {late * 1000:.0f} ms{where}")
+        tracing.record("event loop stall", "stall", now - late, now, handler=handler)
+        self.stalled.emit(stall)
+
+    def _watch(self):
+        """Runs on the watchdog thread; samples the GUI thread once per stall"""
+        overdue = self.threshold + self.heartbeat_ms / 1000
+        while not self._stopping.wait(self.threshold / 2):
+            beat = self._last_beat
+            if time.perf_counter() - beat < overdue:
+                continue
+            if self._sample is not None and self._sample[0] == beat:
+                continue
+            frame = sys._current_frames().get(self._gui_thread)
+            if frame is None:
+                continue
+            handler, stack = self._describe(frame)
+            self._sample = (beat, handler, stack)
+            where = f" in {handler}" if handler else ""
+            logger.warning(
+                f"Event loop blocked for over {self.threshold * 1000:.0f} ms{where}; "
+                f"GUI thread stack:\n{stack}"
+            )
+
+    def _describe(self, frame) -> Tuple[str, str]:
+        """The outermost watched handler on a stack, and the formatted stack"""
+        handler = ""
+        current = frame
+        while current is not None:
+            # Walking outwards, so the last match is the outermost handler
+            handler = self._handlers.get(current.f_code, handler)
+            current = current.f_back
+        return handler, "".join(traceback.format_stack(frame))
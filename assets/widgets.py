@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import *
 from PyQt5.QtGui import *
 from PyQt5.QtCore import *
+from .linter import SEVERITY_ORDER
 
 
 class AnimatedButton(QPushButton):
@@ -50,3 +51,91 @@ class FadeInWidget(QWidget):
     def showEvent(self, event):
         super().showEvent(event)
         self.fade_animation.start()
+
+
+class LazyTabPage(QWidget):
+    """Tab page whose contents are built the first time it is needed"""
+
+    def __init__(self, builder, parent=None):
+        super().__init__(parent)
+        self._builder = builder
+        self.built = False
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+    def build(self) -> bool:
+        """Create the contents if needed; True if this call created them"""
+        if self.built:
+            return False
+        self.built = True
+        self.layout().addWidget(self._builder())
+        self._builder = None
+        return True
+
+
+class ProblemsModel(QAbstractTableModel):
+    """Table model for lint issues with Python-side sorting"""
+
+    HEADERS = ["Severity", "Schema", "Variable", "Rule", "Message"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._issues = []
+        self._sort_column = 0
+        self._sort_order = Qt.AscendingOrder
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._issues)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def _values(self, issue):
+        return (
+            issue.severity,
+            issue.schema_name,
+            issue.var_name,
+            issue.code,
+            issue.message,
+        )
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        issue = self._issues[index.row()]
+        if role == Qt.DisplayRole:
+            return self._values(issue)[index.column()]
+        if role == Qt.ForegroundRole and index.column() == 0:
+            return QColor("#DC2626" if issue.severity == "error" else "#D97706")
+        if role == Qt.UserRole:
+            return issue
+        return None
+
+    def _sort_key(self, column):
+        if column == 0:
+            return lambda issue: (SEVERITY_ORDER.get(issue.severity, 9), issue.schema_name)
+        return lambda issue: self._values(issue)[column]
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Sort in Python; a proxy model would call data() per comparison"""
+        self._sort_column, self._sort_order = column, order
+        self.layoutAboutToBeChanged.emit()
+        self._issues.sort(
+            key=self._sort_key(column), reverse=order == Qt.DescendingOrder
+        )
+        self.layoutChanged.emit()
+
+    def set_issues(self, issues):
+        """Replace all issues, keeping the current sort"""
+        self.beginResetModel()
+        self._issues = list(issues)
+        self._issues.sort(
+            key=self._sort_key(self._sort_column),
+            reverse=self._sort_order == Qt.DescendingOrder,
+        )
+        self.endResetModel()
@@ -0,0 +1,67 @@
+"""Compare the specialized schema encoder with json.dumps(schema.to_dict())
+
+Run from the repository root:
+
+    python benchmarks/bench_encoder.py [--schemas N] [--repeat R]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assets.encoder import encode_schema  # noqa: E402
+from synthetic import synthetic_schemas  # noqa: E402
+
+
+def best_of(repeat: int, function, schemas) -> float:
+    """Fastest of several runs, in seconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for schema in schemas:
+            function(schema)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--schemas", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    schemas = synthetic_schemas(args.schemas)
+    cases = [
+        (
+            "minified",
+            lambda s: json.dumps(s.to_dict(), ensure_ascii=False, separators=(",", ":")),
+            lambda s: encode_schema(s),
+        ),
+        (
+            "indent=2",
+            lambda s: json.dumps(s.to_dict(), ensure_ascii=False, indent=2),
+            lambda s: encode_schema(s, indent=2),
+        ),
+    ]
+
+    print(f"{len(schemas)} schemas, best of {args.repeat}")
+    for label, baseline, specialized in cases:
+        for schema in schemas:
+            if baseline(schema) != specialized(schema):
+                print(f"{label}: output differs for {schema.name}")
+                return 1
+        before = best_of(args.repeat, baseline, schemas)
+        after = best_of(args.repeat, specialized, schemas)
+        print(
+            f"{label:>9}: json.dumps {before * 1000:8.1f} ms   "
+            f"encode_schema {after * 1000:8.1f} ms   {before / after:5.2f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""Time the core workspace operations on synthetic workspaces
+
+Run from the repository root; Qt uses the offscreen platform, so no
+display is needed:
+
+    python benchmarks/bench_suite.py [--sizes 1000 10000 100000] [--repeat 3]
+        [--only NAME ...] [--output results.json] [--compare baseline.json]
+
+Results are written as JSON so runs can be compared with --compare.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PyQt5.QtCore import PYQT_VERSION_STR, QT_VERSION_STR, QEvent  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+from assets.schema_manager import SchemaManager  # noqa: E402
+from templates.registry import template_registry  # noqa: E402
+from synthetic import synthetic_workspace  # noqa: E402
+
+DUPLICATES = 1000
+TEMPLATE_INSTANCES = 1000
+
+
+class Suite:
+    """Runs benchmarks and collects one result per (benchmark, size)"""
+
+    def __init__(self, repeat: int, only: Optional[List[str]] = None):
+        self.repeat = repeat
+        self.only = set(only or ())
+        self.results: List[Dict[str, Any]] = []
+
+    def wanted(self, name: str) -> bool:
+        return not self.only or name in self.only
+
+    def time(
+        self,
+        name: str,
+        size: Optional[int],
+        items: int,
+        run: Callable[[], Any],
+        setup: Optional[Callable[[], Any]] = None,
+        teardown: Optional[Callable[[], Any]] = None,
+    ):
+        """Best and median of repeat runs; setup and teardown are not timed"""
+        if not self.wanted(name):
+            return
+        runs = []
+        for _ in range(self.repeat):
+            if setup is not None:
+                setup()
+            started = time.perf_counter()
+            run()
+            runs.append(time.perf_counter() - started)
+            if teardown is not None:
+                teardown()
+        best = min(runs)
+        self.results.append(
+            {
+                "name": name,
+                "size": size,
+                "items": items,
+                "best": best,
+                "median": statistics.median(runs),
+                "runs": runs,
+            }
+        )
+        label = "-" if size is None else f"{size:,}"
+        print(
+            f"{name:<28}{label:>9}{best * 1000:12.1f} ms{best / items * 1e6:10.2f} us/item",
+            flush=True,
+        )
+
+
+def bench_manager(suite: Suite, size: int, data: Dict[str, Any]):
+    """Model and serialization benchmarks"""
+    manager = SchemaManager()
+    fresh: List[SchemaManager] = []
+    suite.time(
+        "import_schemas",
+        size,
+        size,
+        lambda: fresh[-1].import_schemas(data),
+        setup=lambda: fresh.append(SchemaManager()),
+        teardown=fresh.clear,
+    )
+    manager.import_schemas(data)
+    schemas = list(manager.schemas.values())
+
+    suite.time("export_schemas", size, size, manager.export_schemas)
+    suite.time("to_dict", size, size, lambda: [schema.to_dict() for schema in schemas])
+
+    originals = list(manager.schemas)[: min(DUPLICATES, size)]
+
+    def duplicate():
+        for name in originals:
+            manager.duplicate_schema(name, f"{name}_copy")
+
+    def remove_copies():
+        with manager.batch() as batch:
+            for name in originals:
+                batch.delete_schema(f"{name}_copy")
+
+    suite.time("duplicate_schema", size, len(originals), duplicate, teardown=remove_copies)
+
+    def preview(cache: bool) -> str:
+        member = manager.indented_member
+        return "{\n" + ",\n".join(member(name, cache) for name in manager.schemas) + "\n}"
+
+    suite.time("preview_serialization_cold", size, size, lambda: preview(False))
+    preview(True)
+    suite.time("preview_serialization_warm", size, size, lambda: preview(True))
+
+
+def bench_window(suite: Suite, size: int, data: Dict[str, Any], backup_dir: str):
+    """List and preview refreshes of a real MainWindow, offscreen"""
+    if not (suite.wanted("list_population") or suite.wanted("preview_update")):
+        return
+    from assets.main_window import MainWindow
+
+    # Keep backups and the session snapshot out of the working directory
+    MainWindow.backup_dir = backup_dir
+    window = MainWindow()
+    window.stall_watchdog.stop()
+    window.schema_manager.import_schemas(data)
+    window.schema_manager.flush_events()
+
+    suite.time("list_population", size, size, window._update_schema_list)
+    window.current_schema = window.schema_manager.get_schema(next(iter(data)))
+    suite.time("preview_update", size, 1, window._update_preview)
+
+    window._workspace_dirty = False
+    window.deleteLater()
+    QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+def bench_templates(suite: Suite):
+    """Template instantiation, independent of workspace size"""
+    template_ids = template_registry.list_templates()
+
+    def instantiate():
+        for i in range(TEMPLATE_INSTANCES):
+            template_id = template_ids[i % len(template_ids)]
+            template_registry.create_template(template_id).to_schema(f"{template_id}_{i}")
+
+    suite.time("template_instantiation", None, TEMPLATE_INSTANCES, instantiate)
+
+
+def environment() -> Dict[str, Any]:
+    """What the results were measured on"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+    }
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str):
+    """Print best times against a previous run"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {
+            (result["name"], result["size"]): result["best"]
+            for result in json.load(f)["results"]
+        }
+    print(f"\nCompared with {baseline_path} (ratio < 1 is faster):")
+    for result in results:
+        before = baseline.get((result["name"], result["size"]))
+        if before:
+            label = "-" if result["size"] is None else f"{result['size']:,}"
+            print(
+                f"{result['name']:<28}{label:>9}{before * 1000:12.1f} ms ->"
+                f"{result['best'] * 1000:10.1f} ms{result['best'] / before:8.2f}x"
+            )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", nargs="+", help="benchmark names to run")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--compare", help="results JSON of an earlier run")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    app = QApplication.instance() or QApplication(sys.argv[:1])  # noqa: F841
+    suite = Suite(args.repeat, args.only)
+    print(f"{'benchmark':<28}{'schemas':>9}{'best':>15}{'per item':>17}")
+
+    bench_templates(suite)
+    with tempfile.TemporaryDirectory() as backup_dir:
+        for size in args.sizes:
+            data = synthetic_workspace(size, args.seed)
+            bench_manager(suite, size, data)
+            bench_window(suite, size, data, backup_dir)
+            del data
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(
+                {"environment": environment(), "settings": vars(args), "results": suite.results},
+                f,
+                indent=2,
+            )
+        print(f"\nWrote {len(suite.results)} results to {args.output}")
+    if args.compare:
+        compare(suite.results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
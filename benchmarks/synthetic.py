@@ -0,0 +1,76 @@
+"""Synthetic workspaces for benchmarks
+
+Every schema is a variation on one of the registered templates: some of
+its variables are dropped, some repeated under new names, and labels and
+rows are rewritten, so a workspace has the size and variable mix of a real
+one. Output is the export format, {name: schema dict}, and depends only on
+the count and seed.
+"""
+
+import os
+import random
+import sys
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from assets.models import Schema, VariableType  # noqa: E402
+from assets.schema_manager import SchemaManager  # noqa: E402
+from templates.registry import template_registry  # noqa: E402
+
+DROP_RATE = 0.15
+EXTRA_RATE = 0.3
+ROWS = (0, 0, 1, 1, 1, 2, 3, 5, 10)
+
+
+def template_bases() -> List[Tuple[str, Dict[str, Any]]]:
+    """(template id, schema dict) for every registered template"""
+    bases = []
+    for template_id in template_registry.list_templates():
+        template = template_registry.create_template(template_id)
+        bases.append((template_id, template.to_schema(template_id).to_dict()))
+    return bases
+
+
+def synthetic_workspace(count: int, seed: int = 0) -> Dict[str, Dict[str, Any]]:
+    """count schemas in export format, drawn from the templates in turn"""
+    rng = random.Random(seed)
+    bases = template_bases()
+    fields = [var_type.value for var_type in VariableType]
+    workspace = {}
+    for i in range(count):
+        template_id, base = bases[i % len(bases)]
+        data = {
+            "page_title_cn": f"{base['page_title_cn']} {i}",
+            "page_title_en": f"{base['page_title_en']} {i}",
+            "match_img": rng.choice(("yes", "no")),
+            "filter_with": rng.choice(("yes", "no")),
+        }
+        for field in fields:
+            variables = []
+            for entry in base[field]:
+                (name, text), = entry.items()
+                copies = 0 if rng.random() < DROP_RATE else 1
+                while rng.random() < EXTRA_RATE:
+                    copies += 1
+                for copy in range(copies):
+                    suffix = f"_{copy + 1}" if copy else ""
+                    variables.append(
+                        {
+                            name + suffix: {
+                                "en": f"{text['en']}{suffix} {rng.randrange(1000)}",
+                                "cn": f"{text['cn']}{suffix}",
+                                "rows": rng.choice(ROWS),
+                            }
+                        }
+                    )
+            data[field] = variables
+        workspace[f"{template_id}_{i:06d}"] = data
+    return workspace
+
+
+def synthetic_schemas(count: int, seed: int = 0) -> List[Schema]:
+    """The schemas of synthetic_workspace(count, seed) as models"""
+    manager = SchemaManager()
+    manager.import_schemas(synthetic_workspace(count, seed))
+    return list(manager.schemas.values())
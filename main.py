@@ -1,7 +1,6 @@
 import sys
 import logging
-from PyQt5.QtWidgets import QApplication
-from assets.main_window import MainWindow
+from assets import profiling, tracing
 
 # Logging configuration
 logging.basicConfig(
@@ -11,21 +10,49 @@ logging.basicConfig(
 
 def main():
     """Application entry point"""
-    app = QApplication(sys.argv)
-
-    # Set application properties
-    app.setApplicationName("Schema Designer Pro")
-    app.setOrganizationName("YourCompany")
-
-    # Set fusion style for better cross-platform look
-    app.setStyle("Fusion")
+    # --profile-startup prints an import and construction timing breakdown
+    # once the first frame has been painted
+    if "--profile-startup" in sys.argv:
+        sys.argv.remove("--profile-startup")
+        profiling.enable()
+    # SCHEMADESIGNER_TRACE=trace.json records a Chrome trace until exit
+    tracing.start_from_environment()
+
+    with profiling.phase("import PyQt5"):
+        from PyQt5.QtCore import QTimer
+        from PyQt5.QtWidgets import QApplication
+    with profiling.phase("import main window"):
+        from assets.main_window import MainWindow
+
+    with profiling.phase("QApplication"):
+        app = QApplication(sys.argv)
+
+        # Set application properties
+        app.setApplicationName("Schema Designer Pro")
+        app.setOrganizationName("YourCompany")
+
+        # Set fusion style for better cross-platform look
+        app.setStyle("Fusion")
 
     # Create and show main window
-    window = MainWindow()
-    window.show()
+    with profiling.phase("MainWindow()"):
+        window = MainWindow()
+    with profiling.phase("show"):
+        window.show()
+
+    if profiling.profiler is not None:
+        QTimer.singleShot(0, _report_startup)
 
     sys.exit(app.exec_())
 
 
+def _report_startup():
+    """Print the startup profile once the event loop is running"""
+    profiler = profiling.profiler
+    profiler.mark("first event loop turn (window painted)")
+    profiler.stop()
+    profiler.report()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,5 @@
+"""Headless schema toolkit: command line access to SchemaManager without Qt
+
+Run ``python -m schemadesigner --help`` for the available commands. Nothing
+in this package imports PyQt5.
+"""
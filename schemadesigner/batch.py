@@ -0,0 +1,266 @@
+import os
+import time
+from dataclasses import dataclass, field, replace
+from itertools import chain
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Like the CLI, this module imports assets lazily: worker processes only
+# load what a job needs, and nothing here imports Qt
+
+
+# Transforms: each edits a SchemaManager in place through its public API
+def sort_schemas(manager):
+    """Order schemas by name"""
+    manager.sort_schemas()
+
+
+def strip_text(manager):
+    """Trim surrounding whitespace from titles and variable labels"""
+    from assets.models import Variable, VariableType
+
+    with manager.batch() as batch:
+        for name, schema in manager.schemas.items():
+            titles = {
+                field_name: value.strip()
+                for field_name, value in (
+                    ("page_title_cn", schema.page_title_cn),
+                    ("page_title_en", schema.page_title_en),
+                )
+                if isinstance(value, str) and value != value.strip()
+            }
+            if titles:
+                batch.update_schema(name, replace(schema, **titles))
+            for var_type in VariableType:
+                for index, var in enumerate(getattr(schema, var_type.value)):
+                    en, cn = var.en_text.strip(), var.cn_text.strip()
+                    if en != var.en_text or cn != var.cn_text:
+                        batch.update_variable(
+                            name, var_type, index, Variable(var.name, en, cn, var.rows)
+                        )
+
+
+def dedupe_variables(manager):
+    """Drop repeated variable names within a list, keeping the first"""
+    from assets.models import VariableType
+
+    with manager.batch() as batch:
+        for name, schema in manager.schemas.items():
+            for var_type in VariableType:
+                seen = set()
+                repeated = []
+                for index, var in enumerate(getattr(schema, var_type.value)):
+                    if var.name in seen:
+                        repeated.append(index)
+                    seen.add(var.name)
+                # Highest index first so earlier positions stay valid
+                for index in reversed(repeated):
+                    batch.remove_variable(name, var_type, index)
+
+
+TRANSFORMS: Dict[str, Callable] = {
+    "sort": sort_schemas,
+    "strip": strip_text,
+    "dedupe": dedupe_variables,
+}
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """One file to import, transform and (optionally) export"""
+
+    source: str
+    target: Optional[str] = None
+    transforms: Tuple[str, ...] = ()
+    fmt: Optional[str] = None
+    compression: Optional[str] = None
+    level: Optional[int] = None
+    lint: bool = False
+    rows_limit: int = 20
+
+
+@dataclass
+class FileResult:
+    """Outcome of one job; error is set instead of raising"""
+
+    source: str
+    target: Optional[str] = None
+    schemas: int = 0
+    unparsed: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    elapsed: float = 0.0
+    issues: list = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchSummary:
+    """Totals over every file of a run"""
+
+    files: int = 0
+    failed: int = 0
+    schemas: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    errors: int = 0
+    warnings: int = 0
+    elapsed: float = 0.0
+
+    def add(self, result: FileResult):
+        self.files += 1
+        self.failed += not result.ok
+        self.schemas += result.schemas
+        self.bytes_in += result.bytes_in
+        self.bytes_out += result.bytes_out
+        for issue in result.issues:
+            self.errors += issue.severity == "error"
+            self.warnings += issue.severity == "warning"
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.bytes_in / 1e6 / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.files} files ({self.failed} failed), {self.schemas} schemas, "
+            f"{self.bytes_in / 1e6:.1f} MB in {self.elapsed:.2f}s: "
+            f"{self.files_per_second:.1f} files/s, {self.mb_per_second:.1f} MB/s"
+        )
+
+
+def process_file(job: BatchJob) -> FileResult:
+    """Import, transform, lint and export one file; never raises"""
+    from assets.fileio import iter_workspace
+    from assets.schema_manager import SchemaManager
+
+    started = time.perf_counter()
+    result = FileResult(job.source, job.target)
+    read = 0
+
+    def counted(pairs):
+        nonlocal read
+        for pair in pairs:
+            read += 1
+            yield pair
+
+    try:
+        result.bytes_in = os.path.getsize(job.source)
+        manager = SchemaManager()
+        manager.import_schemas(counted(iter_workspace(job.source)))
+        result.unparsed = read - len(manager.schemas)
+
+        for name in job.transforms:
+            TRANSFORMS[name](manager)
+        result.schemas = len(manager.schemas)
+
+        if job.lint:
+            from assets.linter import LintIssue, lint_schema
+
+            for schema in manager.schemas.values():
+                result.issues.extend(lint_schema(schema, job.rows_limit))
+            if result.unparsed:
+                message = f"{result.unparsed} schemas could not be parsed"
+                result.issues.append(LintIssue("", "error", "unparseable", message))
+
+        if job.target is not None:
+            from assets.exporters import write_export
+
+            directory = os.path.dirname(job.target)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            write_export(
+                manager,
+                job.target,
+                fmt=job.fmt,
+                compression=job.compression,
+                level=job.level,
+            )
+            result.bytes_out = os.path.getsize(job.target)
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def find_collisions(jobs: Sequence[BatchJob]) -> Dict[str, List[str]]:
+    """Jobs that would write the same output: source -> the other sources"""
+    by_target: Dict[str, List[str]] = {}
+    for job in jobs:
+        if job.target is not None:
+            key = os.path.normcase(os.path.abspath(job.target))
+            by_target.setdefault(key, []).append(job.source)
+    collisions = {}
+    for sources in by_target.values():
+        if len(sources) > 1:
+            for source in sources:
+                collisions[source] = [other for other in sources if other != source]
+    return collisions
+
+
+def run_jobs(jobs: Sequence[BatchJob], workers: Optional[int] = None) -> Iterator[FileResult]:
+    """Run jobs on a process pool, yielding results as files finish
+
+    Each file is one task, so a slow or failing file never holds up the
+    others; results arrive in completion order.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        yield from map(process_file, jobs)
+        return
+    import multiprocessing
+
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(process_file, jobs)
+
+
+class BatchEngine:
+    """Fans a set of jobs out to worker processes and aggregates the results"""
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers
+        self.results: List[FileResult] = []
+        self.summary = BatchSummary()
+
+    def run(
+        self,
+        jobs: Iterable[BatchJob],
+        on_result: Optional[Callable[[FileResult], None]] = None,
+    ) -> BatchSummary:
+        """Process every job; results are kept in job order in self.results
+
+        Jobs that share an output file all fail without running, since
+        workers writing one file would silently overwrite each other.
+        """
+        jobs = list(jobs)
+        order = {job.source: position for position, job in enumerate(jobs)}
+        collisions = find_collisions(jobs)
+        refused = [
+            FileResult(
+                job.source,
+                job.target,
+                error=f"output {job.target} would also be written for "
+                + ", ".join(collisions[job.source]),
+            )
+            for job in jobs
+            if job.source in collisions
+        ]
+        runnable = [job for job in jobs if job.source not in collisions]
+        self.results = []
+        self.summary = summary = BatchSummary()
+        started = time.perf_counter()
+        for result in chain(refused, run_jobs(runnable, self.workers)):
+            self.results.append(result)
+            summary.add(result)
+            summary.elapsed = time.perf_counter() - started
+            if on_result is not None:
+                on_result(result)
+        self.results.sort(key=lambda result: order[result.source])
+        return summary
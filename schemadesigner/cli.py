@@ -0,0 +1,340 @@
+import argparse
+import glob
+import logging
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Tuple
+from .batch import TRANSFORMS
+
+# Heavier modules are imported by the commands that need them, so the
+# interpreter starts quickly and never loads Qt
+
+logger = logging.getLogger(__name__)
+
+WORKSPACE_SUFFIXES = (".json", ".ndjson", ".jsonl")
+FORMAT_SUFFIXES = {"json": ".json", "minified": ".min.json", "ndjson": ".ndjson"}
+CODEC_SUFFIXES = {"gzip": ".gz", "xz": ".xz", "bz2": ".bz2"}
+
+
+def is_workspace_file(path: str) -> bool:
+    """Whether a file name looks like an export, plain or compressed"""
+    from assets.exporters import DELETED_FILENAME, MANIFEST_FILENAME
+    from assets.fileio import strip_codec_extension
+
+    name = os.path.basename(path)
+    if name in (MANIFEST_FILENAME, DELETED_FILENAME):
+        return False
+    return strip_codec_extension(name).lower().endswith(WORKSPACE_SUFFIXES)
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[Tuple[str, str]]:
+    """Resolve files, directories and globs to (path, relative path) pairs
+
+    Directories are searched recursively for workspace files; the relative
+    path is used to mirror the input layout when writing to a directory.
+    Files named directly or by a glob are relative to their common folder,
+    so same-named files from different folders stay apart.
+    """
+    found: Dict[str, Optional[str]] = {}
+    for pattern in patterns:
+        if any(char in pattern for char in "*?["):
+            matches = sorted(glob.glob(pattern, recursive=True))
+            if not matches:
+                raise FileNotFoundError(f"No files match {pattern}")
+        else:
+            matches = [pattern]
+        for match in matches:
+            if os.path.isdir(match):
+                for root, dirs, files in os.walk(match):
+                    dirs.sort()
+                    for name in sorted(files):
+                        path = os.path.join(root, name)
+                        if is_workspace_file(path):
+                            found.setdefault(path, os.path.relpath(path, match))
+            elif os.path.isfile(match):
+                found.setdefault(match, None)
+            else:
+                raise FileNotFoundError(f"No such file or directory: {match}")
+
+    files = [path for path, relative in found.items() if relative is None]
+    if files:
+        try:
+            root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in files])
+        except ValueError:
+            # Different drives: fall back to file names; clashes are reported per file
+            root = None
+        for path in files:
+            found[path] = (
+                os.path.relpath(os.path.abspath(path), root) if root else os.path.basename(path)
+            )
+    return list(found.items())
+
+
+def load_manager(path: str):
+    """A SchemaManager holding the schemas of one export or backup"""
+    from assets.fileio import iter_workspace
+    from assets.schema_manager import SchemaManager
+
+    manager = SchemaManager()
+    manager.import_schemas(iter_workspace(path))
+    return manager
+
+
+def output_name(relative: str, fmt: str, compression: Optional[str]) -> str:
+    """Relative output path for a converted file: a/b.json.gz -> a/b.ndjson"""
+    from assets.fileio import strip_codec_extension
+
+    base = strip_codec_extension(relative)
+    for suffix in (".min.json",) + WORKSPACE_SUFFIXES:
+        if base.lower().endswith(suffix):
+            base = base[: -len(suffix)]
+            break
+    return base + FORMAT_SUFFIXES[fmt] + CODEC_SUFFIXES.get(compression or "", "")
+
+
+# Commands
+def _report(result) -> None:
+    if not result.ok:
+        print(f"{result.source}: {result.error}", file=sys.stderr)
+
+
+def cmd_convert(args) -> int:
+    from .batch import BatchEngine, BatchJob
+
+    inputs = expand_inputs(args.inputs)
+    single = (
+        len(inputs) == 1
+        and not os.path.isdir(args.output)
+        and not args.output.endswith(("/", os.sep))
+    )
+    transforms = tuple(args.transform or ())
+    if single:
+        targets = [(inputs[0][0], args.output, args.format)]
+    else:
+        fmt = args.format or "json"
+        targets = [
+            (path, os.path.join(args.output, output_name(relative, fmt, args.compression)), fmt)
+            for path, relative in inputs
+        ]
+    jobs = [
+        BatchJob(source, target, transforms, fmt, args.compression, args.level)
+        for source, target, fmt in targets
+    ]
+
+    def report(result):
+        _report(result)
+        if result.ok and not args.quiet:
+            print(f"{result.source} -> {result.target} ({result.schemas} schemas)")
+
+    summary = BatchEngine(args.workers).run(jobs, report)
+    print(f"Converted {summary}")
+    return 1 if summary.failed else 0
+
+
+def cmd_validate(args) -> int:
+    from .batch import BatchEngine, BatchJob
+
+    jobs = [
+        BatchJob(path, lint=True, rows_limit=args.rows_limit)
+        for path, _ in expand_inputs(args.inputs)
+    ]
+
+    def report(result):
+        _report(result)
+        for issue in result.issues:
+            if issue.severity == "error" or not args.quiet:
+                where = f"{issue.schema_name}: " if issue.schema_name else ""
+                print(f"{result.source}: {where}{issue.severity} {issue.code}: {issue.message}")
+
+    summary = BatchEngine(args.workers).run(jobs, report)
+    print(f"Validated {summary}")
+    print(f"{summary.errors} errors, {summary.warnings} warnings")
+    return 1 if summary.failed or summary.errors or (args.strict and summary.warnings) else 0
+
+
+def cmd_merge(args) -> int:
+    from assets.exporters import write_export
+    from assets.fileio import iter_workspace
+    from assets.schema_manager import SchemaManager
+
+    merged: Dict[str, dict] = {}
+    origin: Dict[str, str] = {}
+    conflicts = 0
+    for path, _ in expand_inputs(args.inputs):
+        for name, data in iter_workspace(path):
+            if name in merged and merged[name] != data:
+                if args.on_conflict == "error":
+                    conflicts += 1
+                    print(f"{name}: differs between {origin[name]} and {path}", file=sys.stderr)
+                    continue
+                if args.on_conflict == "first":
+                    continue
+            merged[name] = data
+            origin[name] = path
+    if conflicts:
+        print(f"{conflicts} conflicting schemas; use --on-conflict first|last", file=sys.stderr)
+        return 1
+
+    manager = SchemaManager()
+    manager.import_schemas(merged)
+    write_export(
+        manager, args.output, fmt=args.format, compression=args.compression, level=args.level
+    )
+    print(f"Merged {len(manager.schemas)} schemas into {args.output}")
+    return 0
+
+
+def cmd_export(args) -> int:
+    from assets.exporters import write_export
+
+    manager = load_manager(args.workspace)
+    names = None
+    if args.schema or args.query:
+        selected = set()
+        for name in args.schema or []:
+            if name not in manager.schemas:
+                print(f"Schema '{name}' not found in {args.workspace}", file=sys.stderr)
+                return 1
+            selected.add(name)
+        if args.query:
+            selected.update(manager.query(args.query))
+        names = [name for name in manager.schemas if name in selected]
+
+    write_export(
+        manager,
+        args.output,
+        names,
+        fmt=args.format,
+        compression=args.compression,
+        level=args.level,
+    )
+    count = len(manager.schemas) if names is None else len(names)
+    print(f"Exported {count} schemas to {args.output}")
+    return 0
+
+
+def cmd_templates(args) -> int:
+    from templates.registry import template_registry
+
+    for template_id in template_registry.list_templates():
+        metadata = template_registry.get_template_metadata(template_id)
+        print(f"{template_id:<16} {metadata.name:<20} {metadata.description}")
+    return 0
+
+
+def cmd_new(args) -> int:
+    from assets.exporters import write_export
+    from assets.schema_manager import SchemaManager
+    from templates.registry import template_registry
+
+    try:
+        template = template_registry.create_template(args.template)
+    except KeyError as e:
+        print(e.args[0], file=sys.stderr)
+        return 1
+    manager = load_manager(args.workspace) if os.path.exists(args.workspace) else SchemaManager()
+    if not manager.add_schema(template.to_schema(args.name)):
+        print(f"Schema '{args.name}' already exists in {args.workspace}", file=sys.stderr)
+        return 1
+    write_export(manager, args.workspace)
+    print(f"Added '{args.name}' from template {args.template} to {args.workspace}")
+    return 0
+
+
+def _add_output_options(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--format",
+        choices=sorted(FORMAT_SUFFIXES),
+        help="output format (default: from the output file name, else json)",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=sorted(CODEC_SUFFIXES),
+        help="output compression (default: from the output file name)",
+    )
+    parser.add_argument("--level", type=int, help="compression level")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m schemadesigner",
+        description="Convert, validate, merge and export schema files without a display",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="log progress")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.required = True
+
+    convert = commands.add_parser(
+        "convert", help="re-export files or directories in another format"
+    )
+    convert.add_argument("inputs", nargs="+", help="files, directories or globs")
+    convert.add_argument(
+        "-o", "--output", required=True, help="output file, or directory for several inputs"
+    )
+    _add_output_options(convert)
+    convert.add_argument(
+        "--transform",
+        action="append",
+        choices=list(TRANSFORMS),
+        help="apply before exporting (repeatable, in order): sort schemas by name, "
+        "strip whitespace from labels, drop repeated variable names",
+    )
+    convert.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    convert.add_argument("-q", "--quiet", action="store_true", help="only print the summary")
+    convert.set_defaults(handler=cmd_convert)
+
+    validate = commands.add_parser("validate", help="lint every schema in the given files")
+    validate.add_argument("inputs", nargs="+", help="files, directories or globs")
+    validate.add_argument("--rows-limit", type=int, default=20, help="rows outlier limit")
+    validate.add_argument("--strict", action="store_true", help="fail on warnings too")
+    validate.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    validate.add_argument("-q", "--quiet", action="store_true", help="only print errors")
+    validate.set_defaults(handler=cmd_validate)
+
+    merge = commands.add_parser("merge", help="combine several files into one workspace")
+    merge.add_argument("inputs", nargs="+", help="files, directories or globs, in order")
+    merge.add_argument("-o", "--output", required=True)
+    merge.add_argument(
+        "--on-conflict",
+        choices=["error", "first", "last"],
+        default="error",
+        help="what to do when a schema name has different content in two files",
+    )
+    _add_output_options(merge)
+    merge.set_defaults(handler=cmd_merge)
+
+    export = commands.add_parser("export", help="export all or selected schemas of a file")
+    export.add_argument("workspace")
+    export.add_argument("-o", "--output", required=True)
+    export.add_argument("--schema", action="append", help="schema to include (repeatable)")
+    export.add_argument("--query", help="include schemas matching a query, e.g. 'has:image'")
+    _add_output_options(export)
+    export.set_defaults(handler=cmd_export)
+
+    template_list = commands.add_parser("templates", help="list the built-in templates")
+    template_list.set_defaults(handler=cmd_templates)
+
+    new = commands.add_parser("new", help="add a schema created from a template to a file")
+    new.add_argument("template", help="template id (see 'templates')")
+    new.add_argument("name", help="name of the new schema")
+    new.add_argument("workspace", help="workspace file, created if missing")
+    new.set_defaults(handler=cmd_new)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    from assets import tracing
+
+    tracing.start_from_environment()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(levelname)s: %(message)s",
+    )
+    try:
+        return args.handler(args)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,83 @@
+import json
+import os
+from schemadesigner.cli import expand_inputs, main, output_name
+
+
+def write_workspace(path, *names):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        name: {"page_title_en": name, "basic_variables": [{"title": {"en": "T"}}]}
+        for name in names
+    }
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return str(path)
+
+
+def test_output_name_replaces_format_and_codec():
+    relative = os.path.join("a", "b.json.gz")
+    assert output_name(relative, "ndjson", None) == os.path.join("a", "b.ndjson")
+    assert output_name("b.min.json", "json", "xz") == "b.json.xz"
+
+
+def test_directories_mirror_their_layout(tmp_path):
+    write_workspace(tmp_path / "in" / "a" / "w.json", "one")
+    write_workspace(tmp_path / "in" / "b.json", "two")
+    (tmp_path / "in" / "notes.txt").write_text("skip")
+
+    inputs = expand_inputs([str(tmp_path / "in")])
+
+    assert [relative for _, relative in inputs] == ["b.json", os.path.join("a", "w.json")]
+
+
+def test_files_keep_paths_below_their_common_folder(tmp_path):
+    first = write_workspace(tmp_path / "in" / "a" / "w.json", "one")
+    second = write_workspace(tmp_path / "in" / "b" / "w.json", "two")
+
+    assert expand_inputs([first, second]) == [
+        (first, os.path.join("a", "w.json")),
+        (second, os.path.join("b", "w.json")),
+    ]
+    assert expand_inputs([first]) == [(first, "w.json")]
+
+
+def test_convert_same_named_files_from_different_folders(tmp_path):
+    first = write_workspace(tmp_path / "in" / "a" / "w.json", "one")
+    second = write_workspace(tmp_path / "in" / "b" / "w.json", "two")
+    out = tmp_path / "out"
+
+    assert main(["convert", first, second, "-o", f"{out}{os.sep}", "--workers", "1", "-q"]) == 0
+
+    assert list(json.loads((out / "a" / "w.json").read_text(encoding="utf-8"))) == ["one"]
+    assert list(json.loads((out / "b" / "w.json").read_text(encoding="utf-8"))) == ["two"]
+
+
+def test_convert_refuses_inputs_with_the_same_output(tmp_path, capsys):
+    plain = write_workspace(tmp_path / "in" / "w.json", "one")
+    packed = tmp_path / "in" / "w.json.gz"
+    assert main(["convert", plain, "-o", str(packed)]) == 0
+    other = write_workspace(tmp_path / "in" / "other.json", "two")
+    out = tmp_path / "out"
+
+    code = main(
+        ["convert", plain, str(packed), other, "-o", f"{out}{os.sep}", "--workers", "1", "-q"]
+    )
+
+    assert code == 1
+    assert sorted(os.listdir(out)) == ["other.json"]
+    summary = capsys.readouterr()
+    assert "would also be written for" in summary.err
+    assert "3 files (2 failed)" in summary.out
+
+
+def test_validate_reports_lint_errors(tmp_path, capsys):
+    path = tmp_path / "w.json"
+    path.write_text(
+        json.dumps({"page": {"basic_variables": [{"title": {}}, {"title": {}}]}}),
+        encoding="utf-8",
+    )
+
+    code = main(["validate", str(path), "--workers", "1"])
+
+    output = capsys.readouterr().out
+    assert code == 1
+    assert "page: error" in output
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 from assets.models import Schema, Variable
+from assets.tracing import traced
 
 
 @dataclass
@@ -111,6 +112,7 @@ class BaseTemplate(ABC):
 
         return preview_data
 
+    @traced(category="template")
     def to_schema(self, schema_name: str) -> Schema:
         """Convert template to actual schema"""
         schema = Schema(name=schema_name)
@@ -1,9 +1,9 @@
-import json
 from PyQt5.QtWidgets import *
 from PyQt5.QtCore import *
 from PyQt5.QtGui import *
 from typing import Optional
 from assets.dialogs import ModernDialog
+from assets.encoder import encode_member
 from templates.manager import SchemaTemplate, TemplateManager
 
 
@@ -338,6 +338,15 @@ class TemplatePreviewDialog(ModernDialog):
 
         return container
 
+    def select_template(self, template_id: str):
+        """Preselect a template by id"""
+        for row in range(self.template_list.count()):
+            item = self.template_list.item(row)
+            if item.data(Qt.UserRole) == template_id:
+                self.template_list.setCurrentItem(item)
+                self._on_template_selected(item)
+                return
+
     def _on_template_selected(self, item):
         """Handle template selection"""
         template_id = item.data(Qt.UserRole)
@@ -351,10 +360,9 @@ class TemplatePreviewDialog(ModernDialog):
             schema_name = template.metadata.name
             self.schema_name_input.setText(schema_name)
 
-            # Update preview
-            preview_data = {schema_name: template.to_preview_data()}
-            json_str = json.dumps(preview_data, indent=2, ensure_ascii=False)
-            self.preview_text.setText(json_str)
+            # Preview exactly what applying the template exports
+            schema = template.to_schema(schema_name)
+            self.preview_text.setText("{\n" + encode_member(schema_name, schema) + "\n}")
 
             # Show template info
             self._show_template_info(template)
@@ -1,4 +1,5 @@
 from typing import Dict, Type, List, Optional
+from assets.tracing import traced
 from .base import BaseTemplate, TemplateMetadata
 from .template_artist import ArtistWebsiteTemplate
 from .template_about import AboutTemplate
@@ -62,6 +63,7 @@ class TemplateRegistry:
             raise KeyError(f"Template '{template_id}' not found")
         return self._templates[template_id]
 
+    @traced(category="template")
     def create_template(self, template_id: str) -> BaseTemplate:
         """Create template instance by ID"""
         template_class = self.get_template_class(template_id)